@@ -0,0 +1 @@
+from .fila_prioridades import NIVEIS, ClassificadorPrioridade, FilaPrioridades
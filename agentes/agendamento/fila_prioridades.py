@@ -0,0 +1,204 @@
+import queue
+import threading
+import time
+from collections import deque
+from typing import Callable
+
+from agentes.agente_analista.agente_analista import PRIORIDADES
+from agentes.agente_analista.casador_padroes import CasadorPadroes
+from agentes.monitoramento import metricas
+
+# Níveis, do mais para o menos urgente
+NIVEIS = tuple(PRIORIDADES)
+
+ESPERA = metricas.histograma('agendador_espera_segundos', 'Tempo na fila até o início do processamento', ('prioridade',))
+SLO_VIOLADO = metricas.contador('agendador_slo_violado', 'Itens que esperaram na fila mais que o SLO da prioridade', ('prioridade',))
+PROMOVIDOS = metricas.contador('agendador_promovidos', 'Itens atendidos à frente de níveis mais urgentes por envelhecimento', ('prioridade',))
+FILAS = metricas.medidor('fila_profundidade', 'Itens aguardando em filas internas', ('fila',))
+
+class ClassificadorPrioridade:
+    """
+    Prioridade de uma transcrição a partir das mesmas frases do AgenteAnalista.
+
+    Roda sobre o texto bruto, antes de qualquer etapa de NLP, para que o
+    agendamento não dependa do processamento que ele ordena.
+
+    As frases só casam como palavras inteiras e, entre ocorrências
+    sobrepostas, vale a mais longa: em "não é urgente" a frase de
+    prioridade baixa encobre o 'urgente' que ela contém.
+    """
+
+    def __init__(self, padrao: str = 'media'):
+        self.padrao = padrao
+        self.casador = CasadorPadroes()
+        for nivel, frases in PRIORIDADES.items():
+            self.casador.adicionar_varios(frases, nivel)
+
+    def __call__(self, texto: str) -> str:
+        encontrados = {ocorrencia.categoria for ocorrencia in self.casador.buscar(texto)}
+        for nivel in NIVEIS:
+            if nivel in encontrados:
+                return nivel
+        return self.padrao
+
+class _Item:
+    __slots__ = ('valor', 'prioridade', 'criado_em')
+
+    def __init__(self, valor, prioridade: str, criado_em: float):
+        self.valor = valor
+        self.prioridade = prioridade
+        self.criado_em = criado_em
+
+class FilaPrioridades:
+    """
+    Fila com um nível por prioridade, envelhecimento e cotas de execução.
+
+    retirar() entrega o item de maior prioridade efetiva: cada
+    `envelhecimento` segundos de espera sobem o item um nível, então uma
+    importação em massa de prioridade baixa não fica parada para sempre
+    atrás de um fluxo contínuo de itens urgentes. Dentro do mesmo nível
+    efetivo, o mais antigo sai primeiro.
+
+    As cotas limitam quantos itens de um nível *ou de níveis menos
+    urgentes* podem estar em execução ao mesmo tempo (liberados com
+    concluir). Com 4 trabalhadores e cotas {'alta': 4, 'media': 3,
+    'baixa': 2}, sempre sobra um trabalhador para 'alta' e outro para
+    'media' ou 'alta', por maior que seja o acúmulo de itens baixos.
+
+    A capacidade vale por nível: um acúmulo de itens baixos não faz
+    recusar itens urgentes.
+    """
+
+    def __init__(self, capacidade: int = 0, cotas: dict = None, envelhecimento: float = 30.0,
+                 slo: dict = None, nome: str = 'agendador', relogio: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            capacidade (int): Máximo de itens aguardando em cada nível (0 = ilimitado)
+            cotas (dict): Nível -> máximo em execução desse nível ou menos urgentes (ausente = ilimitado)
+            envelhecimento (float): Segundos de espera para subir um nível (0 desativa)
+            slo (dict): Nível -> espera máxima desejada, em segundos (contabilizada em agendador_slo_violado)
+            nome (str): Prefixo dos rótulos de fila_profundidade
+            relogio: Fonte de tempo (substituível em testes)
+        """
+        self.capacidade = capacidade
+        self.cotas = dict(cotas or {})
+        self.envelhecimento = envelhecimento
+        self.slo = dict(slo or {})
+        self.nome = nome
+        self.relogio = relogio
+
+        self._filas = {nivel: deque() for nivel in NIVEIS}
+        self._em_execucao = {nivel: 0 for nivel in NIVEIS}
+        self._fechada = False
+        self._condicao = threading.Condition()
+
+    def colocar(self, valor, prioridade: str):
+        """
+        Coloca um item na fila sem bloquear.
+
+        Raises:
+            ValueError: Se a prioridade não for um dos NIVEIS
+            queue.Full: Se o nível estiver na capacidade máxima
+        """
+        if prioridade not in self._filas:
+            raise ValueError(f"Prioridade inválida: {prioridade}")
+
+        with self._condicao:
+            fila = self._filas[prioridade]
+            if self.capacidade and len(fila) >= self.capacidade:
+                raise queue.Full(f"Fila '{prioridade}' com {self.capacidade} itens aguardando")
+            fila.append(_Item(valor, prioridade, self.relogio()))
+            FILAS.rotulos(fila=f"{self.nome}_{prioridade}").definir(len(fila))
+            self._condicao.notify_all()
+
+    def retirar(self, timeout: float = None):
+        """
+        Aguarda e retira o próximo item liberado pelas cotas.
+
+        O chamador deve chamar concluir(prioridade) ao terminar o item.
+
+        Returns:
+            tuple: (valor, prioridade), ou None se a fila foi fechada ou o timeout expirou
+        """
+        with self._condicao:
+            if not self._condicao.wait_for(lambda: self._fechada or self._escolher() is not None, timeout):
+                return None
+            if self._fechada:
+                return None
+
+            item = self._escolher()
+            indice = NIVEIS.index(item.prioridade)
+            if self._degraus(item) and any(self._filas[nivel] for nivel in NIVEIS[:indice]):
+                PROMOVIDOS.rotulos(prioridade=item.prioridade).inc()
+            self._filas[item.prioridade].popleft()
+            self._em_execucao[item.prioridade] += 1
+            FILAS.rotulos(fila=f"{self.nome}_{item.prioridade}").definir(len(self._filas[item.prioridade]))
+
+        espera = self.relogio() - item.criado_em
+        ESPERA.rotulos(prioridade=item.prioridade).observar(espera)
+        if item.prioridade in self.slo and espera > self.slo[item.prioridade]:
+            SLO_VIOLADO.rotulos(prioridade=item.prioridade).inc()
+        return item.valor, item.prioridade
+
+    def concluir(self, prioridade: str):
+        """Libera a vaga de execução ocupada por um item retirado."""
+        with self._condicao:
+            self._em_execucao[prioridade] -= 1
+            self._condicao.notify_all()
+
+    def fechar(self) -> list:
+        """
+        Fecha a fila: retirar() passa a devolver None e os itens aguardando são devolvidos.
+
+        Returns:
+            list: Valores que ainda aguardavam, do nível mais urgente ao menos urgente
+        """
+        with self._condicao:
+            self._fechada = True
+            pendentes = [item.valor for nivel in NIVEIS for item in self._filas[nivel]]
+            for nivel in NIVEIS:
+                self._filas[nivel].clear()
+                FILAS.rotulos(fila=f"{self.nome}_{nivel}").definir(0)
+            self._condicao.notify_all()
+        return pendentes
+
+    def qsize(self) -> int:
+        with self._condicao:
+            return sum(len(fila) for fila in self._filas.values())
+
+    def obter_estado(self) -> dict:
+        """Itens aguardando e em execução por nível"""
+        with self._condicao:
+            return {
+                nivel: {'aguardando': len(self._filas[nivel]), 'em_execucao': self._em_execucao[nivel]}
+                for nivel in NIVEIS
+            }
+
+    def _escolher(self):
+        """Item de maior prioridade efetiva entre os níveis com cota livre (chamado com o lock)."""
+        melhor = None
+        melhor_chave = None
+        for indice, nivel in enumerate(NIVEIS):
+            # Dentro de um nível, o primeiro é o mais antigo e portanto o mais envelhecido
+            if not self._filas[nivel] or not self._cota_livre(indice):
+                continue
+            item = self._filas[nivel][0]
+            chave = (max(0, indice - self._degraus(item)), item.criado_em)
+            if melhor_chave is None or chave < melhor_chave:
+                melhor, melhor_chave = item, chave
+        return melhor
+
+    def _degraus(self, item: _Item) -> int:
+        """Níveis que o item subiu por envelhecimento."""
+        if self.envelhecimento <= 0:
+            return 0
+        return int((self.relogio() - item.criado_em) // self.envelhecimento)
+
+    def _cota_livre(self, indice: int) -> bool:
+        """Um item do nível `indice` ocupa vaga na cota do seu nível e de todos os mais urgentes."""
+        for nivel in NIVEIS[:indice + 1]:
+            if nivel in self.cotas:
+                ocupadas = sum(self._em_execucao[outro] for outro in NIVEIS[NIVEIS.index(nivel):])
+                if ocupadas >= self.cotas[nivel]:
+                    return False
+        return True
@@ -0,0 +1,76 @@
+import queue
+import threading
+import pytest
+from agendamento import ClassificadorPrioridade, FilaPrioridades
+
+def test_classificador_prioridade():
+    """Testa a prioridade obtida do texto bruto com as frases do AgenteAnalista"""
+    classificar = ClassificadorPrioridade()
+    
+    assert classificar("URGENTE: servidor fora do ar, corrigir imediatamente") == 'alta'
+    assert classificar("Revisar o contrato, isso pode esperar") == 'baixa'
+    assert classificar("Criar tarefa para o projeto Marketing") == 'media'
+
+def test_classificador_prioridade_negacoes():
+    """Testa que frases negadas não caem na fila urgente"""
+    classificar = ClassificadorPrioridade()
+    
+    assert classificar("Importar planilha, não urgente") == 'baixa'
+    assert classificar("Isso não é urgente, pode esperar") == 'baixa'
+    assert classificar("Importar planilha, não é urgente") == 'baixa'
+    
+    # Só palavras inteiras: 'urgentes' não é a frase cadastrada
+    assert classificar("Listar pedidos urgentes do mês passado") == 'media'
+    
+    # Um 'urgente' de fato, fora da negação, continua valendo
+    assert classificar("O relatório pode esperar, mas o deploy é urgente") == 'alta'
+
+def test_prioridade_e_envelhecimento():
+    """Testa que o mais urgente sai primeiro e que a espera promove itens antigos"""
+    instante = [0.0]
+    fila = FilaPrioridades(envelhecimento=10, relogio=lambda: instante[0])
+    
+    fila.colocar('importacao', 'baixa')
+    instante[0] = 1.0
+    fila.colocar('urgente', 'alta')
+    assert fila.retirar(0) == ('urgente', 'alta')
+    fila.concluir('alta')
+    
+    # Após 20s a importação subiu dois níveis e passa à frente de um item alto mais novo
+    instante[0] = 21.0
+    fila.colocar('urgente 2', 'alta')
+    assert fila.retirar(0) == ('importacao', 'baixa')
+    assert fila.retirar(0) == ('urgente 2', 'alta')
+    
+    with pytest.raises(ValueError):
+        fila.colocar('x', 'altissima')
+
+def test_cotas_reservam_vagas_para_urgentes():
+    """Testa que itens menos urgentes não ocupam as vagas reservadas pelas cotas"""
+    fila = FilaPrioridades(capacidade=3, cotas={'alta': 3, 'media': 2, 'baixa': 1})
+    for numero in range(3):
+        fila.colocar(f"lote {numero}", 'baixa')
+    fila.colocar('relatorio', 'media')
+    with pytest.raises(queue.Full):
+        fila.colocar('lote 3', 'baixa')
+    
+    # Uma vaga para baixa e mais uma para media
+    assert fila.retirar(0) == ('relatorio', 'media')
+    assert fila.retirar(0) == ('lote 0', 'baixa')
+    assert fila.retirar(0.01) is None
+    
+    # A terceira vaga fica para alta, mesmo com o acúmulo de itens baixos
+    fila.colocar('urgente', 'alta')
+    assert fila.retirar(0) == ('urgente', 'alta')
+    assert fila.obter_estado()['baixa'] == {'aguardando': 2, 'em_execucao': 1}
+    
+    # Concluir um item baixo libera a vaga para o próximo
+    resultado = []
+    thread = threading.Thread(target=lambda: resultado.append(fila.retirar(5)))
+    thread.start()
+    fila.concluir('baixa')
+    thread.join(5)
+    assert resultado == [('lote 1', 'baixa')]
+    
+    assert fila.fechar() == ['lote 2']
+    assert fila.retirar(5) is None
@@ -1,39 +1,85 @@
+import hashlib
 import logging
-import spacy
-import torch
-from transformers import pipeline, BertTokenizer, BertForSequenceClassification
-from typing import Dict, List, Optional, Tuple
+import re
+import time
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 from datetime import datetime
 from config import Config
+from .micro_lote import agrupar_por_comprimento, ProcessadorMicroLotes
+from .regras_intencao import ClassificadorRegras
+from .casador_padroes import CasadorPadroes
+from agentes.monitoramento import metricas
+
+if TYPE_CHECKING:
+    import torch
 
 logger = logging.getLogger(__name__)
 
+CLASSIFICACOES = metricas.contador('classificacoes', 'Ações classificadas por origem na cascata regras/modelo', ('origem',))
+
+# Ações correspondentes aos rótulos do classificador (mesma ordem dos logits)
+ACOES = [
+    "criar_tarefa",
+    "atualizar_tarefa",
+    "mover_tarefa",
+    "comentar_tarefa"
+]
+
+# Frases de prioridade, na ordem de precedência
+PRIORIDADES = {
+    'alta': ['urgente', 'imediato', 'prioridade alta'],
+    'media': ['importante', 'necessário', 'prioridade média'],
+    'baixa': ['pode esperar', 'não urgente', 'não é urgente', 'prioridade baixa']
+}
+
+# Separadores de frases no texto processado (o AgentePre preserva a pontuação)
+SEPARADORES_TAREFAS = re.compile(r'[.;!?\n]+')
+
+# Textos de tamanhos variados usados no aquecimento dos modelos
+TEXTOS_AQUECIMENTO = [
+    "Criar tarefa",
+    "João precisa criar uma tarefa para o projeto Marketing até sexta-feira",
+    "Mover a tarefa de deploy para a coluna Em andamento no quadro Infraestrutura e avisar a equipe "
+    "de operações que a janela de manutenção foi confirmada para 30/06/2025, prioridade alta"
+]
+
 class AgenteAnalista:
     def __init__(self):
         """Inicializa o AgenteAnalista."""
         logger.info("Inicializando AgenteAnalista...")
         
+        # spaCy, PyTorch e transformers são importados só aqui: importar o módulo não carrega as bibliotecas
+        import spacy
+        import torch
+        from transformers import BertTokenizer
+        from .backends import criar_backend, configurar_threads_torch
+        
+        # Configurar threads antes de qualquer operação do PyTorch
+        configurar_threads_torch(Config.TORCH_THREADS_INTRA, Config.TORCH_THREADS_INTER)
+        
         try:
             # Carregar modelo do spaCy para português
             self.nlp = spacy.load(Config.NLP_MODEL)
             
-            # Carregar tokenizer e modelo BERT
-            self.tokenizer = BertTokenizer.from_pretrained('neuralmind/bert-base-portuguese-cased')
-            self.model = BertForSequenceClassification.from_pretrained(
-                'neuralmind/bert-base-portuguese-cased',
-                num_labels=4
-            )
+            # Carregar tokenizer BERT (o modelo compacto não precisa dele)
+            self.tokenizer = None
+            if Config.BERT_BACKEND != 'compacto':
+                self.tokenizer = BertTokenizer.from_pretrained(Config.BERT_MODEL)
             
-            # Configurar dispositivo
-            self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
-            self.model.to(self.device)
+            # Configurar dispositivo (int8 e ONNX rodam apenas em CPU)
+            if Config.BERT_BACKEND == 'fp32' and torch.cuda.is_available():
+                self.device = torch.device("cuda")
+            else:
+                self.device = torch.device("cpu")
             
-            # Carregar modelo de classificação de intenções
-            self.classificador = pipeline(
-                'text-classification',
-                model='neuralmind/bert-base-portuguese-cased',
-                tokenizer='neuralmind/bert-base-portuguese-cased'
-            )
+            # Carregar backend de inferência do classificador
+            self.backend = criar_backend(Config.BERT_BACKEND, self.tokenizer, self.device)
+            self.model = getattr(self.backend, 'model', None)
+            logger.info(f"Backend de inferência: {self.backend.nome}")
+            
+            # Identifica os modelos em uso (chave de caches de resultados)
+            versao_backend = getattr(self.backend, 'versao', self.backend.nome)
+            self.versao_modelos = f"{Config.NLP_MODEL}|{Config.BERT_MODEL}|{versao_backend}|{Config.BERT_NUM_LABELS}"
             
             logger.info("AgenteAnalista inicializado com sucesso!")
             
@@ -41,6 +87,25 @@ class AgenteAnalista:
             logger.error(f"Erro ao inicializar AgenteAnalista: {str(e)}")
             raise
         
+        # Ações correspondentes aos rótulos do classificador (mesma ordem dos logits)
+        self.acoes = list(ACOES)
+        
+        # Cascata de classificação: regras compiladas antes do BERT
+        self.regras = ClassificadorRegras()
+        self.estatisticas_cascata = {
+            'regras': 0,
+            'modelo': 0
+        }
+        
+        # Agrupamento de chamadas concorrentes ao classificador
+        self.micro_lotes = None
+        if Config.BERT_MICRO_LOTE:
+            self.micro_lotes = ProcessadorMicroLotes(
+                self.classificar_lote,
+                tamanho_maximo=Config.BERT_BATCH_MAX,
+                espera_maxima=Config.BERT_MICRO_LOTE_ESPERA
+            )
+        
         # Definir entidades e ações conhecidas
         self.entidades_conhecidas = {
             'responsaveis': set(),  # Será preenchido pelo AgenteValidador
@@ -49,8 +114,103 @@ class AgenteAnalista:
             'colunas': set()
         }
         
+        # Casador compilado (Aho-Corasick) de projetos, quadros e colunas conhecidos
+        self.casador_entidades = CasadorPadroes()
+        self._versao_entidades = None
+        
+        # Frases de prioridade, na ordem de precedência
+        self.prioridades = PRIORIDADES
+        self.casador_prioridades = CasadorPadroes(limites_palavra=False)
+        for nivel, palavras in self.prioridades.items():
+            self.casador_prioridades.adicionar_varios(palavras, nivel)
+        
+        # Aquecer modelos para que a primeira transcrição não pague a inicialização
+        if Config.AQUECER_MODELOS:
+            self.aquecer()
+        
         logger.info("AgenteAnalista inicializado com sucesso!")
 
+    def aquecer(self) -> float:
+        """
+        Executa inferências de exemplo no spaCy e no classificador.
+        
+        A primeira chamada paga a alocação de memória e a inicialização de
+        kernels; fazê-la na inicialização tira esse custo da primeira
+        transcrição real. Não altera as estatísticas da cascata.
+        
+        Returns:
+            float: Duração do aquecimento em segundos
+        """
+        logger.info("Aquecendo modelos do AgenteAnalista...")
+        inicio = time.perf_counter()
+        
+        list(self.nlp.pipe(TEXTOS_AQUECIMENTO))
+        self.classificar_lote(TEXTOS_AQUECIMENTO)
+        for texto in TEXTOS_AQUECIMENTO:
+            self.classificar_lote([texto])
+        
+        duracao = time.perf_counter() - inicio
+        logger.info(f"Aquecimento concluído em {duracao:.2f}s")
+        return duracao
+
+    def apos_fork(self):
+        """
+        Prepara um processo filho criado por fork a partir deste agente.
+        
+        Os modelos continuam compartilhados com o processo pai, mas threads
+        não sobrevivem ao fork: o processador de micro-lotes é recriado e
+        as threads do PyTorch são reconfiguradas para o worker.
+        """
+        from .backends import configurar_threads_torch
+        configurar_threads_torch(Config.TORCH_THREADS_INTRA, Config.TORCH_THREADS_INTER)
+        if self.micro_lotes is not None:
+            self.micro_lotes = ProcessadorMicroLotes(
+                self.classificar_lote,
+                tamanho_maximo=Config.BERT_BATCH_MAX,
+                espera_maxima=Config.BERT_MICRO_LOTE_ESPERA
+            )
+
+    def registrar_entidades(self, tipo: str, nomes: list):
+        """
+        Registra entidades conhecidas do Monday.com.
+        
+        O casador é atualizado incrementalmente, então pode ser chamado
+        sempre que o diretório de projetos, quadros ou colunas mudar.
+        
+        Args:
+            tipo (str): 'responsaveis', 'projetos', 'quadros' ou 'colunas'
+            nomes (list): Nomes das entidades (podem ter várias palavras)
+        """
+        for nome in nomes:
+            self.entidades_conhecidas[tipo].add(nome.lower())
+            if tipo != 'responsaveis':
+                self.casador_entidades.adicionar(nome, tipo)
+        self._versao_entidades = None
+
+    def remover_entidades(self, tipo: str, nomes: list):
+        """Remove entidades que deixaram de existir no Monday.com."""
+        for nome in nomes:
+            self.entidades_conhecidas[tipo].discard(nome.lower())
+            if tipo != 'responsaveis':
+                self.casador_entidades.remover(nome, tipo)
+        self._versao_entidades = None
+
+    def versao_dados(self) -> str:
+        """
+        Identifica o dicionário de entidades e os limiares que influenciam a análise.
+        
+        Junto com versao_modelos, compõe a chave de caches de resultados: o
+        identificador do dicionário é um hash do conteúdo, então vale entre
+        processos e é recalculado só depois de registrar/remover entidades.
+        """
+        versao = self._versao_entidades
+        if versao is None:
+            conteudo = '\x00'.join(
+                f"{tipo}:{nome}" for tipo in sorted(self.entidades_conhecidas) for nome in sorted(self.entidades_conhecidas[tipo])
+            )
+            versao = self._versao_entidades = hashlib.sha256(conteudo.encode('utf-8')).hexdigest()[:16]
+        return f"{versao}|{Config.LIMIAR_REGRAS}|{Config.LIMIAR_TAREFA}"
+
     def extrair_entidades(self, texto: str) -> dict:
         """
         Extrai entidades do texto usando spaCy e classificação.
@@ -81,14 +241,9 @@ class AgenteAnalista:
             elif ent.label_ in ['DATE', 'TIME']:  # Datas
                 entidades['datas'].append(ent.text)
             
-        # Extrair entidades específicas do Monday.com
-        for token in doc:
-            if token.text.lower() in self.entidades_conhecidas['projetos']:
-                entidades['projetos'].append(token.text)
-            elif token.text.lower() in self.entidades_conhecidas['quadros']:
-                entidades['quadros'].append(token.text)
-            elif token.text.lower() in self.entidades_conhecidas['colunas']:
-                entidades['colunas'].append(token.text)
+        # Extrair entidades específicas do Monday.com (inclusive nomes com várias palavras)
+        for ocorrencia in self.casador_entidades.buscar(doc.text):
+            entidades[ocorrencia.categoria].append(doc.text[ocorrencia.inicio:ocorrencia.fim])
         
         logger.info("Entidades extraídas com sucesso!")
         return entidades
@@ -105,77 +260,252 @@ class AgenteAnalista:
         """
         logger.info("Identificando ações no texto...")
         
-        # Classificar intenções
-        resultado = self.classificador(texto)
+        # Classificar intenções com o mesmo modelo usado em analisar_intencoes
+        probabilidades = self.classificar(texto)
+        confianca, indice = probabilidades.max(dim=-1)
         
         # Mapear resultados para ações específicas
         acoes = []
-        for pred in resultado:
-            if pred['score'] > 0.7:  # Limiar de confiança
-                acao = {
-                    'tipo': pred['label'],
-                    'confianca': pred['score']
-                }
-                acoes.append(acao)
+        if confianca.item() > 0.7:  # Limiar de confiança
+            acoes.append({
+                'tipo': self.acoes[indice.item()],
+                'confianca': confianca.item()
+            })
         
         logger.info("Ações identificadas com sucesso!")
         return acoes
 
+    def classificar(self, texto: str) -> 'torch.Tensor':
+        """
+        Executa o classificador BERT sobre o texto.
+        
+        Com Config.BERT_MICRO_LOTE ativo, chamadas concorrentes são
+        agrupadas em um único forward pelo processador de micro-lotes.
+        
+        Args:
+            texto (str): Texto processado
+            
+        Returns:
+            torch.Tensor: Probabilidades de cada ação, na ordem de self.acoes
+        """
+        if self.micro_lotes is not None:
+            return self.micro_lotes.submeter(texto).result()
+        
+        return self.classificar_lote([texto])[0]
+
+    def classificar_lote(self, textos: list) -> 'torch.Tensor':
+        """
+        Classifica vários textos agrupando-os por comprimento.
+        
+        Os textos são tokenizados uma única vez, ordenados pelo número de
+        tokens e executados em lotes de até Config.BERT_BATCH_MAX, de modo
+        que cada lote só é preenchido até o seu maior texto.
+        
+        Args:
+            textos (list): Textos processados
+            
+        Returns:
+            torch.Tensor: Probabilidades no formato (len(textos), len(self.acoes)), na ordem de entrada
+        """
+        if self.backend.nome == 'compacto':
+            return self.backend.probabilidades(textos, self.acoes)
+        
+        import torch
+        
+        codificacao = self.tokenizer(textos, truncation=True, max_length=512)
+        comprimentos = [len(ids) for ids in codificacao['input_ids']]
+        
+        probabilidades = torch.empty(len(textos), len(self.acoes))
+        for indices in agrupar_por_comprimento(comprimentos, Config.BERT_BATCH_MAX):
+            inputs = self.tokenizer.pad(
+                {chave: [valores[i] for i in indices] for chave, valores in codificacao.items()},
+                return_tensors="pt"
+            )
+            logits = self.backend.logits(inputs)
+            probabilidades[indices] = logits.softmax(dim=-1).cpu()
+        
+        return probabilidades
+
+    def detectar_prioridade(self, texto: str) -> str:
+        """Detecta a prioridade (alta, media ou baixa) a partir de palavras-chave."""
+        encontrados = {
+            ocorrencia.categoria
+            for ocorrencia in self.casador_prioridades.buscar(texto, sobrepostos=True)
+        }
+        
+        for nivel in self.prioridades:
+            if nivel in encontrados:
+                return nivel
+        
+        return 'media'
+
+    def identificar_acao_cascata(self, texto_processado: str) -> tuple:
+        """
+        Identifica a ação pela cascata regras -> BERT.
+        
+        As regras compiladas respondem quando a confiança atinge
+        Config.LIMIAR_REGRAS; caso contrário o texto segue para o modelo.
+        
+        Args:
+            texto_processado (str): Texto processado
+            
+        Returns:
+            tuple: Ação identificada e confiança
+        """
+        acao, confianca = self.regras.classificar(texto_processado)
+        if confianca >= Config.LIMIAR_REGRAS:
+            self.estatisticas_cascata['regras'] += 1
+            CLASSIFICACOES.rotulos(origem='regras').inc()
+            return acao, confianca
+        
+        probabilidades = self.classificar(texto_processado)
+        self.estatisticas_cascata['modelo'] += 1
+        CLASSIFICACOES.rotulos(origem='modelo').inc()
+        confianca, indice = probabilidades.max(dim=-1)
+        return self.acoes[indice.item()], confianca.item()
+
     def analisar_intencoes(self, texto_processado):
         """Analisa o texto processado para identificar intenções e ações."""
         logger.info("Analisando intenções do texto...")
         
         # Extração de entidades com spaCy
         doc = self.nlp(texto_processado)
-        entidades = {
-            'pessoas': [ent.text for ent in doc.ents if ent.label_ == 'PER'],
-            'datas': [ent.text for ent in doc.ents if ent.label_ == 'DATE'],
-            'projetos': [ent.text for ent in doc.ents if ent.label_ == 'ORG']
-        }
         
-        # Identificação de ações com BERT
+        # Identificação de ações (regras e, se necessário, BERT)
         logger.info("Identificando ações no texto...")
-        inputs = self.tokenizer(
-            texto_processado,
-            return_tensors="pt",
-            padding=True,
-            truncation=True,
-            max_length=512
-        )
-        
-        with torch.no_grad():
-            outputs = self.model(**inputs)
-            
-        # Obter a predição
-        predicoes = torch.argmax(outputs.logits, dim=-1).item()
-        
-        # Mapear para ações
-        acoes = [
-            "criar_tarefa",
-            "atualizar_tarefa",
-            "mover_tarefa",
-            "comentar_tarefa"
+        acao, confianca = self.identificar_acao_cascata(texto_processado)
+        
+        logger.info("Ações identificadas com sucesso!")
+        logger.info("Análise de intenções concluída!")
+        
+        return self._montar_intencoes(texto_processado, doc, acao, confianca)
+
+    def analisar_intencoes_lote(self, textos_processados: list) -> list:
+        """
+        Analisa vários textos processados de uma vez.
+        
+        Args:
+            textos_processados (list): Textos já processados pelo AgentePre
+            
+        Returns:
+            list: Intenções de cada texto, na mesma ordem de entrada
+        """
+        logger.info(f"Analisando intenções de {len(textos_processados)} textos...")
+        
+        docs = list(self.nlp.pipe(textos_processados))
+        
+        # Regras primeiro; só os textos de baixa confiança vão para o BERT
+        acoes = [self.regras.classificar(texto) for texto in textos_processados]
+        pendentes = [i for i, (_, confianca) in enumerate(acoes) if confianca < Config.LIMIAR_REGRAS]
+        self.estatisticas_cascata['regras'] += len(acoes) - len(pendentes)
+        self.estatisticas_cascata['modelo'] += len(pendentes)
+        CLASSIFICACOES.rotulos(origem='regras').inc(len(acoes) - len(pendentes))
+        CLASSIFICACOES.rotulos(origem='modelo').inc(len(pendentes))
+        
+        if pendentes:
+            probabilidades = self.classificar_lote([textos_processados[i] for i in pendentes])
+            confiancas, indices = probabilidades.max(dim=-1)
+            for i, confianca, indice in zip(pendentes, confiancas.tolist(), indices.tolist()):
+                acoes[i] = (self.acoes[indice], confianca)
+        
+        logger.info("Análise de intenções em lote concluída!")
+        return [
+            self._montar_intencoes(texto, doc, acao, confianca)
+            for texto, doc, (acao, confianca) in zip(textos_processados, docs, acoes)
         ]
+
+    def segmentar_tarefas(self, texto_processado: str) -> list:
+        """
+        Divide o texto em frases candidatas a tarefa.
         
-        # Análise de prioridade
-        prioridades = {
-            'alta': ['urgente', 'imediato', 'prioridade alta'],
-            'media': ['importante', 'necessário', 'prioridade média'],
-            'baixa': ['pode esperar', 'não urgente', 'prioridade baixa']
-        }
+        Args:
+            texto_processado (str): Texto processado pelo AgentePre
+            
+        Returns:
+            list: Frases não vazias, na ordem do texto
+        """
+        return [
+            segmento.strip()
+            for segmento in SEPARADORES_TAREFAS.split(texto_processado)
+            if len(segmento.split()) >= 2
+        ]
+
+    def analisar_intencoes_multiplas(self, texto_processado: str) -> list:
+        """
+        Extrai uma intenção por tarefa mencionada no texto.
         
-        prioridade = 'media'
-        for nivel, palavras in prioridades.items():
-            if any(palavra in texto_processado.lower() for palavra in palavras):
-                prioridade = nivel
-                break
+        Atas de reunião costumam trazer várias tarefas, para pessoas e
+        prazos diferentes. Cada frase é analisada como um item de
+        analisar_intencoes_lote (um único nlp.pipe e um único lote no
+        BERT) e vira uma intenção se a ação for identificada com
+        confiança de pelo menos Config.LIMIAR_TAREFA. Frases sem projeto
+        herdam o último projeto citado ("No projeto X: João faz A. Maria
+        faz B.").
         
-        logger.info("Ações identificadas com sucesso!")
-        logger.info("Análise de intenções concluída!")
+        Args:
+            texto_processado (str): Texto processado pelo AgentePre
+            
+        Returns:
+            list: Intenções (formato de analisar_intencoes, com 'objetivo'
+                sendo a frase da tarefa); o texto inteiro vira uma única
+                intenção se nenhuma frase for reconhecida como tarefa
+        """
+        segmentos = self.segmentar_tarefas(texto_processado)
+        if len(segmentos) <= 1:
+            return [self._com_objetivo(self.analisar_intencoes(texto_processado), texto_processado)]
+        
+        tarefas = []
+        ultimo_projeto = []
+        for segmento, intencao in zip(segmentos, self.analisar_intencoes_lote(segmentos)):
+            projetos = intencao['entidades_validas']['projetos']
+            if projetos:
+                ultimo_projeto = projetos[-1:]
+            else:
+                intencao['entidades_validas']['projetos'] = list(ultimo_projeto)
+            
+            if intencao['confianca'] >= Config.LIMIAR_TAREFA:
+                tarefas.append(self._com_objetivo(intencao, segmento))
+        
+        if not tarefas:
+            return [self._com_objetivo(self.analisar_intencoes(texto_processado), texto_processado)]
+        
+        logger.info(f"{len(tarefas)} tarefas identificadas em {len(segmentos)} frases")
+        return tarefas
+
+    @staticmethod
+    def _com_objetivo(intencao: dict, objetivo: str) -> dict:
+        intencao['objetivo'] = objetivo
+        return intencao
+
+    def obter_estatisticas_cascata(self) -> dict:
+        """Retorna quantas classificações cada camada da cascata resolveu"""
+        total = sum(self.estatisticas_cascata.values())
+        return {
+            'regras': self.estatisticas_cascata['regras'],
+            'modelo': self.estatisticas_cascata['modelo'],
+            'taxa_regras': self.estatisticas_cascata['regras'] / total if total else 0.0
+        }
+
+    def _montar_intencoes(self, texto_processado: str, doc, acao: str, confianca: float) -> dict:
+        """Monta o dicionário de intenções a partir do doc spaCy e da ação identificada."""
+        entidades = {
+            'pessoas': [ent.text for ent in doc.ents if ent.label_ == 'PER'],
+            'datas': [ent.text for ent in doc.ents if ent.label_ == 'DATE'],
+            'projetos': [ent.text for ent in doc.ents if ent.label_ == 'ORG']
+        }
+        
+        # Projetos conhecidos que o NER não reconheceu como organização
+        for ocorrencia in self.casador_entidades.buscar(texto_processado):
+            nome = texto_processado[ocorrencia.inicio:ocorrencia.fim]
+            if ocorrencia.categoria == 'projetos' and not any(
+                nome.lower() in projeto.lower() for projeto in entidades['projetos']
+            ):
+                entidades['projetos'].append(nome)
         
         return {
             'entidades_validas': entidades,
-            'acao': acoes[predicoes],
-            'prioridade': prioridade,
+            'acao': acao,
+            'confianca': confianca,
+            'prioridade': self.detectar_prioridade(texto_processado),
             'texto_processado': texto_processado
         }
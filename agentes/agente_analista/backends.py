@@ -0,0 +1,205 @@
+import hashlib
+import logging
+import os
+from typing import TYPE_CHECKING
+import torch
+from config import Config
+
+if TYPE_CHECKING:
+    from transformers import BertForSequenceClassification
+
+logger = logging.getLogger(__name__)
+
+BACKENDS_DISPONIVEIS = ['fp32', 'int8', 'onnx', 'compacto']
+
+def configurar_threads_torch(intra: int = None, inter: int = None):
+    """
+    Define explicitamente o número de threads do PyTorch neste processo.
+
+    Com vários workers por máquina, deixar o PyTorch escolher sozinho faz
+    cada processo usar todos os núcleos e os workers disputam CPU.
+
+    Args:
+        intra (int): Threads dentro de cada operador (None mantém o padrão)
+        inter (int): Threads entre operadores independentes (None mantém o padrão)
+    """
+    if intra:
+        torch.set_num_threads(intra)
+    if inter:
+        try:
+            torch.set_num_interop_threads(inter)
+        except RuntimeError:
+            # Só pode ser definido antes do primeiro trabalho paralelo do processo
+            logger.warning("Threads inter-op já inicializadas; mantendo configuração atual")
+
+    logger.info(
+        f"Threads do PyTorch: intra-op={torch.get_num_threads()}, inter-op={torch.get_num_interop_threads()}"
+    )
+
+def carregar_modelo_bert() -> 'BertForSequenceClassification':
+    """Carrega o modelo BERT de classificação de intenções em modo de avaliação."""
+    from transformers import BertForSequenceClassification
+    model = BertForSequenceClassification.from_pretrained(
+        Config.BERT_MODEL,
+        num_labels=Config.BERT_NUM_LABELS
+    )
+    model.eval()
+    return model
+
+class BackendEager:
+    """Inferência PyTorch em precisão total (fp32)."""
+    nome = 'fp32'
+
+    def __init__(self, model: 'BertForSequenceClassification', device: torch.device):
+        self.model = model
+        self.device = device
+        self.model.to(self.device)
+
+    def logits(self, inputs: dict) -> torch.Tensor:
+        """
+        Executa o forward do modelo.
+
+        Args:
+            inputs (dict): Saída do tokenizer (tensores PyTorch)
+
+        Returns:
+            torch.Tensor: Logits no formato (lote, num_labels)
+        """
+        inputs = {nome: tensor.to(self.device) for nome, tensor in inputs.items()}
+        with torch.no_grad():
+            return self.model(**inputs).logits
+
+class BackendQuantizado(BackendEager):
+    """Inferência PyTorch com quantização dinâmica int8 das camadas lineares."""
+    nome = 'int8'
+
+    def __init__(self, model: 'BertForSequenceClassification', device: torch.device):
+        if device.type != 'cpu':
+            raise ValueError("A quantização dinâmica int8 só é suportada em CPU")
+
+        # Quantizar no próprio modelo para não manter uma cópia fp32 em memória
+        model = torch.quantization.quantize_dynamic(
+            model,
+            {torch.nn.Linear},
+            dtype=torch.qint8,
+            inplace=True
+        )
+        super().__init__(model, device)
+
+class BackendOnnx:
+    """Inferência com o grafo exportado para ONNX Runtime (CPU)."""
+    nome = 'onnx'
+
+    def __init__(self, caminho: str, tokenizer):
+        try:
+            import onnxruntime as ort
+        except ImportError as e:
+            raise ImportError("O backend 'onnx' requer o pacote onnxruntime") from e
+
+        if not os.path.exists(caminho):
+            exportar_onnx(carregar_modelo_bert(), tokenizer, caminho)
+
+        opcoes = ort.SessionOptions()
+        opcoes.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        opcoes.intra_op_num_threads = Config.TORCH_THREADS_INTRA or 0
+        opcoes.inter_op_num_threads = Config.TORCH_THREADS_INTER or 0
+        self.sessao = ort.InferenceSession(caminho, opcoes, providers=['CPUExecutionProvider'])
+        self.entradas = {entrada.name for entrada in self.sessao.get_inputs()}
+        self.device = torch.device('cpu')
+
+    def logits(self, inputs: dict) -> torch.Tensor:
+        """Executa a sessão ONNX e devolve os logits como tensor PyTorch."""
+        feed = {
+            nome: tensor.cpu().numpy()
+            for nome, tensor in inputs.items()
+            if nome in self.entradas
+        }
+        return torch.from_numpy(self.sessao.run(['logits'], feed)[0])
+
+class BackendCompacto:
+    """Classificador compacto (estilo fastText) treinado localmente; dispensa o BERT."""
+    nome = 'compacto'
+
+    def __init__(self, caminho: str):
+        from .modelo_compacto import ModeloCompacto
+
+        if not os.path.exists(caminho):
+            raise FileNotFoundError(
+                f"Modelo compacto não encontrado em {caminho}; "
+                "treine-o com python -m agentes.agente_analista.modelo_compacto"
+            )
+
+        self.modelo = ModeloCompacto.carregar(caminho)
+        with open(caminho, 'rb') as arquivo:
+            self.versao = f"compacto:{hashlib.sha256(arquivo.read()).hexdigest()[:12]}"
+
+    def probabilidades(self, textos: list, acoes: list) -> torch.Tensor:
+        """
+        Classifica os textos diretamente, sem tokenizer do BERT.
+
+        Args:
+            textos (list): Textos processados
+            acoes (list): Ordem desejada das colunas
+
+        Returns:
+            torch.Tensor: Probabilidades no formato (len(textos), len(acoes))
+        """
+        colunas = [self.modelo.rotulos.index(acao) for acao in acoes]
+        return torch.from_numpy(self.modelo.prever_proba(textos)[:, colunas])
+
+def exportar_onnx(model: 'BertForSequenceClassification', tokenizer, caminho: str):
+    """
+    Exporta o modelo BERT para ONNX com eixos dinâmicos de lote e sequência.
+
+    Args:
+        model (BertForSequenceClassification): Modelo carregado
+        tokenizer: Tokenizer correspondente ao modelo
+        caminho (str): Arquivo .onnx de destino
+    """
+    logger.info(f"Exportando modelo BERT para ONNX em {caminho}...")
+
+    diretorio = os.path.dirname(caminho)
+    if diretorio:
+        os.makedirs(diretorio, exist_ok=True)
+
+    exemplo = tokenizer("criar tarefa para o projeto", return_tensors="pt")
+    nomes_entrada = ['input_ids', 'attention_mask', 'token_type_ids']
+    eixos = {nome: {0: 'lote', 1: 'sequencia'} for nome in nomes_entrada}
+    eixos['logits'] = {0: 'lote'}
+
+    model.to(torch.device('cpu'))
+    with torch.no_grad():
+        torch.onnx.export(
+            model,
+            tuple(exemplo[nome] for nome in nomes_entrada),
+            caminho,
+            input_names=nomes_entrada,
+            output_names=['logits'],
+            dynamic_axes=eixos,
+            opset_version=14
+        )
+
+    logger.info("Modelo exportado para ONNX com sucesso!")
+
+def criar_backend(nome: str, tokenizer, device: torch.device):
+    """
+    Cria o backend de inferência do classificador de intenções.
+
+    Args:
+        nome (str): 'fp32', 'int8', 'onnx' ou 'compacto'
+        tokenizer: Tokenizer do BERT (usado na exportação ONNX)
+        device (torch.device): Dispositivo dos backends PyTorch
+
+    Returns:
+        Backend com o método logits(inputs), ou probabilidades(textos, acoes) no caso do compacto
+    """
+    if nome == 'fp32':
+        return BackendEager(carregar_modelo_bert(), device)
+    if nome == 'int8':
+        return BackendQuantizado(carregar_modelo_bert(), device)
+    if nome == 'onnx':
+        return BackendOnnx(Config.BERT_ONNX_PATH, tokenizer)
+    if nome == 'compacto':
+        return BackendCompacto(Config.MODELO_COMPACTO_PATH)
+
+    raise ValueError(f"Backend de inferência desconhecido: {nome} (opções: {', '.join(BACKENDS_DISPONIVEIS)})")
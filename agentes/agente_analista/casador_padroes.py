@@ -0,0 +1,156 @@
+from collections import deque
+from typing import List, NamedTuple
+
+class Ocorrencia(NamedTuple):
+    inicio: int
+    fim: int
+    categoria: str
+    padrao: str
+
+class CasadorPadroes:
+    """
+    Casamento de múltiplos padrões em uma única passada (Aho-Corasick).
+
+    Os padrões são inseridos incrementalmente na trie; os links de falha
+    são reconstruídos de forma preguiçosa na primeira busca após uma
+    alteração, então o custo da busca não depende do número de padrões.
+    A comparação ignora maiúsculas/minúsculas.
+    """
+
+    def __init__(self, limites_palavra: bool = True):
+        """
+        Args:
+            limites_palavra (bool): Só aceitar ocorrências delimitadas por caracteres não alfanuméricos
+        """
+        self.limites_palavra = limites_palavra
+
+        # Nó 0 é a raiz; cada nó tem transições, link de falha, saídas próprias
+        # e o link para o próximo nó com saída na cadeia de falhas
+        self._transicoes = [{}]
+        self._falha = [0]
+        self._saidas = [{}]
+        self._link_saida = [0]
+        self._compilado = True
+        self.total_padroes = 0
+
+    def adicionar(self, padrao: str, categoria: str):
+        """
+        Adiciona um padrão.
+
+        Args:
+            padrao (str): Frase a ser encontrada (ex.: "Projeto Marketing Digital")
+            categoria (str): Categoria devolvida nas ocorrências (ex.: 'projetos')
+        """
+        chave = padrao.strip().lower()
+        if not chave:
+            return
+
+        no = 0
+        for caractere in chave:
+            proximo = self._transicoes[no].get(caractere)
+            if proximo is None:
+                proximo = len(self._transicoes)
+                self._transicoes.append({})
+                self._falha.append(0)
+                self._saidas.append({})
+                self._link_saida.append(0)
+                self._transicoes[no][caractere] = proximo
+            no = proximo
+
+        if categoria not in self._saidas[no]:
+            self.total_padroes += 1
+        self._saidas[no][categoria] = (padrao.strip(), len(chave))
+        self._compilado = False
+
+    def adicionar_varios(self, padroes, categoria: str):
+        """Adiciona vários padrões de uma mesma categoria."""
+        for padrao in padroes:
+            self.adicionar(padrao, categoria)
+
+    def remover(self, padrao: str, categoria: str):
+        """Remove um padrão (os nós da trie são mantidos para reaproveitamento)."""
+        no = 0
+        for caractere in padrao.strip().lower():
+            no = self._transicoes[no].get(caractere)
+            if no is None:
+                return
+
+        if self._saidas[no].pop(categoria, None) is not None:
+            self.total_padroes -= 1
+            self._compilado = False
+
+    def buscar(self, texto: str, sobrepostos: bool = False) -> List[Ocorrencia]:
+        """
+        Encontra os padrões no texto em uma única passada.
+
+        Args:
+            texto (str): Texto de entrada
+            sobrepostos (bool): Se False, mantém apenas as ocorrências mais longas, sem sobreposição
+
+        Returns:
+            List[Ocorrencia]: Ocorrências ordenadas pela posição inicial
+        """
+        if not self._compilado:
+            self._compilar()
+
+        minusculo = texto.lower()
+        if len(minusculo) != len(texto):
+            # Preservar as posições quando a forma minúscula de algum caractere muda de tamanho
+            minusculo = ''.join(c.lower() if len(c.lower()) == 1 else c for c in texto)
+
+        ocorrencias = []
+        no = 0
+        for posicao, caractere in enumerate(minusculo):
+            while no and caractere not in self._transicoes[no]:
+                no = self._falha[no]
+            no = self._transicoes[no].get(caractere, 0)
+
+            saida = no if self._saidas[no] else self._link_saida[no]
+            while saida:
+                for categoria, (padrao, tamanho) in self._saidas[saida].items():
+                    inicio = posicao - tamanho + 1
+                    if self._delimitado(minusculo, inicio, posicao + 1):
+                        ocorrencias.append(Ocorrencia(inicio, posicao + 1, categoria, padrao))
+                saida = self._link_saida[saida]
+
+        ocorrencias.sort(key=lambda o: (o.inicio, -(o.fim - o.inicio)))
+        if sobrepostos:
+            return ocorrencias
+
+        selecionadas = []
+        fim_anterior = 0
+        for ocorrencia in ocorrencias:
+            if ocorrencia.inicio >= fim_anterior:
+                selecionadas.append(ocorrencia)
+                fim_anterior = ocorrencia.fim
+        return selecionadas
+
+    def _delimitado(self, texto: str, inicio: int, fim: int) -> bool:
+        if not self.limites_palavra:
+            return True
+        antes = inicio == 0 or not texto[inicio - 1].isalnum()
+        depois = fim == len(texto) or not texto[fim].isalnum()
+        return antes and depois
+
+    def _compilar(self):
+        """Reconstrói os links de falha e de saída por busca em largura."""
+        self._falha[0] = 0
+        fila = deque()
+        for filho in self._transicoes[0].values():
+            self._falha[filho] = 0
+            self._link_saida[filho] = 0
+            fila.append(filho)
+
+        while fila:
+            no = fila.popleft()
+            for caractere, filho in self._transicoes[no].items():
+                falha = self._falha[no]
+                while falha and caractere not in self._transicoes[falha]:
+                    falha = self._falha[falha]
+                falha = self._transicoes[falha].get(caractere, 0)
+
+                self._falha[filho] = falha
+                self._link_saida[filho] = falha if self._saidas[falha] else self._link_saida[falha]
+                fila.append(filho)
+
+        self._compilado = True
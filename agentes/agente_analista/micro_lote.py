@@ -0,0 +1,112 @@
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+logger = logging.getLogger(__name__)
+
+def agrupar_por_comprimento(comprimentos: list, tamanho_maximo: int) -> list:
+    """
+    Agrupa índices de textos em lotes de comprimento parecido.
+
+    Ordenar pelo número de tokens antes de fatiar faz com que cada lote
+    seja preenchido (padding) só até o maior texto do próprio lote.
+
+    Args:
+        comprimentos (list): Número de tokens de cada texto
+        tamanho_maximo (int): Quantidade máxima de textos por lote
+
+    Returns:
+        list: Lista de lotes, cada um com os índices originais dos textos
+    """
+    if tamanho_maximo < 1:
+        raise ValueError("tamanho_maximo deve ser pelo menos 1")
+
+    ordem = sorted(range(len(comprimentos)), key=lambda indice: comprimentos[indice])
+    return [ordem[i:i + tamanho_maximo] for i in range(0, len(ordem), tamanho_maximo)]
+
+class ProcessadorMicroLotes:
+    """
+    Junta chamadas concorrentes em micro-lotes.
+
+    Cada item submetido espera no máximo `espera_maxima` segundos por
+    companhia; o lote é executado assim que atinge `tamanho_maximo` itens
+    ou quando a janela expira.
+    """
+
+    def __init__(self, funcao_lote, tamanho_maximo: int = 32, espera_maxima: float = 0.005):
+        """
+        Args:
+            funcao_lote: Função que recebe uma lista de itens e devolve uma lista de resultados na mesma ordem
+            tamanho_maximo (int): Máximo de itens por lote
+            espera_maxima (float): Janela de espera em segundos após o primeiro item
+        """
+        self.funcao_lote = funcao_lote
+        self.tamanho_maximo = tamanho_maximo
+        self.espera_maxima = espera_maxima
+
+        self.fila = queue.Queue()
+        self.metricas = {
+            'lotes': 0,
+            'itens': 0
+        }
+
+        self._thread = threading.Thread(target=self._executar, name='micro-lotes', daemon=True)
+        self._thread.start()
+
+    def submeter(self, item) -> Future:
+        """Enfileira um item e retorna um Future com o seu resultado."""
+        futuro = Future()
+        self.fila.put((item, futuro))
+        return futuro
+
+    def encerrar(self):
+        """Processa os itens pendentes e encerra a thread de trabalho."""
+        self.fila.put(None)
+        self._thread.join()
+
+    def tamanho_medio_lote(self) -> float:
+        """Tamanho médio dos lotes executados até agora."""
+        if not self.metricas['lotes']:
+            return 0.0
+        return self.metricas['itens'] / self.metricas['lotes']
+
+    def _executar(self):
+        encerrar = False
+        while not encerrar:
+            primeiro = self.fila.get()
+            if primeiro is None:
+                break
+
+            lote = [primeiro]
+            prazo = time.monotonic() + self.espera_maxima
+            while len(lote) < self.tamanho_maximo:
+                restante = prazo - time.monotonic()
+                if restante <= 0:
+                    break
+                try:
+                    proximo = self.fila.get(timeout=restante)
+                except queue.Empty:
+                    break
+                if proximo is None:
+                    encerrar = True
+                    break
+                lote.append(proximo)
+
+            self._processar_lote(lote)
+
+    def _processar_lote(self, lote: list):
+        itens = [item for item, _ in lote]
+        try:
+            resultados = self.funcao_lote(itens)
+        except Exception as e:
+            logger.error(f"Erro ao processar micro-lote: {str(e)}")
+            for _, futuro in lote:
+                futuro.set_exception(e)
+            return
+
+        self.metricas['lotes'] += 1
+        self.metricas['itens'] += len(lote)
+        for (_, futuro), resultado in zip(lote, resultados):
+            futuro.set_result(resultado)
@@ -0,0 +1,213 @@
+"""
+Classificador compacto de intenções no estilo fastText.
+
+Cada texto vira a média de embeddings de n-gramas com hashing (palavras,
+bigramas de palavras e n-gramas de caracteres), seguida de uma camada
+linear com softmax. O modelo inteiro cabe em poucos MB e classifica um
+comando curto em microssegundos, sem PyTorch.
+
+Treino a partir de um arquivo JSON-lines com {"texto": ..., "acao": ...}:
+    python -m agentes.agente_analista.modelo_compacto dados.jsonl modelos/intencoes_compacto.npz
+
+Com --destilar, as linhas sem "acao" são rotuladas pelo BERT (professor).
+"""
+import argparse
+import json
+import logging
+import os
+import re
+import zlib
+from typing import List
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+class ModeloCompacto:
+    def __init__(self, rotulos: list, dimensao: int = 32, buckets: int = 2 ** 16, ngramas_caracteres: tuple = (3, 5)):
+        """
+        Inicializa um modelo compacto não treinado.
+
+        Args:
+            rotulos (list): Nomes das classes (ex.: ações do AgenteAnalista)
+            dimensao (int): Dimensão dos embeddings
+            buckets (int): Número de buckets do hashing de n-gramas
+            ngramas_caracteres (tuple): Tamanho mínimo e máximo dos n-gramas de caracteres
+        """
+        self.rotulos = list(rotulos)
+        self.dimensao = dimensao
+        self.buckets = buckets
+        self.ngramas_caracteres = tuple(ngramas_caracteres)
+
+        gerador = np.random.default_rng(0)
+        self.embeddings = gerador.uniform(-1 / dimensao, 1 / dimensao, (buckets, dimensao)).astype(np.float32)
+        self.pesos = np.zeros((dimensao, len(self.rotulos)), dtype=np.float32)
+        self.vies = np.zeros(len(self.rotulos), dtype=np.float32)
+
+    def extrair_indices(self, texto: str) -> np.ndarray:
+        """Converte o texto nos índices (com hashing) dos seus n-gramas."""
+        palavras = re.findall(r'\w+', texto.lower())
+        ngramas = list(palavras)
+        ngramas.extend(f"{a} {b}" for a, b in zip(palavras, palavras[1:]))
+
+        minimo, maximo = self.ngramas_caracteres
+        for palavra in palavras:
+            marcada = f"<{palavra}>"
+            for tamanho in range(minimo, maximo + 1):
+                ngramas.extend(marcada[i:i + tamanho] for i in range(len(marcada) - tamanho + 1))
+
+        if not ngramas:
+            ngramas = ['<vazio>']
+        return np.fromiter(
+            (zlib.crc32(ngrama.encode('utf-8')) % self.buckets for ngrama in ngramas),
+            dtype=np.int64,
+            count=len(ngramas)
+        )
+
+    def prever_proba(self, textos: List[str]) -> np.ndarray:
+        """
+        Calcula as probabilidades de cada classe.
+
+        Args:
+            textos (List[str]): Textos a classificar
+
+        Returns:
+            np.ndarray: Matriz (len(textos), len(rotulos))
+        """
+        representacoes = np.stack([
+            self.embeddings[self.extrair_indices(texto)].mean(axis=0)
+            for texto in textos
+        ])
+        return _softmax(representacoes @ self.pesos + self.vies)
+
+    def prever(self, textos: List[str]) -> list:
+        """Retorna o rótulo mais provável de cada texto."""
+        return [self.rotulos[i] for i in self.prever_proba(textos).argmax(axis=1)]
+
+    def treinar(self, textos: List[str], alvos, epocas: int = 30, taxa_aprendizado: float = 2.0) -> float:
+        """
+        Treina o modelo com SGD e entropia cruzada.
+
+        Args:
+            textos (List[str]): Textos de treino
+            alvos: Lista de rótulos ou matriz (len(textos), len(rotulos)) de probabilidades (destilação)
+            epocas (int): Passadas sobre os dados
+            taxa_aprendizado (float): Taxa inicial, decai linearmente até zero
+
+        Returns:
+            float: Perda média da última época
+        """
+        if isinstance(alvos, np.ndarray) and alvos.ndim == 2:
+            distribuicoes = alvos.astype(np.float32)
+        else:
+            distribuicoes = np.zeros((len(textos), len(self.rotulos)), dtype=np.float32)
+            for i, rotulo in enumerate(alvos):
+                distribuicoes[i, self.rotulos.index(rotulo)] = 1.0
+
+        indices = [self.extrair_indices(texto) for texto in textos]
+        gerador = np.random.default_rng(0)
+        total_passos = max(1, epocas * len(textos))
+        passo = 0
+        perda = 0.0
+
+        for _ in range(epocas):
+            perda = 0.0
+            for i in gerador.permutation(len(textos)):
+                taxa = taxa_aprendizado * (1 - passo / total_passos)
+                passo += 1
+
+                representacao = self.embeddings[indices[i]].mean(axis=0)
+                probabilidades = _softmax(representacao @ self.pesos + self.vies)
+                perda -= float(np.sum(distribuicoes[i] * np.log(probabilidades + 1e-9)))
+
+                erro = probabilidades - distribuicoes[i]
+                gradiente_representacao = self.pesos @ erro
+                self.pesos -= taxa * np.outer(representacao, erro)
+                self.vies -= taxa * erro
+                np.subtract.at(
+                    self.embeddings,
+                    indices[i],
+                    taxa * gradiente_representacao / len(indices[i])
+                )
+            perda /= max(1, len(textos))
+
+        logger.info(f"Modelo compacto treinado: perda final {perda:.4f}")
+        return perda
+
+    def salvar(self, caminho: str):
+        """Salva o modelo em um arquivo .npz."""
+        diretorio = os.path.dirname(caminho)
+        if diretorio:
+            os.makedirs(diretorio, exist_ok=True)
+        
+        np.savez_compressed(
+            caminho,
+            rotulos=np.array(self.rotulos),
+            ngramas_caracteres=np.array(self.ngramas_caracteres),
+            embeddings=self.embeddings,
+            pesos=self.pesos,
+            vies=self.vies
+        )
+
+    @classmethod
+    def carregar(cls, caminho: str) -> 'ModeloCompacto':
+        """Carrega um modelo salvo com salvar()."""
+        dados = np.load(caminho)
+        embeddings = dados['embeddings']
+        modelo = cls.__new__(cls)
+        modelo.rotulos = [str(rotulo) for rotulo in dados['rotulos']]
+        modelo.ngramas_caracteres = tuple(int(n) for n in dados['ngramas_caracteres'])
+        modelo.buckets, modelo.dimensao = embeddings.shape
+        modelo.embeddings = embeddings
+        modelo.pesos = dados['pesos']
+        modelo.vies = dados['vies']
+        return modelo
+
+def _softmax(logits: np.ndarray) -> np.ndarray:
+    exp = np.exp(logits - logits.max(axis=-1, keepdims=True))
+    return exp / exp.sum(axis=-1, keepdims=True)
+
+def carregar_dados(caminho: str) -> list:
+    """Lê um arquivo JSON-lines com registros {"texto": ..., "acao": ...}."""
+    with open(caminho, encoding='utf-8') as arquivo:
+        return [json.loads(linha) for linha in arquivo if linha.strip()]
+
+def main():
+    parser = argparse.ArgumentParser(description="Treina o classificador compacto de intenções")
+    parser.add_argument('dados', help='Arquivo JSON-lines com {"texto", "acao"}')
+    parser.add_argument('saida', help='Arquivo .npz de destino')
+    parser.add_argument('--epocas', type=int, default=30)
+    parser.add_argument('--dimensao', type=int, default=32)
+    parser.add_argument('--destilar', action='store_true', help='Rotular com o BERT as linhas sem "acao"')
+    args = parser.parse_args()
+
+    from config import Config
+    from .agente_analista import ACOES
+
+    registros = carregar_dados(args.dados)
+    textos = [registro['texto'] for registro in registros]
+    alvos = np.zeros((len(registros), len(ACOES)), dtype=np.float32)
+
+    sem_rotulo = [i for i, registro in enumerate(registros) if 'acao' not in registro]
+    if sem_rotulo:
+        if not args.destilar:
+            parser.error(f"{len(sem_rotulo)} linhas sem 'acao'; use --destilar para rotulá-las com o BERT")
+
+        from .agente_analista import AgenteAnalista
+        Config.AQUECER_MODELOS = False
+        if Config.BERT_BACKEND == 'compacto':
+            Config.BERT_BACKEND = 'fp32'
+        professor = AgenteAnalista()
+        alvos[sem_rotulo] = professor.classificar_lote([textos[i] for i in sem_rotulo]).numpy()
+
+    for i, registro in enumerate(registros):
+        if 'acao' in registro:
+            alvos[i, ACOES.index(registro['acao'])] = 1.0
+
+    modelo = ModeloCompacto(ACOES, dimensao=args.dimensao)
+    modelo.treinar(textos, alvos, epocas=args.epocas)
+    modelo.salvar(args.saida)
+    print(f"Modelo salvo em {args.saida}")
+
+if __name__ == '__main__':
+    main()
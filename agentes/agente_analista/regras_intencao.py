@@ -0,0 +1,73 @@
+import re
+from typing import Tuple
+
+# Padrões por ação: verbos em português (infinitivo, imperativo e formas
+# comuns de conjugação) e substantivos que indicam a intenção
+PADROES_ACOES = {
+    'criar_tarefa': [
+        r'cri(?:ar|e|a|em|amos|ando|ado|ada)',
+        r'adicion(?:ar|e|a|em|ando)',
+        r'cadastr(?:ar|e|a|em)',
+        r'nova\s+tarefa',
+        r'abr(?:ir|a)\s+(?:uma\s+)?tarefa',
+    ],
+    'atualizar_tarefa': [
+        r'atualiz(?:ar|e|a|em|amos|ando|ado|ada)',
+        r'alter(?:ar|e|a|em|ando)',
+        r'modific(?:ar|a|ando)|modifique',
+        r'edit(?:ar|e|a|em)',
+        r'mud(?:ar|e|a)\s+(?:o\s+|a\s+)?(?:status|prazo|responsável|data)',
+    ],
+    'mover_tarefa': [
+        r'mov(?:er|a|e|am|emos|endo|ido|ida)',
+        r'transfer(?:ir|a|e|indo)',
+        r'pass(?:ar|e|a)\s+(?:\w+\s+){0,3}para\s+(?:a\s+)?coluna',
+    ],
+    'comentar_tarefa': [
+        r'coment(?:ar|e|a|em|ando|ário|ários)',
+        r'anot(?:ar|e|a)',
+        r'observação',
+    ],
+}
+
+class ClassificadorRegras:
+    """
+    Primeira camada da cascata de classificação de intenções.
+
+    Cada ação tem uma expressão regular compilada; a confiança é a fração
+    das ocorrências que pertencem à ação vencedora, de modo que textos com
+    verbos de ações diferentes ficam abaixo do limiar e seguem para o BERT.
+    """
+
+    def __init__(self, padroes: dict = None, confianca_maxima: float = 0.95):
+        """
+        Args:
+            padroes (dict): Ação -> lista de padrões regex (padrão: PADROES_ACOES)
+            confianca_maxima (float): Confiança quando só uma ação é encontrada
+        """
+        self.confianca_maxima = confianca_maxima
+        self.regras = {
+            acao: re.compile(r'\b(?:' + '|'.join(lista) + r')\b', re.IGNORECASE)
+            for acao, lista in (padroes or PADROES_ACOES).items()
+        }
+
+    def classificar(self, texto: str) -> Tuple[str, float]:
+        """
+        Classifica o texto pelas regras.
+
+        Args:
+            texto (str): Texto processado
+
+        Returns:
+            Tuple[str, float]: Ação mais provável (ou None) e a confiança
+        """
+        ocorrencias = {
+            acao: len(regra.findall(texto))
+            for acao, regra in self.regras.items()
+        }
+        total = sum(ocorrencias.values())
+        if not total:
+            return None, 0.0
+
+        acao = max(ocorrencias, key=ocorrencias.get)
+        return acao, self.confianca_maxima * ocorrencias[acao] / total
@@ -1,5 +1,13 @@
+import itertools
+import types
 import pytest
+
+# Testes que carregam o spaCy e o BERT; os da cascata de regras, do casador,
+# dos micro-lotes e do modelo compacto ficam em módulos próprios, sem PyTorch
+torch = pytest.importorskip('torch')
+
 from agente_analista import AgenteAnalista
+from agente_analista.backends import criar_backend
 
 def test_extrair_entidades():
     """Testa a extração de entidades"""
@@ -38,3 +46,117 @@ def test_analisar_intencoes():
     assert 'objetivo' in intencoes
     assert 'prioridade' in intencoes
     assert 'entidades' in intencoes
+
+def tensores_alcancaveis(raiz, profundidade: int = 8) -> dict:
+    """data_ptr -> bytes de cada tensor (parâmetros, buffers, state_dicts...) alcançável a partir de `raiz`"""
+    tensores = {}
+    vistos = set()
+    pendentes = [(raiz, 0)]
+    while pendentes:
+        objeto, nivel = pendentes.pop()
+        if objeto is None or nivel > profundidade or id(objeto) in vistos:
+            continue
+        if isinstance(objeto, (str, bytes, int, float, bool, type, types.ModuleType)):
+            continue
+        vistos.add(id(objeto))
+        
+        if isinstance(objeto, torch.Tensor):
+            tensores[objeto.data_ptr()] = objeto.numel() * objeto.element_size()
+        elif isinstance(objeto, torch.nn.Module):
+            pendentes.extend((tensor, nivel + 1) for tensor in itertools.chain(objeto.parameters(), objeto.buffers()))
+        elif isinstance(objeto, dict):
+            pendentes.extend((valor, nivel + 1) for valor in objeto.values())
+        elif isinstance(objeto, (list, tuple, set, frozenset)):
+            pendentes.extend((valor, nivel + 1) for valor in objeto)
+        elif hasattr(objeto, '__dict__'):
+            pendentes.extend((valor, nivel + 1) for valor in vars(objeto).values())
+    return tensores
+
+def test_modelo_bert_unico(monkeypatch):
+    """Testa que o AgenteAnalista mantém uma única cópia dos pesos do BERT"""
+    from config import Config
+    monkeypatch.setattr(Config, 'BERT_BACKEND', 'fp32')
+    agente = AgenteAnalista()
+    
+    assert not hasattr(agente, 'classificador')
+    assert agente.backend.model is agente.model
+    
+    # Todos os tensores alcançáveis pelo agente (backend, pipelines, dicts...) são os do modelo
+    bytes_modelo = sum(tensores_alcancaveis(agente.model).values())
+    assert sum(tensores_alcancaveis(agente).values()) == bytes_modelo
+    
+    # Uma cópia dos pesos guardada em qualquer lugar seria detectada
+    agente.backend.pesos = {'copia': {nome: tensor.clone() for nome, tensor in agente.model.state_dict().items()}}
+    assert sum(tensores_alcancaveis(agente).values()) > bytes_modelo
+def test_criar_backend_desconhecido():
+    """Testa que backends de inferência desconhecidos são rejeitados"""
+    with pytest.raises(ValueError):
+        criar_backend('fp16', None, torch.device('cpu'))
+
+def test_classificar_lote():
+    """Testa que a classificação em lote equivale à classificação individual"""
+    agente = AgenteAnalista()
+    textos = [
+        "Criar uma nova tarefa para o projeto Marketing",
+        "Mover a tarefa de deploy para a coluna Concluído no quadro Infraestrutura",
+        "Comentar na tarefa do relatório"
+    ]
+    
+    probabilidades = agente.classificar_lote(textos)
+    
+    assert probabilidades.shape == (len(textos), len(agente.acoes))
+    for texto, probs in zip(textos, probabilidades):
+        assert torch.allclose(agente.classificar(texto), probs, atol=1e-4)
+
+def test_cascata_regras_antes_do_modelo():
+    """Testa que comandos triviais não passam pelo BERT"""
+    agente = AgenteAnalista()
+    
+    intencoes = agente.analisar_intencoes("João precisa criar tarefa projeto Marketing")
+    
+    assert intencoes['acao'] == 'criar_tarefa'
+    assert agente.obter_estatisticas_cascata()['regras'] == 1
+    assert agente.obter_estatisticas_cascata()['modelo'] == 0
+
+def test_extrair_entidades_nomes_compostos():
+    """Testa a extração de projetos conhecidos com várias palavras"""
+    agente = AgenteAnalista()
+    agente.registrar_entidades('projetos', ['Projeto Marketing Digital'])
+    
+    entidades = agente.extrair_entidades("Criar tarefa para o Projeto Marketing Digital")
+    
+    assert 'Projeto Marketing Digital' in entidades['projetos']
+
+def test_versao_dados_muda_com_entidades(monkeypatch):
+    """Testa que a versão dos dados acompanha o dicionário de entidades e os limiares"""
+    from config import Config
+    agente = AgenteAnalista()
+    inicial = agente.versao_dados()
+    
+    agente.registrar_entidades('projetos', ['Portal do Cliente'])
+    com_projeto = agente.versao_dados()
+    assert com_projeto != inicial
+    
+    agente.remover_entidades('projetos', ['Portal do Cliente'])
+    assert agente.versao_dados() == inicial
+    
+    monkeypatch.setattr(Config, 'LIMIAR_REGRAS', Config.LIMIAR_REGRAS / 2)
+    assert agente.versao_dados() != inicial
+
+def test_detectar_prioridade():
+    """Testa a detecção de prioridade por frases"""
+    agente = AgenteAnalista()
+    
+    assert agente.detectar_prioridade("Isso é urgente") == 'alta'
+    assert agente.detectar_prioridade("Tarefa importante") == 'media'
+    assert agente.detectar_prioridade("Pode esperar até semana que vem") == 'baixa'
+    assert agente.detectar_prioridade("Criar tarefa") == 'media'
+
+def test_aquecer():
+    """Testa que o aquecimento não altera as estatísticas da cascata"""
+    agente = AgenteAnalista()
+    
+    duracao = agente.aquecer()
+    
+    assert duracao > 0
+    assert agente.obter_estatisticas_cascata()['modelo'] == 0
@@ -0,0 +1,21 @@
+from agente_analista.casador_padroes import CasadorPadroes
+
+def test_casador_padroes():
+    """Testa o casamento de vários padrões em uma passada"""
+    casador = CasadorPadroes()
+    casador.adicionar_varios(['Projeto Marketing', 'Projeto Marketing Digital', 'XPTO'], 'projetos')
+    casador.adicionar('Em andamento', 'colunas')
+    
+    texto = "Mover tarefa do Projeto Marketing Digital para em andamento; XPTOS não conta"
+    ocorrencias = casador.buscar(texto)
+    
+    assert [(o.categoria, texto[o.inicio:o.fim]) for o in ocorrencias] == [
+        ('projetos', 'Projeto Marketing Digital'),
+        ('colunas', 'em andamento')
+    ]
+    
+    # Atualização incremental do diretório
+    casador.remover('Projeto Marketing Digital', 'projetos')
+    casador.adicionar('Infraestrutura', 'quadros')
+    ocorrencias = casador.buscar("Projeto Marketing Digital no quadro Infraestrutura")
+    assert [o.padrao for o in ocorrencias] == ['Projeto Marketing', 'Infraestrutura']
@@ -0,0 +1,24 @@
+from agente_analista.micro_lote import agrupar_por_comprimento, ProcessadorMicroLotes
+
+def test_agrupar_por_comprimento():
+    """Testa o agrupamento de textos por número de tokens"""
+    comprimentos = [50, 5, 48, 7, 6, 49]
+    
+    lotes = agrupar_por_comprimento(comprimentos, 3)
+    
+    assert lotes == [[1, 4, 3], [2, 5, 0]]
+    assert sorted(i for lote in lotes for i in lote) == list(range(len(comprimentos)))
+
+def test_processador_micro_lotes():
+    """Testa que chamadas concorrentes são agrupadas em um mesmo lote"""
+    lotes = []
+    def dobrar(itens):
+        lotes.append(list(itens))
+        return [item * 2 for item in itens]
+    
+    processador = ProcessadorMicroLotes(dobrar, tamanho_maximo=4, espera_maxima=0.2)
+    futuros = [processador.submeter(i) for i in range(6)]
+    
+    assert [futuro.result(timeout=5) for futuro in futuros] == [0, 2, 4, 6, 8, 10]
+    assert max(len(lote) for lote in lotes) == 4
+    processador.encerrar()
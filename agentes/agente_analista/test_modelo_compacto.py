@@ -0,0 +1,21 @@
+import os
+from agente_analista.modelo_compacto import ModeloCompacto, carregar_dados
+
+RAIZ_PROJETO = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def test_modelo_compacto(tmp_path):
+    """Testa treino, predição e persistência do modelo compacto"""
+    registros = carregar_dados(os.path.join(RAIZ_PROJETO, 'dados', 'intencoes_exemplo.jsonl'))
+    textos = [registro['texto'] for registro in registros]
+    rotulos = [registro['acao'] for registro in registros]
+    
+    modelo = ModeloCompacto(['criar_tarefa', 'atualizar_tarefa', 'mover_tarefa', 'comentar_tarefa'])
+    modelo.treinar(textos, rotulos)
+    
+    acertos = sum(previsto == rotulo for previsto, rotulo in zip(modelo.prever(textos), rotulos))
+    assert acertos / len(rotulos) >= 0.9
+    
+    caminho = str(tmp_path / 'compacto.npz')
+    modelo.salvar(caminho)
+    carregado = ModeloCompacto.carregar(caminho)
+    assert carregado.prever(textos) == modelo.prever(textos)
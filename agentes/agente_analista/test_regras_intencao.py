@@ -0,0 +1,18 @@
+from agente_analista.regras_intencao import ClassificadorRegras
+
+def test_classificador_regras():
+    """Testa a camada de regras da cascata"""
+    regras = ClassificadorRegras()
+    
+    assert regras.classificar("João precisa criar tarefa projeto Marketing")[0] == 'criar_tarefa'
+    assert regras.classificar("Mova a tarefa de deploy para Concluído")[0] == 'mover_tarefa'
+    assert regras.classificar("Atualizar o prazo da tarefa")[0] == 'atualizar_tarefa'
+    assert regras.classificar("Comente na tarefa do relatório")[0] == 'comentar_tarefa'
+    
+    # Verbos de ações diferentes reduzem a confiança
+    _, confianca_unica = regras.classificar("Criar tarefa de revisão")
+    _, confianca_mista = regras.classificar("Criar tarefa e comentar na anterior")
+    assert confianca_mista < confianca_unica
+    
+    # Sem nenhum verbo conhecido
+    assert regras.classificar("Reunião de alinhamento amanhã") == (None, 0.0)
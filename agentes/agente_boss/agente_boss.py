@@ -1,26 +1,42 @@
 import logging
-import pandas as pd
-import numpy as np
+import threading
 from datetime import datetime, timedelta
-from sklearn.metrics import accuracy_score, f1_score
+from typing import TYPE_CHECKING
 from config import Config
+from .registro_colunar import RegistroColunar
+from .metricas_incrementais import MetricasIncrementais
+from .historico_persistente import HistoricoPersistente
+from agentes.monitoramento import metricas
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 logger = logging.getLogger(__name__)
 
+OPERACOES = metricas.contador('operacoes', 'Operações registradas pelo AgenteBoss', ('acao', 'resultado'))
+
 class AgenteBoss:
-    def __init__(self):
-        """Inicializa o AgenteBoss"""
+    def __init__(self, diretorio_historico: str = None):
+        """
+        Inicializa o AgenteBoss.
+        
+        Args:
+            diretorio_historico (str): Diretório do histórico persistente por dia
+                (padrão: Config.HISTORICO_DIRETORIO; None mantém só a memória)
+        """
         logger.info("Inicializando AgenteBoss...")
         
-        # Histórico de operações
-        self.historico = pd.DataFrame(columns=[
-            'timestamp',
-            'agente',
-            'acao',
-            'resultado',
-            'tempo_execucao',
-            'erro'
-        ])
+        # Histórico de operações (colunar, somente acréscimo)
+        self.registro = RegistroColunar()
+        
+        # Histórico em disco, particionado por dia, para análises entre reinícios
+        diretorio_historico = diretorio_historico or Config.HISTORICO_DIRETORIO
+        self.historico_persistente = HistoricoPersistente(diretorio_historico) if diretorio_historico else None
+        
+        self._lock = threading.Lock()
+        
+        # Contadores, médias e janelas atualizados a cada operação
+        self.metricas_incrementais = MetricasIncrementais()
         
         # Métricas de desempenho
         self.metricas = {
@@ -39,6 +55,11 @@ class AgenteBoss:
         
         logger.info("AgenteBoss inicializado com sucesso!")
 
+    @property
+    def historico(self) -> 'pd.DataFrame':
+        """Visão em DataFrame do histórico de operações, montada sob demanda."""
+        return self.registro.para_dataframe()
+
     def registrar_operacao(self, resultado: dict):
         """
         Registra uma operação no histórico.
@@ -46,19 +67,41 @@ class AgenteBoss:
         Args:
             resultado (dict): Resultado da operação
         """
-        registro = {
-            'timestamp': datetime.now(),
-            'agente': 'executor',
-            'acao': resultado.get('acao', 'desconhecida'),
-            'resultado': 'sucesso' if resultado.get('sucesso', False) else 'falha',
-            'tempo_execucao': resultado.get('tempo_execucao', 0),
-            'erro': resultado.get('erro')
-        }
-        
-        self.historico = pd.concat([
-            self.historico,
-            pd.DataFrame([registro])
-        ], ignore_index=True)
+        timestamp = datetime.now()
+        acao = resultado.get('acao', 'desconhecida')
+        sucesso = resultado.get('sucesso', False)
+        tempo_execucao = resultado.get('tempo_execucao', 0) or 0.0
+        erro = resultado.get('erro')
+        
+        # Operações podem chegar de várias threads (processar_lote)
+        with self._lock:
+            self.registro.adicionar(
+                timestamp=timestamp,
+                agente='executor',
+                acao=acao,
+                resultado='sucesso' if sucesso else 'falha',
+                tempo_execucao=tempo_execucao,
+                erro=erro
+            )
+            self.metricas_incrementais.registrar(
+                agente='executor',
+                acao=acao,
+                sucesso=sucesso,
+                tempo_execucao=tempo_execucao,
+                erro=erro is not None,
+                instante=timestamp.timestamp()
+            )
+        OPERACOES.rotulos(acao=acao, resultado='sucesso' if sucesso else 'falha').inc()
+        
+        if self.historico_persistente is not None:
+            self.historico_persistente.adicionar(
+                timestamp=timestamp,
+                agente='executor',
+                acao=acao,
+                resultado='sucesso' if sucesso else 'falha',
+                tempo_execucao=tempo_execucao,
+                erro=erro
+            )
         
         logger.info(f"Operação registrada: executor - {resultado.get('acao', 'desconhecida')}")
 
@@ -66,27 +109,50 @@ class AgenteBoss:
         """
         Analisa o desempenho geral do sistema.
         
+        Usa os contadores incrementais: o custo depende do número de
+        agentes, não do tamanho do histórico.
+        
         Returns:
             dict: Métricas de desempenho
         """
         logger.info("Analisando desempenho do sistema...")
         
+        metricas = self.metricas_incrementais
+        
         # Calcular métricas por agente
-        for agente in self.historico['agente'].unique():
-            df_agente = self.historico[self.historico['agente'] == agente]
-            
-            self.metricas['precisao'][agente] = (df_agente['resultado'] == 'sucesso').mean()
-            self.metricas['tempo_medio'][agente] = df_agente['tempo_execucao'].mean()
-            self.metricas['taxa_erro'][agente] = df_agente['erro'].notna().mean()
+        for agente, contadores in metricas.por_agente.items():
+            self.metricas['precisao'][agente] = contadores.taxa_sucesso
+            self.metricas['tempo_medio'][agente] = contadores.tempo.media
+            self.metricas['taxa_erro'][agente] = contadores.taxa_erro
             
         # Calcular métricas gerais
-        self.metricas['precisao']['total'] = (self.historico['resultado'] == 'sucesso').mean()
-        self.metricas['tempo_medio']['total'] = self.historico['tempo_execucao'].mean()
-        self.metricas['taxa_erro']['total'] = self.historico['erro'].notna().mean()
+        self.metricas['precisao']['total'] = metricas.total.taxa_sucesso
+        self.metricas['tempo_medio']['total'] = metricas.total.tempo.media if metricas.total.operacoes else float('nan')
+        self.metricas['taxa_erro']['total'] = metricas.total.taxa_erro
         
         logger.info("Análise de desempenho concluída!")
         return self.metricas
 
+    def obter_metricas_operacao(self) -> dict:
+        """
+        Retorna um resumo das métricas correntes, incluindo a janela deslizante.
+        
+        Returns:
+            dict: Totais, tempo de execução e agregados da janela por agente
+        """
+        metricas = self.metricas_incrementais
+        return {
+            'operacoes_registradas': metricas.total.operacoes,
+            'tempo_execucao': metricas.total.tempo.resumo(),
+            'janela': {
+                'total': metricas.total.janela.resumo(),
+                **{
+                    agente: contadores.janela.resumo()
+                    for agente, contadores in metricas.por_agente.items()
+                }
+            }
+        }
+
     def gerar_sugestoes_otimizacao(self) -> dict:
         """
         Gera sugestões de otimização baseadas no histórico.
@@ -96,33 +162,24 @@ class AgenteBoss:
         """
         logger.info("Gerando sugestões de otimização...")
         
-        # Analisar erros por agente
-        erros_por_agente = self.historico.groupby('agente')['erro'].apply(lambda x: x.notna().sum())
-        
-        # Analisar tempo de execução
-        tempos_medios = self.historico.groupby('agente')['tempo_execucao'].mean()
-        
-        # Analisar taxa de sucesso
-        sucessos = self.historico.groupby('agente')['resultado'].apply(lambda x: (x == 'sucesso').mean())
-        
         # Gerar sugestões
-        for agente in self.historico['agente'].unique():
+        for agente, contadores in self.metricas_incrementais.por_agente.items():
             self.sugestoes['agentes'][agente] = []
             
             # Sugestões baseadas em erros
-            if erros_por_agente[agente] > 10:
+            if contadores.erros > 10:
                 self.sugestoes['agentes'][agente].append(
                     "Revisar lógica de tratamento de erros"
                 )
                 
             # Sugestões baseadas em tempo
-            if tempos_medios[agente] > 5:  # 5 segundos
+            if contadores.tempo.media > 5:  # 5 segundos
                 self.sugestoes['agentes'][agente].append(
                     "Otimizar processamento"
                 )
                 
             # Sugestões baseadas em taxa de sucesso
-            if sucessos[agente] < 0.8:  # 80%
+            if contadores.taxa_sucesso < 0.8:  # 80%
                 self.sugestoes['agentes'][agente].append(
                     "Revisar regras de negócio"
                 )
@@ -142,35 +199,34 @@ class AgenteBoss:
         """
         logger.info("Aprendendo padrões de uso...")
         
-        # Filtrar histórico recente
+        # Agregar o período por hora do dia e agente
         periodo_analise = datetime.now() - timedelta(days=periodo)
-        df_recente = self.historico[self.historico['timestamp'] >= periodo_analise]
+        agregados = self._agregar_por_hora(periodo_analise)
         
         # Identificar padrões
         padroes = {}
         
         # Padrões de uso
-        uso_por_hora = df_recente.groupby(
-            df_recente['timestamp'].dt.hour
-        )['agente'].count()
+        uso_por_hora = agregados.groupby('hora')['operacoes'].sum()
         
-        padroes['horario_pico'] = uso_por_hora.idxmax()
-        padroes['horario_vale'] = uso_por_hora.idxmin()
+        padroes['horario_pico'] = int(uso_por_hora.idxmax()) if len(uso_por_hora) else None
+        padroes['horario_vale'] = int(uso_por_hora.idxmin()) if len(uso_por_hora) else None
         
         # Padrões por agente
-        for agente in df_recente['agente'].unique():
+        for agente, grupo in agregados.groupby('agente'):
+            frequencia = int(grupo['operacoes'].sum())
             padroes[agente] = {
-                'frequencia': len(df_recente[df_recente['agente'] == agente]),
-                'tempo_medio': df_recente[df_recente['agente'] == agente]['tempo_execucao'].mean()
+                'frequencia': frequencia,
+                'tempo_medio': grupo['soma_tempo'].sum() / frequencia
             }
         
         # Gerar sugestões baseadas em padrões
         sugestoes = {}
         
-        if padroes['horario_pico']:
+        if padroes['horario_pico'] is not None:
             sugestoes['escalabilidade'] = "Considerar escalonamento automático durante horário de pico"
             
-        if any(p['tempo_medio'] > 5 for p in padroes.values()):
+        if any(isinstance(p, dict) and p['tempo_medio'] > 5 for p in padroes.values()):
             sugestoes['cache'] = "Implementar cache para otimizar processamento"
             
         logger.info("Padrões identificados e sugestões geradas!")
@@ -178,3 +234,21 @@ class AgenteBoss:
             'padroes': padroes,
             'sugestoes': sugestoes
         }
+
+    def _agregar_por_hora(self, inicio: datetime) -> 'pd.DataFrame':
+        """
+        Operações e tempo somado por hora do dia e agente desde `inicio`.
+        
+        Com histórico persistente, lê só as partições do período (e os
+        agregados prontos dos dias completos); sem ele, usa a memória.
+        """
+        if self.historico_persistente is not None:
+            return self.historico_persistente.agregar_por_hora(inicio)
+        
+        historico = self.historico
+        df_recente = historico[historico['timestamp'] >= inicio]
+        agregados = df_recente.groupby([df_recente['timestamp'].dt.hour.rename('hora'), 'agente']).agg(
+            operacoes=('tempo_execucao', 'size'),
+            soma_tempo=('tempo_execucao', 'sum')
+        )
+        return agregados.reset_index()
@@ -0,0 +1,242 @@
+import logging
+import os
+import re
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from typing import TYPE_CHECKING
+
+from .registro_colunar import EPOCA, MICROSSEGUNDO, RegistroColunar
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+MICROSSEGUNDOS_HORA = 3600 * 1000000
+# Segundos que uma escrita espera outro processo (workers do supervisor) liberar a partição (busy_timeout do SQLite)
+ESPERA_BLOQUEIO = 30.0
+PADRAO_ARQUIVO = re.compile(r'^historico-(\d{4}-\d{2}-\d{2})\.sqlite3$')
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS operacoes (
+    timestamp INTEGER NOT NULL,
+    agente TEXT NOT NULL,
+    acao TEXT,
+    resultado TEXT NOT NULL,
+    tempo_execucao REAL NOT NULL,
+    erro TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_operacoes_timestamp ON operacoes (timestamp);
+CREATE TABLE IF NOT EXISTS agregado_hora (
+    hora INTEGER NOT NULL,
+    agente TEXT NOT NULL,
+    operacoes INTEGER NOT NULL,
+    soma_tempo REAL NOT NULL,
+    PRIMARY KEY (hora, agente)
+);
+"""
+
+class HistoricoPersistente:
+    """
+    Histórico de operações do AgenteBoss em disco, particionado por dia.
+
+    Cada dia é um arquivo SQLite (historico-AAAA-MM-DD.sqlite3) com as
+    operações indexadas por timestamp e uma tabela de agregados por hora e
+    agente mantida na inserção. Consultas por janela de tempo abrem apenas
+    as partições do intervalo, e a análise por hora lê os agregados dos
+    dias completos em vez das operações individuais.
+    """
+
+    def __init__(self, diretorio: str):
+        """
+        Args:
+            diretorio (str): Diretório das partições diárias (criado se necessário)
+        """
+        self.diretorio = diretorio
+        os.makedirs(diretorio, exist_ok=True)
+
+        self._conexoes = {}
+        self._lock = threading.Lock()
+
+    def adicionar(self, timestamp: datetime, agente: str, acao: str, resultado: str,
+                  tempo_execucao: float = 0.0, erro: str = None):
+        """
+        Grava uma operação na partição do dia do timestamp.
+
+        Args:
+            timestamp (datetime): Momento da operação
+            agente (str): Agente que executou a operação
+            acao (str): Ação executada
+            resultado (str): 'sucesso' ou 'falha'
+            tempo_execucao (float): Duração em segundos
+            erro (str): Mensagem de erro, se houver
+        """
+        microssegundos = (timestamp - EPOCA) // MICROSSEGUNDO
+        tempo_execucao = tempo_execucao or 0.0
+
+        with self._lock:
+            conexao = self._conexao_escrita(timestamp.date())
+            with conexao:
+                conexao.execute(
+                    "INSERT INTO operacoes VALUES (?, ?, ?, ?, ?, ?)",
+                    (microssegundos, agente, acao, resultado, tempo_execucao, erro)
+                )
+                conexao.execute(
+                    "INSERT INTO agregado_hora VALUES (?, ?, 1, ?) "
+                    "ON CONFLICT (hora, agente) DO UPDATE SET "
+                    "operacoes = operacoes + 1, soma_tempo = soma_tempo + excluded.soma_tempo",
+                    (timestamp.hour, agente, tempo_execucao)
+                )
+
+    def particoes(self, inicio: datetime = None, fim: datetime = None) -> list:
+        """
+        Lista os dias com partição dentro do intervalo, sem abrir os arquivos.
+
+        Returns:
+            list: Datas (date) em ordem crescente
+        """
+        dias = []
+        for nome in os.listdir(self.diretorio):
+            encontrado = PADRAO_ARQUIVO.match(nome)
+            if not encontrado:
+                continue
+            dia = date.fromisoformat(encontrado.group(1))
+            if inicio is not None and dia < inicio.date():
+                continue
+            if fim is not None and dia > fim.date():
+                continue
+            dias.append(dia)
+        return sorted(dias)
+
+    def consultar(self, inicio: datetime, fim: datetime = None) -> 'pd.DataFrame':
+        """
+        Retorna as operações com timestamp em [inicio, fim).
+
+        Args:
+            inicio (datetime): Início da janela
+            fim (datetime): Fim da janela (padrão: agora)
+
+        Returns:
+            pd.DataFrame: Mesmas colunas do histórico em memória
+        """
+        fim = fim or datetime.now()
+        limites = ((inicio - EPOCA) // MICROSSEGUNDO, (fim - EPOCA) // MICROSSEGUNDO)
+
+        linhas = []
+        with self._lock:
+            for dia in self.particoes(inicio, fim):
+                with self._leitura(dia) as conexao:
+                    linhas.extend(conexao.execute(
+                        "SELECT timestamp, agente, acao, resultado, tempo_execucao, erro FROM operacoes "
+                        "WHERE timestamp >= ? AND timestamp < ? ORDER BY timestamp",
+                        limites
+                    ))
+
+        import pandas as pd
+        df = pd.DataFrame(linhas, columns=RegistroColunar.COLUNAS)
+        df['timestamp'] = df['timestamp'].astype('int64').astype('datetime64[us]')
+        df['tempo_execucao'] = df['tempo_execucao'].astype('float64')
+        return df
+
+    def agregar_por_hora(self, inicio: datetime, fim: datetime = None) -> 'pd.DataFrame':
+        """
+        Agrega operações e tempo por hora do dia e agente em [inicio, fim).
+
+        Dias inteiramente dentro da janela usam a tabela de agregados; só
+        os dias das bordas consultam operações individuais.
+
+        Returns:
+            pd.DataFrame: Colunas hora, agente, operacoes, soma_tempo
+        """
+        fim = fim or datetime.now()
+        limites = ((inicio - EPOCA) // MICROSSEGUNDO, (fim - EPOCA) // MICROSSEGUNDO)
+
+        linhas = []
+        with self._lock:
+            for dia in self.particoes(inicio, fim):
+                inicio_dia = datetime.combine(dia, datetime.min.time())
+                with self._leitura(dia) as conexao:
+                    if inicio <= inicio_dia and inicio_dia + timedelta(days=1) <= fim:
+                        linhas.extend(conexao.execute(
+                            "SELECT hora, agente, operacoes, soma_tempo FROM agregado_hora"
+                        ))
+                    else:
+                        linhas.extend(conexao.execute(
+                            "SELECT (timestamp / ?) % 24, agente, COUNT(*), SUM(tempo_execucao) FROM operacoes "
+                            "WHERE timestamp >= ? AND timestamp < ? GROUP BY 1, 2",
+                            (MICROSSEGUNDOS_HORA, *limites)
+                        ))
+
+        import pandas as pd
+        df = pd.DataFrame(linhas, columns=['hora', 'agente', 'operacoes', 'soma_tempo'])
+        return df.groupby(['hora', 'agente'], as_index=False).sum()
+
+    def remover_anteriores(self, dia: date) -> int:
+        """
+        Apaga as partições anteriores ao dia informado (retenção).
+
+        Returns:
+            int: Número de partições removidas
+        """
+        removidas = 0
+        with self._lock:
+            for particao in self.particoes():
+                if particao >= dia:
+                    break
+                conexao = self._conexoes.pop(particao, None)
+                if conexao is not None:
+                    conexao.close()
+                for sufixo in ('', '-wal', '-shm'):
+                    if os.path.exists(self._caminho(particao) + sufixo):
+                        os.remove(self._caminho(particao) + sufixo)
+                removidas += 1
+        return removidas
+
+    def fechar(self):
+        with self._lock:
+            self._fechar_conexoes()
+
+    def apos_fork(self):
+        """Descarta, sem fechar, as conexões herdadas do processo pai (SQLite não as compartilha entre processos)."""
+        self._conexoes = {}
+        self._lock = threading.Lock()
+
+    def _fechar_conexoes(self):
+        for conexao in self._conexoes.values():
+            conexao.close()
+        self._conexoes = {}
+
+    def _caminho(self, dia: date) -> str:
+        return os.path.join(self.diretorio, f"historico-{dia.isoformat()}.sqlite3")
+
+    def _abrir(self, dia: date) -> sqlite3.Connection:
+        conexao = sqlite3.connect(self._caminho(dia), timeout=ESPERA_BLOQUEIO, check_same_thread=False)
+        conexao.execute("PRAGMA journal_mode=WAL")
+        conexao.execute("PRAGMA synchronous=NORMAL")
+        conexao.executescript(ESQUEMA)
+        return conexao
+
+    def _conexao_escrita(self, dia: date) -> sqlite3.Connection:
+        """Conexão mantida aberta para a partição em que se está gravando (normalmente a de hoje)."""
+        conexao = self._conexoes.get(dia)
+        if conexao is None:
+            # Ao virar o dia, a partição anterior deixa de receber escritas
+            self._fechar_conexoes()
+            conexao = self._conexoes[dia] = self._abrir(dia)
+        return conexao
+
+    @contextmanager
+    def _leitura(self, dia: date):
+        """Reaproveita a conexão de escrita ou abre uma temporária, para não acumular arquivos abertos."""
+        conexao = self._conexoes.get(dia)
+        if conexao is not None:
+            yield conexao
+            return
+
+        conexao = self._abrir(dia)
+        try:
+            yield conexao
+        finally:
+            conexao.close()
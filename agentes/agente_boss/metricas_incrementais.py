@@ -0,0 +1,181 @@
+import math
+import time
+
+class EstatisticaOnline:
+    """Contagem, média, variância (Welford), mínimo e máximo em O(1) por valor."""
+
+    def __init__(self):
+        self.contagem = 0
+        self.media = 0.0
+        self._m2 = 0.0
+        self.minimo = math.inf
+        self.maximo = -math.inf
+
+    def adicionar(self, valor: float):
+        """Incorpora um novo valor."""
+        self.contagem += 1
+        delta = valor - self.media
+        self.media += delta / self.contagem
+        self._m2 += delta * (valor - self.media)
+        self.minimo = min(self.minimo, valor)
+        self.maximo = max(self.maximo, valor)
+
+    @property
+    def variancia(self) -> float:
+        """Variância amostral (0 com menos de dois valores)."""
+        if self.contagem < 2:
+            return 0.0
+        return self._m2 / (self.contagem - 1)
+
+    @property
+    def desvio_padrao(self) -> float:
+        return math.sqrt(self.variancia)
+
+    def mesclar(self, outra: 'EstatisticaOnline'):
+        """Combina com outra estatística (ex.: de outro processo)."""
+        if not outra.contagem:
+            return
+        total = self.contagem + outra.contagem
+        delta = outra.media - self.media
+        self._m2 += outra._m2 + delta ** 2 * self.contagem * outra.contagem / total
+        self.media += delta * outra.contagem / total
+        self.contagem = total
+        self.minimo = min(self.minimo, outra.minimo)
+        self.maximo = max(self.maximo, outra.maximo)
+
+    def resumo(self) -> dict:
+        return {
+            'contagem': self.contagem,
+            'media': self.media if self.contagem else 0.0,
+            'desvio_padrao': self.desvio_padrao,
+            'minimo': self.minimo if self.contagem else 0.0,
+            'maximo': self.maximo if self.contagem else 0.0
+        }
+
+class JanelaDeslizante:
+    """
+    Agregados de uma janela de tempo deslizante com memória fixa.
+
+    A janela é dividida em fatias de `resolucao` segundos guardadas em um
+    buffer circular; fatias antigas são zeradas ao serem reaproveitadas.
+    """
+
+    def __init__(self, duracao: float = 300.0, resolucao: float = 1.0, relogio=time.time):
+        """
+        Args:
+            duracao (float): Tamanho da janela em segundos
+            resolucao (float): Tamanho de cada fatia em segundos
+            relogio: Função que retorna o instante atual em segundos
+        """
+        self.duracao = duracao
+        self.resolucao = resolucao
+        self.relogio = relogio
+
+        quantidade = max(1, int(math.ceil(duracao / resolucao)))
+        self._fatias = [None] * quantidade
+        self._operacoes = [0] * quantidade
+        self._sucessos = [0] * quantidade
+        self._erros = [0] * quantidade
+        self._soma_tempo = [0.0] * quantidade
+
+    def adicionar(self, sucesso: bool, erro: bool, tempo_execucao: float, instante: float = None):
+        """Registra uma operação na fatia do instante informado (ou atual)."""
+        fatia = int((instante if instante is not None else self.relogio()) // self.resolucao)
+        indice = fatia % len(self._fatias)
+        if self._fatias[indice] != fatia:
+            self._fatias[indice] = fatia
+            self._operacoes[indice] = 0
+            self._sucessos[indice] = 0
+            self._erros[indice] = 0
+            self._soma_tempo[indice] = 0.0
+
+        self._operacoes[indice] += 1
+        self._sucessos[indice] += int(sucesso)
+        self._erros[indice] += int(erro)
+        self._soma_tempo[indice] += tempo_execucao
+
+    def resumo(self, instante: float = None) -> dict:
+        """Agregados das operações dentro da janela, em custo proporcional ao número de fatias."""
+        atual = int((instante if instante is not None else self.relogio()) // self.resolucao)
+        primeira = atual - len(self._fatias) + 1
+
+        operacoes = sucessos = erros = 0
+        soma_tempo = 0.0
+        for indice, fatia in enumerate(self._fatias):
+            if fatia is not None and primeira <= fatia <= atual:
+                operacoes += self._operacoes[indice]
+                sucessos += self._sucessos[indice]
+                erros += self._erros[indice]
+                soma_tempo += self._soma_tempo[indice]
+
+        return {
+            'operacoes': operacoes,
+            'operacoes_por_s': operacoes / self.duracao,
+            'taxa_sucesso': sucessos / operacoes if operacoes else 0.0,
+            'taxa_erro': erros / operacoes if operacoes else 0.0,
+            'tempo_medio': soma_tempo / operacoes if operacoes else 0.0
+        }
+
+class ContadoresOperacao:
+    """Contadores, estatística de tempo e janela deslizante de um agente ou ação."""
+
+    def __init__(self, duracao_janela: float, relogio=time.time):
+        self.operacoes = 0
+        self.sucessos = 0
+        self.erros = 0
+        self.tempo = EstatisticaOnline()
+        self.janela = JanelaDeslizante(duracao_janela, relogio=relogio)
+
+    def registrar(self, sucesso: bool, erro: bool, tempo_execucao: float, instante: float = None):
+        self.operacoes += 1
+        self.sucessos += int(sucesso)
+        self.erros += int(erro)
+        self.tempo.adicionar(tempo_execucao)
+        self.janela.adicionar(sucesso, erro, tempo_execucao, instante)
+
+    @property
+    def taxa_sucesso(self) -> float:
+        return self.sucessos / self.operacoes if self.operacoes else math.nan
+
+    @property
+    def taxa_erro(self) -> float:
+        return self.erros / self.operacoes if self.operacoes else math.nan
+
+class MetricasIncrementais:
+    """
+    Métricas mantidas a cada operação registrada, por agente, por ação e no total.
+
+    Consultas custam O(número de agentes/ações), independentemente do
+    tamanho do histórico.
+    """
+
+    def __init__(self, duracao_janela: float = 300.0, relogio=time.time):
+        """
+        Args:
+            duracao_janela (float): Tamanho da janela deslizante em segundos
+            relogio: Função que retorna o instante atual em segundos
+        """
+        self.duracao_janela = duracao_janela
+        self.relogio = relogio
+        self.total = ContadoresOperacao(duracao_janela, relogio)
+        self.por_agente = {}
+        self.por_acao = {}
+
+    def registrar(self, agente: str, acao: str, sucesso: bool, tempo_execucao: float, erro: bool, instante: float = None):
+        """
+        Atualiza os contadores com uma operação.
+
+        Args:
+            agente (str): Agente que executou a operação
+            acao (str): Ação executada
+            sucesso (bool): Se a operação teve sucesso
+            tempo_execucao (float): Duração em segundos
+            erro (bool): Se a operação registrou erro
+            instante (float): Momento da operação (padrão: agora)
+        """
+        for grupo, chave in ((self.por_agente, agente), (self.por_acao, (agente, acao))):
+            contadores = grupo.get(chave)
+            if contadores is None:
+                contadores = grupo[chave] = ContadoresOperacao(self.duracao_janela, self.relogio)
+            contadores.registrar(sucesso, erro, tempo_execucao, instante)
+        self.total.registrar(sucesso, erro, tempo_execucao, instante)
@@ -0,0 +1,133 @@
+import logging
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+EPOCA = datetime(1970, 1, 1)
+MICROSSEGUNDO = timedelta(microseconds=1)
+
+class RegistroColunar:
+    """
+    Histórico de operações somente de acréscimo, armazenado por colunas.
+
+    Os dados ficam em blocos NumPy pré-alocados: inserir é O(1) amortizado
+    e nada é copiado quando o histórico cresce. Colunas de texto repetitivo
+    (agente, ação, resultado) são guardadas como códigos inteiros e os
+    erros, raros, em um dicionário esparso. O DataFrame só é montado quando
+    alguma análise o solicita, e fica em cache até a próxima inserção.
+    """
+
+    COLUNAS = ['timestamp', 'agente', 'acao', 'resultado', 'tempo_execucao', 'erro']
+
+    def __init__(self, tamanho_bloco: int = 65536):
+        """
+        Args:
+            tamanho_bloco (int): Número de registros por bloco pré-alocado
+        """
+        self.tamanho_bloco = tamanho_bloco
+        self._tamanho = 0
+
+        # Blocos por coluna
+        self._timestamps = []
+        self._tempos = []
+        self._codigos = {'agente': [], 'acao': [], 'resultado': []}
+
+        # Dicionários das colunas categóricas: valor -> código e código -> valor
+        self._categorias = {'agente': {}, 'acao': {}, 'resultado': {}}
+        self._valores = {'agente': [], 'acao': [], 'resultado': []}
+
+        # Erros por posição (esparso)
+        self._erros = {}
+
+        self._dataframe = None
+
+    def __len__(self) -> int:
+        return self._tamanho
+
+    def adicionar(self, timestamp: datetime, agente: str, acao: str, resultado: str,
+                  tempo_execucao: float = 0.0, erro: str = None):
+        """
+        Acrescenta um registro ao histórico.
+
+        Args:
+            timestamp (datetime): Momento da operação
+            agente (str): Agente que executou a operação
+            acao (str): Ação executada
+            resultado (str): 'sucesso' ou 'falha'
+            tempo_execucao (float): Duração em segundos
+            erro (str): Mensagem de erro, se houver
+        """
+        bloco, posicao = divmod(self._tamanho, self.tamanho_bloco)
+        if bloco == len(self._timestamps):
+            self._alocar_bloco()
+
+        self._timestamps[bloco][posicao] = (timestamp - EPOCA) // MICROSSEGUNDO
+        self._tempos[bloco][posicao] = tempo_execucao or 0.0
+        self._codigos['agente'][bloco][posicao] = self._codificar('agente', agente)
+        self._codigos['acao'][bloco][posicao] = self._codificar('acao', acao)
+        self._codigos['resultado'][bloco][posicao] = self._codificar('resultado', resultado)
+        if erro is not None:
+            self._erros[self._tamanho] = erro
+
+        self._tamanho += 1
+        self._dataframe = None
+
+    def coluna_numerica(self, nome: str) -> np.ndarray:
+        """Retorna 'timestamp' (microssegundos desde a época) ou 'tempo_execucao' como array contínuo."""
+        if nome == 'timestamp':
+            return self._concatenar(self._timestamps, np.int64)
+        return self._concatenar(self._tempos, np.float64)
+
+    def para_dataframe(self) -> 'pd.DataFrame':
+        """
+        Monta o DataFrame do histórico (mesmas colunas do histórico anterior).
+
+        Returns:
+            pd.DataFrame: Uma linha por operação, em ordem de inserção
+        """
+        if self._dataframe is not None:
+            return self._dataframe
+
+        # pandas só é importado quando o histórico é analisado, não a cada operação registrada
+        import pandas as pd
+
+        dados = {
+            'timestamp': self._concatenar(self._timestamps, np.int64).astype('datetime64[us]')
+        }
+        for nome in ('agente', 'acao', 'resultado'):
+            valores = np.array(self._valores[nome] or [None], dtype=object)
+            dados[nome] = valores[self._concatenar(self._codigos[nome], np.int32)]
+        dados['tempo_execucao'] = self._concatenar(self._tempos, np.float64)
+
+        erros = np.full(self._tamanho, None, dtype=object)
+        for posicao, erro in self._erros.items():
+            erros[posicao] = erro
+        dados['erro'] = erros
+
+        self._dataframe = pd.DataFrame(dados, columns=self.COLUNAS)
+        return self._dataframe
+
+    def _alocar_bloco(self):
+        self._timestamps.append(np.empty(self.tamanho_bloco, dtype=np.int64))
+        self._tempos.append(np.empty(self.tamanho_bloco, dtype=np.float64))
+        for blocos in self._codigos.values():
+            blocos.append(np.empty(self.tamanho_bloco, dtype=np.int32))
+
+    def _codificar(self, coluna: str, valor) -> int:
+        codigo = self._categorias[coluna].get(valor)
+        if codigo is None:
+            codigo = len(self._valores[coluna])
+            self._categorias[coluna][valor] = codigo
+            self._valores[coluna].append(valor)
+        return codigo
+
+    def _concatenar(self, blocos: list, dtype) -> np.ndarray:
+        if not blocos:
+            return np.empty(0, dtype=dtype)
+        return np.concatenate(blocos)[:self._tamanho]
@@ -1,5 +1,10 @@
 import pytest
 from agente_boss import AgenteBoss
+from agente_boss.registro_colunar import RegistroColunar
+from agente_boss.metricas_incrementais import EstatisticaOnline, JanelaDeslizante
+from agente_boss.historico_persistente import HistoricoPersistente
+from datetime import datetime, timedelta
+import numpy as np
 import pandas as pd
 
 def test_registrar_operacao():
@@ -52,3 +57,156 @@ def test_gerar_sugestoes_otimizacao():
     
     assert 'agentes' in sugestoes
     assert 'AgenteAnalista' in sugestoes['agentes']
+
+def test_registro_colunar():
+    """Testa o histórico colunar atravessando vários blocos"""
+    registro = RegistroColunar(tamanho_bloco=4)
+    inicio = datetime(2025, 6, 19, 14, 0, 0)
+    
+    for i in range(10):
+        registro.adicionar(
+            timestamp=inicio.replace(minute=i),
+            agente='executor' if i % 2 == 0 else 'analista',
+            acao='criar_tarefa',
+            resultado='sucesso' if i % 3 else 'falha',
+            tempo_execucao=i * 0.5,
+            erro='Erro simulado' if i == 7 else None
+        )
+    
+    historico = registro.para_dataframe()
+    
+    assert len(historico) == 10
+    assert list(historico.columns) == RegistroColunar.COLUNAS
+    assert historico.iloc[3]['agente'] == 'analista'
+    assert historico.iloc[9]['tempo_execucao'] == 4.5
+    assert historico.iloc[5]['timestamp'] == pd.Timestamp(inicio.replace(minute=5))
+    assert historico['erro'].notna().sum() == 1
+    assert historico.iloc[7]['erro'] == 'Erro simulado'
+
+def test_historico_atualizado_apos_insercao():
+    """Testa que a visão em DataFrame reflete novas operações"""
+    agente = AgenteBoss()
+    agente.registrar_operacao({'acao': 'criar_tarefa', 'sucesso': True})
+    assert len(agente.historico) == 1
+    
+    agente.registrar_operacao({'acao': 'mover_tarefa', 'sucesso': False, 'erro': 'Erro simulado'})
+    assert len(agente.historico) == 2
+    assert agente.historico.iloc[1]['resultado'] == 'falha'
+
+def test_estatistica_online():
+    """Testa média e variância incrementais contra o cálculo direto"""
+    valores = [0.5, 1.2, 3.3, 0.9, 2.4, 7.1]
+    estatistica = EstatisticaOnline()
+    for valor in valores:
+        estatistica.adicionar(valor)
+    
+    assert estatistica.media == pytest.approx(np.mean(valores))
+    assert estatistica.variancia == pytest.approx(np.var(valores, ddof=1))
+    assert estatistica.maximo == 7.1
+    
+    # Mesclar duas metades equivale a processar tudo junto
+    primeira, segunda = EstatisticaOnline(), EstatisticaOnline()
+    for valor in valores[:2]:
+        primeira.adicionar(valor)
+    for valor in valores[2:]:
+        segunda.adicionar(valor)
+    primeira.mesclar(segunda)
+    assert primeira.media == pytest.approx(estatistica.media)
+    assert primeira.variancia == pytest.approx(estatistica.variancia)
+
+def test_janela_deslizante():
+    """Testa que operações antigas saem da janela"""
+    janela = JanelaDeslizante(duracao=60, resolucao=1)
+    janela.adicionar(sucesso=True, erro=False, tempo_execucao=1.0, instante=1000)
+    janela.adicionar(sucesso=False, erro=True, tempo_execucao=3.0, instante=1030)
+    
+    resumo = janela.resumo(instante=1040)
+    assert resumo['operacoes'] == 2
+    assert resumo['taxa_erro'] == 0.5
+    assert resumo['tempo_medio'] == 2.0
+    
+    resumo = janela.resumo(instante=1075)
+    assert resumo['operacoes'] == 1
+    assert resumo['taxa_erro'] == 1.0
+
+def test_metricas_incrementais_equivalem_ao_historico():
+    """Testa que as métricas incrementais batem com o cálculo sobre o histórico"""
+    agente = AgenteBoss()
+    for i in range(30):
+        agente.registrar_operacao({
+            'acao': 'criar_tarefa',
+            'sucesso': i % 4 != 0,
+            'tempo_execucao': i * 0.1,
+            'erro': 'Erro simulado' if i % 4 == 0 else None
+        })
+    
+    metricas = agente.analisar_desempenho()
+    historico = agente.historico
+    
+    assert metricas['precisao']['total'] == pytest.approx((historico['resultado'] == 'sucesso').mean())
+    assert metricas['tempo_medio']['executor'] == pytest.approx(historico['tempo_execucao'].mean())
+    assert metricas['taxa_erro']['executor'] == pytest.approx(historico['erro'].notna().mean())
+    assert agente.obter_metricas_operacao()['operacoes_registradas'] == 30
+
+def test_historico_persistente_particoes(tmp_path):
+    """Testa que as operações são gravadas por dia e consultadas só no período"""
+    historico = HistoricoPersistente(str(tmp_path))
+    base = datetime(2025, 6, 1, 10, 30)
+    for dia in range(5):
+        for i in range(4):
+            historico.adicionar(base + timedelta(days=dia, hours=i), 'executor', 'criar_tarefa', 'sucesso', 1.0 + i)
+    
+    assert len(historico.particoes()) == 5
+    assert historico.particoes(datetime(2025, 6, 3), datetime(2025, 6, 4, 12)) == [
+        datetime(2025, 6, 3).date(), datetime(2025, 6, 4).date()
+    ]
+    
+    df = historico.consultar(datetime(2025, 6, 3, 11), datetime(2025, 6, 4, 11))
+    assert len(df) == 4
+    assert df['timestamp'].min() == datetime(2025, 6, 3, 11, 30)
+    assert list(df.columns) == ['timestamp', 'agente', 'acao', 'resultado', 'tempo_execucao', 'erro']
+    
+    assert historico.remover_anteriores(datetime(2025, 6, 3).date()) == 2
+    assert len(historico.particoes()) == 3
+    historico.fechar()
+
+def test_agregar_por_hora_equivale_as_operacoes(tmp_path):
+    """Testa que os agregados dos dias completos batem com as operações individuais"""
+    historico = HistoricoPersistente(str(tmp_path))
+    base = datetime(2025, 6, 1)
+    for i in range(200):
+        historico.adicionar(base + timedelta(minutes=37 * i), 'executor', 'criar_tarefa', 'sucesso', i * 0.01)
+    
+    inicio, fim = datetime(2025, 6, 1, 5), datetime(2025, 6, 5, 20)
+    agregados = historico.agregar_por_hora(inicio, fim).set_index(['hora', 'agente'])
+    
+    df = historico.consultar(inicio, fim)
+    esperado = df.groupby([df['timestamp'].dt.hour, 'agente'])['tempo_execucao'].agg(['size', 'sum'])
+    assert agregados['operacoes'].tolist() == esperado['size'].tolist()
+    assert agregados['soma_tempo'].tolist() == pytest.approx(esperado['sum'].tolist())
+    historico.fechar()
+
+def test_aprender_padroes_entre_reinicios(tmp_path):
+    """Testa que o histórico persistente sobrevive a um novo AgenteBoss"""
+    agente = AgenteBoss(diretorio_historico=str(tmp_path))
+    for i in range(5):
+        agente.registrar_operacao({'acao': 'criar_tarefa', 'sucesso': True, 'tempo_execucao': 6.0})
+    agente.historico_persistente.fechar()
+    
+    reiniciado = AgenteBoss(diretorio_historico=str(tmp_path))
+    assert len(reiniciado.historico) == 0
+    
+    resultado = reiniciado.aprender_padroes(periodo=7)
+    assert resultado['padroes']['executor']['frequencia'] == 5
+    assert resultado['padroes']['horario_pico'] == datetime.now().hour
+    assert 'cache' in resultado['sugestoes']
+
+def test_aprender_padroes_em_memoria():
+    """Testa aprender_padroes sem histórico persistente"""
+    agente = AgenteBoss()
+    for i in range(3):
+        agente.registrar_operacao({'acao': 'criar_tarefa', 'sucesso': True, 'tempo_execucao': 1.0})
+    
+    resultado = agente.aprender_padroes(periodo=1)
+    assert resultado['padroes']['executor'] == {'frequencia': 3, 'tempo_medio': 1.0}
+    assert 'cache' not in resultado['sugestoes']
@@ -1 +1 @@
-from .agente_executor import AgenteExecutor
+from .agente_executor import AgenteExecutor, MutationIncerta
@@ -1,11 +1,77 @@
+import asyncio
 import logging
+import re
 import requests
 import time
 from datetime import datetime
 from config import Config
+from agentes.monitoramento import medir, metricas
+from agentes.cliente_monday import ClienteMondayAsync
+from .controle_concorrencia import ControladorConcorrencia
 
 logger = logging.getLogger(__name__)
 
+MUTACOES = metricas.contador('monday_mutacoes', 'Mutations executadas no Monday.com', ('resultado',))
+RETRIES = metricas.contador('monday_retries', 'Novas tentativas de mutations no Monday.com')
+ORCAMENTO_API = metricas.medidor('monday_orcamento_restante', 'Orçamento restante da API do Monday.com por limite', ('limite',))
+
+# Consulta dos limites atuais da API
+CONSULTA_LIMITES = '''
+query {
+    limits {
+        complexity
+        minutes
+        concurrency
+    }
+}
+'''
+
+# Campo de `limits` na resposta da API -> chave correspondente em AgenteExecutor.limits
+CHAVES_LIMITES = {
+    'complexity': 'complexidade',
+    'minutes': 'minutos',
+    'concurrency': 'concorrencia'
+}
+
+class MutationIncerta(Exception):
+    """A mutation pode ter sido aplicada pelo Monday.com apesar da falha (timeout, resposta perdida, erro 5xx)."""
+
+PADRAO_MUTATION = re.compile(r'^\s*mutation\s*(?:\((?P<declaracoes>.*?)\))?\s*\{(?P<corpo>.*)\}\s*$', re.DOTALL)
+
+def combinar_mutations(payloads: list) -> dict:
+    """
+    Junta várias mutations em um único documento GraphQL.
+    
+    Cada mutation recebe o alias m<i> e suas variáveis o sufixo _<i>, de
+    modo que N create_item viajam numa única requisição e a resposta traz
+    data['m<i>'] para cada uma.
+    
+    Args:
+        payloads (list): Payloads {'query': 'mutation(...) { campo(...) {...} }', 'variables': {...}}
+        
+    Returns:
+        dict: Payload combinado
+    """
+    declaracoes = []
+    corpos = []
+    variaveis = {}
+    for indice, payload in enumerate(payloads):
+        partes = PADRAO_MUTATION.match(payload['query'])
+        if partes is None:
+            raise ValueError(f"Payload {indice} não é uma mutation")
+        
+        renomear = lambda texto: re.sub(r'\$(\w+)', lambda m: f"${m.group(1)}_{indice}", texto)
+        if partes.group('declaracoes'):
+            declaracoes.append(renomear(partes.group('declaracoes')))
+        corpos.append(re.sub(r'^\s*', f"m{indice}: ", renomear(partes.group('corpo')), count=1))
+        variaveis.update({f"{nome}_{indice}": valor for nome, valor in (payload.get('variables') or {}).items()})
+    
+    cabecalho = f"mutation({', '.join(declaracoes)})" if declaracoes else "mutation"
+    return {
+        'query': cabecalho + " {\n" + "\n".join(corpos) + "\n}",
+        'variables': variaveis
+    }
+
 class AgenteExecutor:
     def __init__(self):
         """Inicializa o AgenteExecutor"""
@@ -36,6 +102,18 @@ class AgenteExecutor:
             'ultima_execucao': None
         }
         
+        # Concorrência e tamanho de lote ajustados pela resposta da API (AIMD)
+        self.controle = ControladorConcorrencia(
+            concorrencia_inicial=Config.CONCORRENCIA_INICIAL,
+            concorrencia_maxima=self.limits['concorrencia'],
+            latencia_alvo=Config.CONCORRENCIA_LATENCIA_ALVO,
+            lote_inicial=Config.LOTE_MUTATIONS_INICIAL,
+            lote_maximo=Config.LOTE_MUTATIONS_MAXIMO
+        )
+        
+        # Cliente HTTP assíncrono, criado no primeiro uso (executar_mutation_async)
+        self.cliente_async = None
+        
         logger.info("AgenteExecutor inicializado com sucesso!")
 
     def executar_mutation(self, payload: dict) -> dict:
@@ -47,84 +125,362 @@ class AgenteExecutor:
             
         Returns:
             dict: Resultado da execução
+            
+        Raises:
+            MutationIncerta: Se alguma tentativa chegou à API sem resposta conclusiva
+                (timeout, conexão perdida, erro 5xx); a mutation pode ter sido aplicada
+            Exception: Se a mutation falhar ou os limites da API seguirem atingidos após todas as tentativas
         """
         logger.info("Executando mutation...")
         
+        incerta = False
         for attempt in range(self.max_retries + 1):
+            status = None
+            enviada = False
             try:
-                # Verificar limites antes de executar
-                if not self.verificar_limites():
+                # Verificar limites antes de executar; falhas da consulta seguem para o except
+                if not self._consultar_limites():
                     logger.warning("Limite atingido, aguardando janela de 1 minuto...")
+                    self.controle.registrar(0.0, limitado=True)
                     time.sleep(60)
                     continue
-                    
-                response = requests.post(
-                    Config.MONDAY_API_URL,
-                    json=payload,
-                    headers=self.headers
-                )
                 
-                if response.status_code == 200:
-                    data = response.json()
-                    
-                    # Verificar erros na resposta
-                    if 'errors' in data:
-                        raise Exception(f"Erro na API: {data['errors']}")
-                        
-                    self.metrics['sucessos'] += 1
-                    self.metrics['ultima_execucao'] = datetime.now()
-                    
-                    logger.info("Mutation executada com sucesso!")
-                    return data
-                    
-                raise Exception(f"Status code: {response.status_code}")
+                enviada = True
+                response = self._enviar(payload)
+                status = response.status_code
+                data = response.json() if status == 200 else None
+                return self._concluir_mutation(status, data)
                 
             except Exception as e:
-                if attempt < self.max_retries:
-                    logger.warning(f"Erro na tentativa {attempt + 1}: {str(e)}")
-                    logger.info(f"Aguardando {self.retry_delay}s antes de tentar novamente...")
+                incerta = incerta or self._resposta_inconclusiva(enviada, status)
+                if self._registrar_tentativa_falha(attempt, e):
                     time.sleep(self.retry_delay)
-                    self.metrics['retries'] += 1
                     continue
-                    
-                logger.error(f"Falha após {self.max_retries} tentativas: {str(e)}")
-                self.metrics['falhas'] += 1
+                if incerta:
+                    raise MutationIncerta(str(e)) from e
                 raise
+        
+        erro = self._limite_esgotado()
+        raise MutationIncerta(str(erro)) if incerta else erro
+
+    def executar_mutations_lote(self, payloads: list) -> list:
+        """
+        Executa várias mutations agrupando-as em poucas requisições.
+        
+        As mutations são combinadas em documentos de até
+        self.controle.tamanho_lote operações, que encolhe quando a API
+        acusa limite de complexidade. Erros de uma operação (com 'path' na
+        resposta) afetam só ela. Falhas de rede, de servidor ou de limite
+        sem nenhuma operação aplicada repetem o documento inteiro; se a
+        resposta trouxer parte das operações aplicadas, só as que faltaram
+        ou esbarraram no limite são reenviadas, para não duplicar itens.
+        
+        Args:
+            payloads (list): Payloads no formato de executar_mutation
+            
+        Returns:
+            list: Para cada payload, {'sucesso': bool, 'resultado': dict} ou {'sucesso': False, 'erro': str}
+        """
+        logger.info(f"Executando {len(payloads)} mutations em lote...")
+        
+        resultados = []
+        while len(resultados) < len(payloads):
+            bloco = payloads[len(resultados):len(resultados) + self.controle.tamanho_lote]
+            resultados.extend(self._executar_bloco(bloco))
+        return resultados
+
+    def _executar_bloco(self, payloads: list) -> list:
+        resultados = [None] * len(payloads)
+        # Posições (no bloco) das mutations que ainda não foram aplicadas
+        pendentes = list(range(len(payloads)))
+        for attempt in range(self.max_retries + 1):
+            try:
+                if not self._consultar_limites():
+                    logger.warning("Limite atingido, aguardando janela de 1 minuto...")
+                    self.controle.registrar(0.0, limitado=True)
+                    time.sleep(60)
+                    continue
+                
+                response = self._enviar(combinar_mutations([payloads[indice] for indice in pendentes]))
+                data = response.json() if response.status_code == 200 else None
+                if not any(valor is not None for valor in ((data or {}).get('data') or {}).values()):
+                    # Nenhuma mutation aplicada: o documento pode ser repetido inteiro
+                    raise Exception(f"Status code: {response.status_code}, erros: {(data or {}).get('errors')}")
+                
+                # Resposta parcial: só o que faltou ou esbarrou no limite é enviado de novo
+                limitada = self._limitada(response.status_code, data)
+                restantes = []
+                for indice, resultado in zip(pendentes, self._separar_resultados(data, len(pendentes))):
+                    if resultado.pop('repetir', False) or (limitada and resultado.pop('ausente', False)):
+                        restantes.append(indice)
+                        continue
+                    resultado.pop('ausente', None)
+                    if resultado['sucesso']:
+                        resultado['resultado'] = {'data': {f"m{indice}": valor for valor in resultado['resultado']['data'].values()}}
+                    resultados[indice] = resultado
+                self._contabilizar_resultados([resultados[indice] for indice in pendentes if indice not in restantes])
+                pendentes = restantes
+                if not pendentes:
+                    return resultados
+                raise Exception(f"{len(pendentes)} mutation(s) do lote não aplicada(s): {data.get('errors')}")
+                
+            except Exception as e:
+                if self._registrar_tentativa_falha(attempt, e, len(pendentes)):
+                    time.sleep(self.retry_delay)
+                    continue
+                for indice in pendentes:
+                    resultados[indice] = {'sucesso': False, 'erro': str(e)}
+                return resultados
+        
+        erro = self._limite_esgotado(len(pendentes))
+        for indice in pendentes:
+            resultados[indice] = {'sucesso': False, 'erro': str(erro)}
+        return resultados
+
+    def _separar_resultados(self, data: dict, quantidade: int) -> list:
+        """
+        Divide a resposta de um documento combinado entre as mutations (alias m<i>).
+        
+        Falhas com 'repetir' esbarraram em limite da API; 'ausente' indica
+        mutation que não voltou nem com resultado nem com erro próprio.
+        """
+        erros = {}
+        for erro in data.get('errors') or []:
+            caminho = erro.get('path') or [] if isinstance(erro, dict) else []
+            if caminho:
+                erros.setdefault(caminho[0], []).append(erro.get('message', str(erro)))
+        
+        resultados = []
+        for indice in range(quantidade):
+            alias = f"m{indice}"
+            valor = data['data'].get(alias)
+            if alias in erros:
+                mensagem = '; '.join(erros[alias])
+                limitada = self._limitada(200, {'errors': [{'message': mensagem}]})
+                resultados.append({'sucesso': False, 'erro': mensagem, 'repetir': limitada})
+            elif valor is None:
+                resultados.append({'sucesso': False, 'erro': "Sem resultado na resposta", 'ausente': True})
+            else:
+                resultados.append({'sucesso': True, 'resultado': {'data': {alias: valor}}})
+        return resultados
+
+    def _contabilizar_resultados(self, resultados: list):
+        """Registra nas métricas o desfecho final de mutations do lote."""
+        sucessos = sum(1 for resultado in resultados if resultado['sucesso'])
+        self.metrics['sucessos'] += sucessos
+        self.metrics['falhas'] += len(resultados) - sucessos
+        MUTACOES.rotulos(resultado='sucesso').inc(sucessos)
+        MUTACOES.rotulos(resultado='falha').inc(len(resultados) - sucessos)
+        if sucessos:
+            self.metrics['ultima_execucao'] = datetime.now()
+
+    async def executar_mutation_async(self, payload: dict) -> dict:
+        """
+        Variante assíncrona de executar_mutation.
+        
+        As esperas (limites, retries, vaga de concorrência) não bloqueiam
+        a thread, que segue atendendo outras transcrições.
+        """
+        logger.info("Executando mutation (async)...")
+        
+        incerta = False
+        for attempt in range(self.max_retries + 1):
+            status = None
+            enviada = False
+            try:
+                if not await self._consultar_limites_async():
+                    logger.warning("Limite atingido, aguardando janela de 1 minuto...")
+                    self.controle.registrar(0.0, limitado=True)
+                    await asyncio.sleep(60)
+                    continue
+                
+                enviada = True
+                status, data = await self._enviar_async(payload)
+                return self._concluir_mutation(status, data if status == 200 else None)
+                
+            except Exception as e:
+                incerta = incerta or self._resposta_inconclusiva(enviada, status)
+                if self._registrar_tentativa_falha(attempt, e):
+                    await asyncio.sleep(self.retry_delay)
+                    continue
+                if incerta:
+                    raise MutationIncerta(str(e)) from e
+                raise
+        
+        erro = self._limite_esgotado()
+        raise MutationIncerta(str(erro)) if incerta else erro
+
+    @staticmethod
+    def _resposta_inconclusiva(enviada: bool, status: int) -> bool:
+        """
+        Indica se uma tentativa falha pode ter sido aplicada mesmo assim: o
+        payload saiu, mas não voltou resposta (timeout, conexão perdida) ou
+        voltou um erro do servidor. Respostas 200 com erros e 4xx são recusas.
+        """
+        return enviada and (status is None or status >= 500)
+
+    def _concluir_mutation(self, status: int, data: dict) -> dict:
+        """Valida a resposta da mutation e contabiliza o sucesso; lança exceção em caso de erro."""
+        if status == 200:
+            # Verificar erros na resposta
+            if 'errors' in data:
+                raise Exception(f"Erro na API: {data['errors']}")
+                
+            self.metrics['sucessos'] += 1
+            MUTACOES.rotulos(resultado='sucesso').inc()
+            self.metrics['ultima_execucao'] = datetime.now()
+            
+            logger.info("Mutation executada com sucesso!")
+            return data
+            
+        raise Exception(f"Status code: {status}")
+
+    def _registrar_tentativa_falha(self, attempt: int, erro: Exception, mutations: int = 1) -> bool:
+        """Contabiliza a falha de uma tentativa (de `mutations` operações) e indica se ainda há retry."""
+        if attempt < self.max_retries:
+            logger.warning(f"Erro na tentativa {attempt + 1}: {str(erro)}")
+            logger.info(f"Aguardando {self.retry_delay}s antes de tentar novamente...")
+            self.metrics['retries'] += 1
+            RETRIES.inc()
+            return True
+            
+        logger.error(f"Falha após {self.max_retries} tentativas: {str(erro)}")
+        self.metrics['falhas'] += mutations
+        MUTACOES.rotulos(resultado='falha').inc(mutations)
+        return False
+
+    def _limite_esgotado(self, mutations: int = 1) -> Exception:
+        """Contabiliza como falha as mutations que esgotaram as tentativas aguardando os limites da API."""
+        erro = Exception("Limite da API atingido em todas as tentativas")
+        self._registrar_tentativa_falha(self.max_retries, erro, mutations)
+        return erro
+
+    def _enviar(self, payload: dict) -> requests.Response:
+        """
+        Envia o payload respeitando o limite de concorrência e informa ao
+        controlador a latência e o desfecho da chamada.
+        """
+        with self.controle.permissao():
+            inicio = time.perf_counter()
+            try:
+                with medir('monday.mutation'):
+                    response = requests.post(
+                        Config.MONDAY_API_URL,
+                        json=payload,
+                        headers=self.headers
+                    )
+            except requests.RequestException:
+                self.controle.registrar(time.perf_counter() - inicio, sucesso=False)
+                raise
+        
+        self.controle.registrar(
+            time.perf_counter() - inicio,
+            sucesso=response.status_code < 500,
+            limitado=self.resposta_limitada(response)
+        )
+        return response
+
+    async def _enviar_async(self, payload: dict) -> tuple:
+        """Variante assíncrona de _enviar; devolve (status, corpo JSON)."""
+        async with self.controle.permissao_async():
+            inicio = time.perf_counter()
+            try:
+                status, data = await self._cliente_async().post(payload, 'monday.mutation')
+            except Exception:
+                self.controle.registrar(time.perf_counter() - inicio, sucesso=False)
+                raise
+        
+        self.controle.registrar(
+            time.perf_counter() - inicio,
+            sucesso=status < 500,
+            limitado=self._limitada(status, data)
+        )
+        return status, data
+
+    def _cliente_async(self) -> ClienteMondayAsync:
+        if self.cliente_async is None:
+            self.cliente_async = ClienteMondayAsync(self.headers)
+        return self.cliente_async
+
+    @staticmethod
+    def resposta_limitada(response: requests.Response) -> bool:
+        """Indica se a API recusou a chamada por limite de taxa ou de complexidade"""
+        try:
+            data = response.json() if response.status_code == 200 else None
+        except ValueError:
+            data = None
+        return AgenteExecutor._limitada(response.status_code, data)
+
+    @staticmethod
+    def _limitada(status: int, data: dict) -> bool:
+        if status == 429:
+            return True
+        if status != 200 or not data:
+            return False
+        erros = data.get('errors') or []
+        mensagens = ' '.join(str(erro.get('message', '')) if isinstance(erro, dict) else str(erro) for erro in erros)
+        return any(codigo in mensagens for codigo in ('RATE_LIMIT_EXCEEDED', 'ComplexityException', 'DAILY_LIMIT_EXCEEDED'))
 
     def verificar_limites(self) -> bool:
         """Verifica se os limites da API foram atingidos"""
         try:
-            # Consultar limites atuais
-            query = '''
-            query {
-                limits {
-                    complexity
-                    minutes
-                    concurrency
-                }
-            }
-            '''
+            return self._consultar_limites()
+                
+        except Exception as e:
+            logger.error(f"Erro ao verificar limites: {str(e)}")
+            return False
+
+    async def verificar_limites_async(self) -> bool:
+        """Variante assíncrona de verificar_limites"""
+        try:
+            return await self._consultar_limites_async()
+                
+        except Exception as e:
+            logger.error(f"Erro ao verificar limites: {str(e)}")
+            return False
+
+    def _consultar_limites(self) -> bool:
+        """
+        Consulta os limites da API, distinguindo limite atingido de falha na consulta.
+        
+        Returns:
+            bool: False se algum limite foi atingido (ou a própria consulta foi limitada)
             
+        Raises:
+            Exception: Se a consulta falhar por outro motivo (rede, status, resposta inesperada)
+        """
+        with medir('monday.limits'):
             response = requests.post(
                 Config.MONDAY_API_URL,
-                json={'query': query},
+                json={'query': CONSULTA_LIMITES},
                 headers=self.headers
             )
-            
-            if response.status_code == 200:
-                data = response.json()
-                
-                # Verificar cada limite
-                for key, value in data['data']['limits'].items():
-                    if value >= self.limits[key]:
-                        logger.warning(f"Limite atingido: {key} = {value}")
-                        return False
-                
-                return True
-                
-        except Exception as e:
-            logger.error(f"Erro ao verificar limites: {str(e)}")
+        return self._interpretar_limites(response.status_code, response.json() if response.status_code == 200 else None)
+
+    async def _consultar_limites_async(self) -> bool:
+        status, data = await self._cliente_async().post({'query': CONSULTA_LIMITES}, 'monday.limits')
+        return self._interpretar_limites(status, data if status == 200 else None)
+
+    def _interpretar_limites(self, status: int, data: dict) -> bool:
+        if self._limitada(status, data):
+            logger.warning(f"Consulta de limites recusada pela API (status {status})")
             return False
+        if status != 200:
+            raise Exception(f"Erro ao consultar limites: status code {status}")
+        return self._avaliar_limites(data)
+
+    def _avaliar_limites(self, data: dict) -> bool:
+        # Verificar cada limite
+        for key, value in data['data']['limits'].items():
+            chave = CHAVES_LIMITES.get(key)
+            if chave is None or value is None:
+                continue
+            ORCAMENTO_API.rotulos(limite=chave).definir(self.limits[chave] - value)
+            if value >= self.limits[chave]:
+                logger.warning(f"Limite atingido: {chave} = {value}")
+                return False
+        
+        return True
 
     def obter_status_execucao(self) -> dict:
         """Retorna as métricas de execução"""
@@ -132,7 +488,8 @@ class AgenteExecutor:
             'sucessos': self.metrics['sucessos'],
             'falhas': self.metrics['falhas'],
             'retries': self.metrics['retries'],
-            'ultima_execucao': str(self.metrics['ultima_execucao'])
+            'ultima_execucao': str(self.metrics['ultima_execucao']),
+            'controle': self.controle.obter_estado()
         }
 
     def tratar_erro_api(self, error: dict) -> str:
@@ -0,0 +1,211 @@
+import asyncio
+import logging
+import math
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+
+from agentes.monitoramento import metricas
+
+logger = logging.getLogger(__name__)
+
+LIMITE_CONCORRENCIA = metricas.medidor('executor_limite_concorrencia', 'Limite adaptativo de mutations simultâneas')
+TAMANHO_LOTE = metricas.medidor('executor_tamanho_lote', 'Tamanho adaptativo dos lotes de mutations')
+EM_ANDAMENTO = metricas.medidor('executor_mutations_em_andamento', 'Mutations em andamento no Monday.com')
+
+class LimiteAIMD:
+    """
+    Limite com aumento aditivo e redução multiplicativa (AIMD).
+
+    Cada sucesso soma aumento/valor, ou seja, o limite cresce `aumento` a
+    cada rodada completa de `valor` operações bem-sucedidas; um sinal de
+    congestionamento multiplica o limite por `fator_reducao`.
+    """
+
+    def __init__(self, inicial: float, minimo: float, maximo: float, aumento: float = 1.0, fator_reducao: float = 0.5):
+        self.minimo = minimo
+        self.maximo = maximo
+        self.aumento = aumento
+        self.fator_reducao = fator_reducao
+        self.valor = float(min(max(inicial, minimo), maximo))
+
+    def aumentar(self):
+        self.valor = min(self.maximo, self.valor + self.aumento / self.valor)
+
+    def reduzir(self):
+        self.valor = max(self.minimo, self.valor * self.fator_reducao)
+
+    @property
+    def inteiro(self) -> int:
+        return max(int(self.minimo), int(self.valor))
+
+class ControladorConcorrencia:
+    """
+    Ajusta em tempo de execução quantas mutations podem rodar ao mesmo
+    tempo e o tamanho dos lotes enviados ao Monday.com.
+
+    O executor informa a latência e o desfecho de cada chamada à API.
+    Latência acima do alvo, erros do servidor e limites de taxa reduzem
+    os limites; sucessos os aumentam aos poucos. Reduções ficam espaçadas
+    por pelo menos uma latência-alvo, para que uma rajada de respostas de
+    uma mesma sobrecarga conte como um único sinal.
+    """
+
+    def __init__(self, concorrencia_inicial: int = 4, concorrencia_maxima: int = 10, latencia_alvo: float = 2.0,
+                 lote_inicial: int = 10, lote_maximo: int = 50, relogio=time.monotonic):
+        """
+        Args:
+            concorrencia_inicial (int): Mutations simultâneas no início
+            concorrencia_maxima (int): Teto de concorrência (limite da conta no Monday.com)
+            latencia_alvo (float): Latência (segundos) acima da qual a API é considerada congestionada
+            lote_inicial (int): Tamanho inicial dos lotes de mutations
+            lote_maximo (int): Teto do tamanho de lote
+            relogio: Função que retorna o instante atual em segundos
+        """
+        self.latencia_alvo = latencia_alvo
+        self.relogio = relogio
+
+        self.concorrencia = LimiteAIMD(concorrencia_inicial, 1, concorrencia_maxima)
+        self.lote = LimiteAIMD(lote_inicial, 1, lote_maximo)
+
+        self.em_andamento = 0
+        self.estatisticas = {
+            'aumentos': 0,
+            'reducoes': 0,
+            'limitadas': 0
+        }
+        self._ultima_reducao = -math.inf
+        self._condicao = threading.Condition()
+        # Tarefas asyncio aguardando vaga: (loop, future)
+        self._esperas_async = deque()
+        self._publicar()
+
+    @property
+    def limite_concorrencia(self) -> int:
+        return self.concorrencia.inteiro
+
+    @property
+    def tamanho_lote(self) -> int:
+        return self.lote.inteiro
+
+    @contextmanager
+    def permissao(self, timeout: float = None):
+        """
+        Aguarda uma vaga dentro do limite de concorrência atual.
+
+        Args:
+            timeout (float): Espera máxima em segundos (None espera indefinidamente)
+
+        Raises:
+            TimeoutError: Se não houver vaga dentro do timeout
+        """
+        with self._condicao:
+            if not self._condicao.wait_for(lambda: self.em_andamento < self.limite_concorrencia, timeout):
+                raise TimeoutError("Sem vaga no limite de concorrência do executor")
+            self.em_andamento += 1
+            EM_ANDAMENTO.definir(self.em_andamento)
+        try:
+            yield
+        finally:
+            self._liberar()
+
+    @asynccontextmanager
+    async def permissao_async(self):
+        """
+        Variante de permissao para tarefas asyncio: aguarda a vaga sem
+        bloquear o event loop. A vaga é repassada diretamente à tarefa
+        pela chamada que a libera.
+        """
+        with self._condicao:
+            if self.em_andamento < self.limite_concorrencia and not self._esperas_async:
+                self.em_andamento += 1
+                EM_ANDAMENTO.definir(self.em_andamento)
+                futuro = None
+            else:
+                loop = asyncio.get_running_loop()
+                futuro = loop.create_future()
+                self._esperas_async.append((loop, futuro))
+
+        if futuro is not None:
+            try:
+                await futuro
+            except asyncio.CancelledError:
+                # Se a vaga já tinha sido repassada, devolvê-la
+                if futuro.done() and not futuro.cancelled():
+                    self._liberar()
+                raise
+        try:
+            yield
+        finally:
+            self._liberar()
+
+    def _liberar(self):
+        with self._condicao:
+            self.em_andamento -= 1
+            self._repassar_vagas()
+            EM_ANDAMENTO.definir(self.em_andamento)
+            self._condicao.notify()
+
+    def _repassar_vagas(self):
+        """Entrega vagas livres às tarefas asyncio em espera (chamado com o lock)."""
+        while self._esperas_async and self.em_andamento < self.limite_concorrencia:
+            loop, futuro = self._esperas_async.popleft()
+            if futuro.done():
+                continue
+            self.em_andamento += 1
+            loop.call_soon_threadsafe(self._conceder, futuro)
+
+    def _conceder(self, futuro):
+        if futuro.done():
+            # Tarefa cancelada antes de receber a vaga
+            self._liberar()
+        else:
+            futuro.set_result(None)
+
+    def registrar(self, latencia: float, sucesso: bool = True, limitado: bool = False):
+        """
+        Incorpora o resultado de uma chamada à API.
+
+        Args:
+            latencia (float): Duração da chamada em segundos
+            sucesso (bool): False para erros do servidor ou de rede
+            limitado (bool): True se a API recusou por limite de taxa ou complexidade
+        """
+        with self._condicao:
+            if limitado:
+                self.estatisticas['limitadas'] += 1
+
+            if limitado or not sucesso or latencia > self.latencia_alvo:
+                agora = self.relogio()
+                if agora - self._ultima_reducao >= self.latencia_alvo:
+                    self._ultima_reducao = agora
+                    self.concorrencia.reduzir()
+                    # Lotes grandes estouram a complexidade; só encolhem quando a API limita
+                    if limitado:
+                        self.lote.reduzir()
+                    self.estatisticas['reducoes'] += 1
+                    logger.info(
+                        f"Congestionamento na API: concorrência {self.limite_concorrencia}, lote {self.tamanho_lote}"
+                    )
+            else:
+                self.concorrencia.aumentar()
+                self.lote.aumentar()
+                self.estatisticas['aumentos'] += 1
+                self._repassar_vagas()
+                self._condicao.notify_all()
+
+            self._publicar()
+
+    def obter_estado(self) -> dict:
+        """Retorna os limites atuais e quantas vezes foram ajustados"""
+        return {
+            'limite_concorrencia': self.limite_concorrencia,
+            'tamanho_lote': self.tamanho_lote,
+            'em_andamento': self.em_andamento,
+            **self.estatisticas
+        }
+
+    def _publicar(self):
+        LIMITE_CONCORRENCIA.definir(self.limite_concorrencia)
+        TAMANHO_LOTE.definir(self.tamanho_lote)
@@ -1,5 +1,6 @@
 import pytest
 from agente_executor import AgenteExecutor
+from agente_executor.agente_executor import ORCAMENTO_API
 
 def test_executar_mutation_sucesso():
     """Testa execução bem-sucedida de mutation"""
@@ -38,6 +39,22 @@ def test_verificar_limites():
     agente.limits['complexidade'] = 0
     assert agente.verificar_limites() is False
 
+def test_avaliar_limites_resposta_api():
+    """Testa que os campos da resposta de limits são comparados com os limites configurados"""
+    agente = AgenteExecutor()
+    resposta = {'data': {'limits': {'complexity': 400, 'minutes': 10, 'concurrency': 2}}}
+    
+    assert agente._avaliar_limites(resposta) is True
+    assert ORCAMENTO_API.rotulos(limite='complexidade').valor == agente.limits['complexidade'] - 400
+    assert ORCAMENTO_API.rotulos(limite='minutos').valor == agente.limits['minutos'] - 10
+    assert ORCAMENTO_API.rotulos(limite='concorrencia').valor == agente.limits['concorrencia'] - 2
+    
+    resposta['data']['limits']['concurrency'] = agente.limits['concorrencia']
+    assert agente._avaliar_limites(resposta) is False
+    
+    # Campos desconhecidos não interrompem a verificação
+    assert agente._avaliar_limites({'data': {'limits': {'complexity': 1, 'outro': 5}}}) is True
+
 def test_tratar_erro_api():
     """Testa tratamento de erros da API"""
     agente = AgenteExecutor()
@@ -51,3 +68,222 @@ def test_tratar_erro_api():
     erro = {'message': 'DAILY_LIMIT_EXCEEDED'}
     mensagem = agente.tratar_erro_api(erro)
     assert "limite diário" in mensagem.lower()
+
+def test_controle_aimd_aumenta_e_reduz():
+    """Testa o aumento aditivo com sucessos e a redução multiplicativa com congestionamento"""
+    from agente_executor.controle_concorrencia import ControladorConcorrencia
+    
+    instante = [0.0]
+    controle = ControladorConcorrencia(concorrencia_inicial=4, concorrencia_maxima=10, latencia_alvo=1.0,
+                                       lote_inicial=10, lote_maximo=50, relogio=lambda: instante[0])
+    
+    # Cerca de uma rodada de sucessos (limite atual) aumenta o limite em 1
+    for _ in range(5):
+        controle.registrar(0.2)
+    assert controle.limite_concorrencia == 5
+    
+    # Latência acima do alvo reduz a concorrência, mas não o lote
+    lote = controle.tamanho_lote
+    controle.registrar(3.0)
+    assert controle.limite_concorrencia == 2
+    assert controle.tamanho_lote == lote
+    
+    # Sinais da mesma rajada não reduzem de novo
+    controle.registrar(3.0, sucesso=False)
+    assert controle.limite_concorrencia == 2
+    
+    # Limite de taxa reduz também o lote
+    instante[0] = 5.0
+    controle.registrar(0.1, limitado=True)
+    assert controle.limite_concorrencia == 1
+    assert controle.tamanho_lote == lote // 2
+    assert controle.obter_estado()['limitadas'] == 1
+
+def test_controle_respeita_limite_concorrencia():
+    """Testa que permissao() não deixa passar mais chamadas que o limite"""
+    import threading
+    import time
+    from agente_executor.controle_concorrencia import ControladorConcorrencia
+    
+    controle = ControladorConcorrencia(concorrencia_inicial=2, concorrencia_maxima=2)
+    maximo = [0]
+    lock = threading.Lock()
+    
+    def chamar():
+        with controle.permissao():
+            with lock:
+                maximo[0] = max(maximo[0], controle.em_andamento)
+            time.sleep(0.01)
+    
+    threads = [threading.Thread(target=chamar) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert maximo[0] == 2
+    assert controle.em_andamento == 0
+    
+    with controle.permissao():
+        with controle.permissao():
+            with pytest.raises(TimeoutError):
+                with controle.permissao(timeout=0.01):
+                    pass
+
+def test_controle_permissao_async():
+    """Testa que tarefas asyncio aguardam vaga sem bloquear o event loop"""
+    import asyncio
+    from agente_executor.controle_concorrencia import ControladorConcorrencia
+    
+    controle = ControladorConcorrencia(concorrencia_inicial=3, concorrencia_maxima=3)
+    maximo = [0]
+    
+    async def chamar():
+        async with controle.permissao_async():
+            maximo[0] = max(maximo[0], controle.em_andamento)
+            await asyncio.sleep(0.01)
+    
+    async def cenario():
+        tarefas = [asyncio.ensure_future(chamar()) for _ in range(30)]
+        # Cancelar tarefas na fila não pode vazar vagas
+        await asyncio.sleep(0)
+        tarefas[-1].cancel()
+        await asyncio.gather(*tarefas, return_exceptions=True)
+    
+    asyncio.run(cenario())
+    assert maximo[0] == 3
+    assert controle.em_andamento == 0
+
+def test_combinar_mutations():
+    """Testa a junção de mutations com alias e variáveis renomeadas"""
+    from agente_executor.agente_executor import combinar_mutations
+    
+    payload = {
+        'query': 'mutation($boardId: Int!, $name: String!) { create_item(boardId: $boardId item_name: $name) { id } }',
+        'variables': {'boardId': 1, 'name': 'Tarefa'}
+    }
+    combinado = combinar_mutations([payload, dict(payload, variables={'boardId': 2, 'name': 'Outra'})])
+    
+    assert combinado['query'].startswith('mutation($boardId_0: Int!, $name_0: String!, $boardId_1: Int!, $name_1: String!)')
+    assert 'm0: create_item(boardId: $boardId_0 item_name: $name_0)' in combinado['query']
+    assert 'm1: create_item(boardId: $boardId_1 item_name: $name_1)' in combinado['query']
+    assert combinado['variables'] == {'boardId_0': 1, 'name_0': 'Tarefa', 'boardId_1': 2, 'name_1': 'Outra'}
+
+def test_executar_mutations_lote(monkeypatch):
+    """Testa o envio em blocos do tamanho do lote e a separação de erros por mutation"""
+    from agente_executor.controle_concorrencia import ControladorConcorrencia
+    
+    agente = AgenteExecutor()
+    agente.controle = ControladorConcorrencia(lote_inicial=2, lote_maximo=2)
+    enviados = []
+    
+    class Resposta:
+        status_code = 200
+        headers = {}
+        
+        def __init__(self, dados):
+            self.dados = dados
+        
+        def json(self):
+            return self.dados
+    
+    def enviar(payload):
+        enviados.append(payload)
+        quantidade = len(payload['variables']) // 2
+        dados = {'data': {f"m{indice}": {'id': str(indice)} for indice in range(quantidade)}}
+        if len(enviados) == 1:
+            dados['data']['m1'] = None
+            dados['errors'] = [{'message': 'Coluna inválida', 'path': ['m1']}]
+        return Resposta(dados)
+    
+    monkeypatch.setattr(agente, '_enviar', enviar)
+    monkeypatch.setattr(agente, '_consultar_limites', lambda: True)
+    
+    payloads = [{'query': 'mutation($boardId: Int!, $name: String!) { create_item(boardId: $boardId item_name: $name) { id } }',
+                 'variables': {'boardId': 1, 'name': f"Tarefa {numero}"}} for numero in range(3)]
+    resultados = agente.executar_mutations_lote(payloads)
+    
+    assert len(enviados) == 2
+    assert [resultado['sucesso'] for resultado in resultados] == [True, False, True]
+    assert resultados[1]['erro'] == 'Coluna inválida'
+    assert agente.metrics['sucessos'] == 2
+    assert agente.metrics['falhas'] == 1
+
+def test_falha_ao_consultar_limites_nao_reduz_controle(monkeypatch):
+    """Testa que só limite atingido reduz concorrência e lote; falhas da consulta seguem o caminho de erro"""
+    agente = AgenteExecutor()
+    agente.max_retries = 1
+    monkeypatch.setattr('agente_executor.agente_executor.time.sleep', lambda segundos: None)
+    concorrencia, lote = agente.controle.limite_concorrencia, agente.controle.tamanho_lote
+    
+    class Resposta:
+        def __init__(self, status_code, dados=None):
+            self.status_code = status_code
+            self.dados = dados
+        
+        def json(self):
+            return self.dados
+    
+    respostas = iter([Resposta(500), Resposta(200, {'errors': [{'message': 'Erro interno'}]})])
+    monkeypatch.setattr('agente_executor.agente_executor.requests.post', lambda *args, **kwargs: next(respostas))
+    with pytest.raises(Exception):
+        agente.executar_mutation({'query': 'mutation { create_item { id } }'})
+    assert agente.metrics['falhas'] == 1
+    assert agente.metrics['retries'] == 1
+    assert (agente.controle.limite_concorrencia, agente.controle.tamanho_lote) == (concorrencia, lote)
+    
+    # Limite de fato atingido reduz o controle
+    limites = {'data': {'limits': {'complexity': agente.limits['complexidade']}}}
+    monkeypatch.setattr('agente_executor.agente_executor.requests.post', lambda *args, **kwargs: Resposta(200, limites))
+    with pytest.raises(Exception):
+        agente.executar_mutation({'query': 'mutation { create_item { id } }'})
+    assert agente.controle.tamanho_lote < lote
+
+def test_lote_parcial_limitado_reenvia_so_o_que_faltou(monkeypatch):
+    """Testa que uma resposta limitada com parte das mutations aplicadas não reenvia as aplicadas"""
+    from agente_executor.controle_concorrencia import ControladorConcorrencia
+    
+    agente = AgenteExecutor()
+    agente.controle = ControladorConcorrencia(lote_inicial=4, lote_maximo=4)
+    monkeypatch.setattr('agente_executor.agente_executor.time.sleep', lambda segundos: None)
+    enviados = []
+    
+    class Resposta:
+        status_code = 200
+        headers = {}
+        
+        def __init__(self, dados):
+            self.dados = dados
+        
+        def json(self):
+            return self.dados
+    
+    def enviar(payload):
+        enviados.append(payload)
+        if len(enviados) == 1:
+            return Resposta({
+                'data': {'m0': {'id': '10'}, 'm1': None, 'm2': None, 'm3': None},
+                'errors': [
+                    {'message': 'ComplexityException: orçamento esgotado', 'path': ['m1']},
+                    {'message': 'Coluna inválida', 'path': ['m3']}
+                ]
+            })
+        quantidade = len(payload['variables']) // 2
+        return Resposta({'data': {f"m{indice}": {'id': str(20 + indice)} for indice in range(quantidade)}})
+    
+    monkeypatch.setattr(agente, '_enviar', enviar)
+    monkeypatch.setattr(agente, '_consultar_limites', lambda: True)
+    
+    payloads = [{'query': 'mutation($boardId: Int!, $name: String!) { create_item(boardId: $boardId item_name: $name) { id } }',
+                 'variables': {'boardId': 1, 'name': f"Tarefa {numero}"}} for numero in range(4)]
+    resultados = agente.executar_mutations_lote(payloads)
+    
+    assert len(enviados) == 2
+    # Só a mutation limitada e a que ficou sem resposta voltam a ser enviadas
+    assert enviados[1]['variables'] == {'boardId_0': 1, 'name_0': 'Tarefa 1', 'boardId_1': 1, 'name_1': 'Tarefa 2'}
+    assert [resultado['sucesso'] for resultado in resultados] == [True, True, True, False]
+    assert resultados[0]['resultado'] == {'data': {'m0': {'id': '10'}}}
+    assert resultados[2]['resultado'] == {'data': {'m2': {'id': '21'}}}
+    assert resultados[3]['erro'] == 'Coluna inválida'
+    assert agente.metrics['sucessos'] == 3
+    assert agente.metrics['falhas'] == 1
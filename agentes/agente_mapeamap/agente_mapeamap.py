@@ -2,6 +2,8 @@ import logging
 import requests
 from datetime import datetime
 from config import Config
+from agentes.monitoramento import medir
+from agentes.cliente_monday import ClienteMondayAsync
 
 logger = logging.getLogger(__name__)
 
@@ -30,6 +32,9 @@ class AgenteMapeaMap:
         # Cache de metadados dos quadros
         self.cache_quadros = {}
         
+        # Cliente HTTP assíncrono, criado no primeiro uso (criar_payload_mutation_async)
+        self.cliente_async = None
+        
         logger.info("AgenteMapeaMap inicializado com sucesso!")
 
     def mapear_entidades_para_column_values(self, entidades: dict, projeto: str) -> dict:
@@ -45,8 +50,6 @@ class AgenteMapeaMap:
         """
         logger.info("Mapeando entidades para column_values...")
         
-        column_values = {}
-        
         # Obter metadados do quadro
         board_id = self.obter_id_quadro(projeto)
         if not board_id:
@@ -57,20 +60,30 @@ class AgenteMapeaMap:
         colunas = self.obter_metadados_colunas(board_id)
         
         # Mapear cada tipo de entidade
+        usuarios = self.obter_usuarios() if 'pessoas' in entidades else []
+        column_values = self._montar_column_values(entidades, usuarios)
+            
+        logger.info("Mapeamento de entidades concluído!")
+        return column_values
+
+    def _montar_column_values(self, entidades: dict, usuarios: list) -> dict:
+        """Monta os column values a partir das entidades e da lista de usuários já obtida."""
+        column_values = {}
         for tipo, valores in entidades.items():
             if tipo == 'pessoas':
-                column_values['person'] = self.mapear_pessoas(valores)
+                column_values['person'] = self._ids_pessoas(valores, usuarios)
             elif tipo == 'datas':
                 column_values['date'] = self.mapear_data(valores[0]) if valores else None
             elif tipo == 'prioridade':
                 column_values['priority'] = self.mapear_prioridade(valores[0]) if valores else None
-            
-        logger.info("Mapeamento de entidades concluído!")
         return column_values
 
     def mapear_pessoas(self, pessoas: list) -> dict:
         """Mapeia nomes de pessoas para IDs do Monday.com"""
-        usuarios = self.obter_usuarios()
+        return self._ids_pessoas(pessoas, self.obter_usuarios())
+
+    @staticmethod
+    def _ids_pessoas(pessoas: list, usuarios: list) -> dict:
         ids = []
         
         for pessoa in pessoas:
@@ -109,7 +122,32 @@ class AgenteMapeaMap:
         """Obtém o ID do quadro pelo nome"""
         if nome in self.cache_quadros:
             return self.cache_quadros[nome]
-            
+        
+        with medir('monday.boards'):
+            response = requests.post(
+                Config.MONDAY_API_URL,
+                json=self._consulta_quadro(nome),
+                headers=self.headers
+            )
+        
+        if response.status_code == 200:
+            return self._guardar_quadro(nome, response.json())
+        
+        return None
+
+    async def obter_id_quadro_async(self, nome: str) -> int:
+        """Variante assíncrona de obter_id_quadro"""
+        if nome in self.cache_quadros:
+            return self.cache_quadros[nome]
+        
+        status, dados = await self._cliente_async().post(self._consulta_quadro(nome), 'monday.boards')
+        if status == 200:
+            return self._guardar_quadro(nome, dados)
+        
+        return None
+
+    @staticmethod
+    def _consulta_quadro(nome: str) -> dict:
         query = '''
         query($nome: String!) {
             boards(
@@ -122,21 +160,13 @@ class AgenteMapeaMap:
             }
         }
         '''
-        
-        variables = {'nome': nome}
-        response = requests.post(
-            Config.MONDAY_API_URL,
-            json={'query': query, 'variables': variables},
-            headers=self.headers
-        )
-        
-        if response.status_code == 200:
-            data = response.json()
-            if data['data']['boards']:
-                id_quadro = data['data']['boards'][0]['id']
-                self.cache_quadros[nome] = id_quadro
-                return id_quadro
-        
+        return {'query': query, 'variables': {'nome': nome}}
+
+    def _guardar_quadro(self, nome: str, data: dict) -> int:
+        if data['data']['boards']:
+            id_quadro = data['data']['boards'][0]['id']
+            self.cache_quadros[nome] = id_quadro
+            return id_quadro
         return None
 
     def obter_metadados_colunas(self, board_id: int) -> dict:
@@ -154,11 +184,12 @@ class AgenteMapeaMap:
         '''
         
         variables = {'boardId': board_id}
-        response = requests.post(
-            Config.MONDAY_API_URL,
-            json={'query': query, 'variables': variables},
-            headers=self.headers
-        )
+        with medir('monday.columns'):
+            response = requests.post(
+                Config.MONDAY_API_URL,
+                json={'query': query, 'variables': variables},
+                headers=self.headers
+            )
         
         if response.status_code == 200:
             data = response.json()
@@ -168,6 +199,29 @@ class AgenteMapeaMap:
 
     def obter_usuarios(self) -> list:
         """Obtém a lista de usuários do workspace"""
+        with medir('monday.users'):
+            response = requests.post(
+                Config.MONDAY_API_URL,
+                json=self._consulta_usuarios(),
+                headers=self.headers
+            )
+        
+        if response.status_code == 200:
+            data = response.json()
+            return data['data']['users']
+        
+        return []
+
+    async def obter_usuarios_async(self) -> list:
+        """Variante assíncrona de obter_usuarios"""
+        status, data = await self._cliente_async().post(self._consulta_usuarios(), 'monday.users')
+        if status == 200:
+            return data['data']['users']
+        
+        return []
+
+    @staticmethod
+    def _consulta_usuarios() -> dict:
         query = '''
         query {
             users {
@@ -177,18 +231,12 @@ class AgenteMapeaMap:
             }
         }
         '''
-        
-        response = requests.post(
-            Config.MONDAY_API_URL,
-            json={'query': query},
-            headers=self.headers
-        )
-        
-        if response.status_code == 200:
-            data = response.json()
-            return data['data']['users']
-        
-        return []
+        return {'query': query}
+
+    def _cliente_async(self) -> ClienteMondayAsync:
+        if self.cliente_async is None:
+            self.cliente_async = ClienteMondayAsync(self.headers)
+        return self.cliente_async
 
     def criar_payload_mutation(self, intencoes: dict) -> dict:
         """
@@ -212,6 +260,68 @@ class AgenteMapeaMap:
             projeto
         )
         
+        return self._montar_payload(intencoes, board_id, column_values)
+
+    async def criar_payload_mutation_async(self, intencoes: dict) -> dict:
+        """
+        Variante assíncrona de criar_payload_mutation.
+        
+        O id do quadro vem do cache quando possível e a lista de usuários
+        é obtida sem bloquear a thread. Os metadados das colunas não são
+        consultados, pois não entram no payload.
+        """
+        logger.info("Criando payload para mutation (async)...")
+        
+        entidades = intencoes['entidades_validas']
+        projeto = entidades.get('projetos', [''])[0]
+        board_id = await self.obter_id_quadro_async(projeto)
+        
+        column_values = {}
+        if not board_id:
+            logger.error(f"Quadro não encontrado: {projeto}")
+        else:
+            usuarios = await self.obter_usuarios_async() if 'pessoas' in entidades else []
+            column_values = self._montar_column_values(entidades, usuarios)
+        
+        return self._montar_payload(intencoes, board_id, column_values)
+
+    def criar_payloads_lote(self, lista_intencoes: list) -> list:
+        """
+        Cria os payloads de várias intenções validadas de uma vez.
+        
+        Cada quadro é resolvido uma única vez e a lista de usuários é
+        obtida uma única vez para todo o lote. Os metadados das colunas
+        não são consultados, pois não entram no payload.
+        
+        Args:
+            lista_intencoes (list): Intenções validadas pelo AgenteValidador
+            
+        Returns:
+            list: Payload de cada intenção, na mesma ordem; None quando o quadro não foi encontrado
+        """
+        logger.info(f"Criando {len(lista_intencoes)} payloads em lote...")
+        
+        projetos = [intencoes['entidades_validas'].get('projetos', [''])[0] for intencoes in lista_intencoes]
+        quadros = {projeto: self.obter_id_quadro(projeto) for projeto in set(projetos)}
+        usuarios = None
+        
+        payloads = []
+        for intencoes, projeto in zip(lista_intencoes, projetos):
+            board_id = quadros[projeto]
+            if not board_id:
+                logger.error(f"Quadro não encontrado: {projeto}")
+                payloads.append(None)
+                continue
+            
+            entidades = intencoes['entidades_validas']
+            if usuarios is None and 'pessoas' in entidades:
+                usuarios = self.obter_usuarios()
+            column_values = self._montar_column_values(entidades, usuarios or [])
+            payloads.append(self._montar_payload(intencoes, board_id, column_values))
+        
+        return payloads
+
+    def _montar_payload(self, intencoes: dict, board_id: int, column_values: dict) -> dict:
         # Construir mutation
         mutation = '''
         mutation($boardId: Int!, $name: String!, $columnValues: JSON!) {
@@ -1,25 +1,38 @@
 import logging
 import re
-import nltk
-from nltk.tokenize import word_tokenize
-from nltk.corpus import stopwords
-from nltk.stem import WordNetLemmatizer
-import spacy
 from datetime import datetime
 from config import Config
 
-# Baixar recursos do NLTK
-nltk.download('punkt')
-nltk.download('stopwords')
-nltk.download('wordnet')
-
 logger = logging.getLogger(__name__)
 
+# Recursos do NLTK usados pelo AgentePre: (caminho em nltk.data, pacote)
+RECURSOS_NLTK = [
+    ('tokenizers/punkt', 'punkt'),
+    ('corpora/stopwords', 'stopwords'),
+    ('corpora/wordnet', 'wordnet')
+]
+
+def _garantir_recursos_nltk():
+    """Baixa os recursos do NLTK que ainda não estão instalados."""
+    import nltk
+    for caminho, pacote in RECURSOS_NLTK:
+        try:
+            nltk.data.find(caminho)
+        except LookupError:
+            nltk.download(pacote)
+
 class AgentePre:
     def __init__(self):
         """Inicializa o AgentePre com as configurações necessárias."""
         logging.info("Inicializando AgentePre...")
         
+        # spaCy e NLTK são importados só aqui: importar o módulo não carrega as bibliotecas
+        import spacy
+        from nltk.corpus import stopwords
+        from nltk.stem import WordNetLemmatizer
+        from nltk.tokenize import word_tokenize
+        _garantir_recursos_nltk()
+        
         # Carregar modelo spaCy em português
         try:
             self.nlp = spacy.load('pt_core_news_lg')
@@ -34,6 +47,7 @@ class AgentePre:
         # Configurar recursos do NLTK
         self.stop_words = set(stopwords.words('portuguese'))
         self.lemmatizer = WordNetLemmatizer()
+        self.tokenizar = word_tokenize
         
         logger.info("AgentePre inicializado com sucesso!")
 
@@ -45,7 +59,7 @@ class AgentePre:
         texto_limpo = re.sub(r'[^\w\s.,!?@#$%&*()\-_=+]', '', texto)
         
         # 2. Tokenização
-        tokens = word_tokenize(texto_limpo, language='portuguese')
+        tokens = self.tokenizar(texto_limpo, language='portuguese')
         
         # 3. Remover stopwords
         tokens_filtrados = [token for token in tokens if token.lower() not in self.stop_words]
@@ -1,10 +1,18 @@
+import asyncio
 import logging
 import requests
 from datetime import datetime, timedelta
 from config import Config
+from agentes.monitoramento import medir
+from agentes.cliente_monday import ClienteMondayAsync
 
 logger = logging.getLogger(__name__)
 
+AVISOS_NAO_ENCONTRADO = {
+    'users': "Pessoa não encontrada",
+    'boards': "Projeto não encontrado"
+}
+
 class AgenteValidador:
     def __init__(self):
         """Inicializa o AgenteValidador"""
@@ -34,6 +42,9 @@ class AgenteValidador:
             'tipos_tarefa': ['tarefa', 'subtarefa', 'milestone']
         }
         
+        # Cliente HTTP assíncrono, criado no primeiro uso (validar_intencoes_async)
+        self.cliente_async = None
+        
         logger.info("AgenteValidador inicializado com sucesso!")
 
     def validar_entidades(self, entidades: dict) -> dict:
@@ -106,11 +117,12 @@ class AgenteValidador:
         '''
         
         variables = {'nome': nome}
-        response = requests.post(
-            Config.MONDAY_API_URL,
-            json={'query': query, 'variables': variables},
-            headers=self.headers
-        )
+        with medir('monday.users'):
+            response = requests.post(
+                Config.MONDAY_API_URL,
+                json={'query': query, 'variables': variables},
+                headers=self.headers
+            )
         
         if response.status_code == 200:
             data = response.json()
@@ -141,11 +153,12 @@ class AgenteValidador:
         '''
         
         variables = {'nome': nome}
-        response = requests.post(
-            Config.MONDAY_API_URL,
-            json={'query': query, 'variables': variables},
-            headers=self.headers
-        )
+        with medir('monday.boards'):
+            response = requests.post(
+                Config.MONDAY_API_URL,
+                json={'query': query, 'variables': variables},
+                headers=self.headers
+            )
         
         if response.status_code == 200:
             data = response.json()
@@ -201,6 +214,105 @@ class AgenteValidador:
         pessoas_validas = []
         for pessoa in entidades['pessoas']:
             # Consultar API do Monday.com para verificar se a pessoa existe
+            id_pessoa = self._consultar_entidade('users', pessoa)
+            if id_pessoa is not None:
+                pessoas_validas.append(id_pessoa)
+        
+        # Validar projetos
+        projetos_validos = []
+        for projeto in entidades['projetos']:
+            # Consultar API do Monday.com para verificar se o projeto existe
+            id_projeto = self._consultar_entidade('boards', projeto)
+            if id_projeto is not None:
+                projetos_validos.append(id_projeto)
+        
+        return self._aplicar_regras(intencoes, pessoas_validas, projetos_validos, inicio_validacao)
+
+    def validar_intencoes_lote(self, lista_intencoes: list) -> list:
+        """
+        Valida várias intenções (ex.: as tarefas de uma mesma reunião).
+        
+        Cada pessoa e cada projeto é consultado no Monday.com uma única vez,
+        por mais tarefas que o mencionem; as regras de negócio são então
+        aplicadas a cada intenção.
+        
+        Args:
+            lista_intencoes (list): Intenções do AgenteAnalista
+            
+        Returns:
+            list: Resultado de validar_intencoes para cada intenção, na mesma ordem
+        """
+        logger.info(f"Validando {len(lista_intencoes)} intenções em lote...")
+        inicio_validacao = datetime.now()
+        
+        consultas = {}
+        for intencoes in lista_intencoes:
+            entidades = intencoes['entidades_validas']
+            for tipo, chave in (('users', 'pessoas'), ('boards', 'projetos')):
+                for nome in entidades[chave]:
+                    consultas.setdefault((tipo, nome), None)
+        
+        for tipo, nome in consultas:
+            consultas[(tipo, nome)] = self._consultar_entidade(tipo, nome)
+        logger.info(f"{len(consultas)} consultas para {len(lista_intencoes)} intenções")
+        
+        resultados = []
+        for intencoes in lista_intencoes:
+            entidades = intencoes['entidades_validas']
+            pessoas_validas = [consultas[('users', nome)] for nome in entidades['pessoas'] if consultas[('users', nome)] is not None]
+            projetos_validos = [consultas[('boards', nome)] for nome in entidades['projetos'] if consultas[('boards', nome)] is not None]
+            resultados.append(self._aplicar_regras(intencoes, pessoas_validas, projetos_validos, inicio_validacao))
+        return resultados
+
+    def _consultar_entidade(self, tipo: str, nome: str):
+        """Consulta uma pessoa ('users') ou projeto ('boards') e retorna o id encontrado ou None."""
+        with medir(f"monday.{tipo}"):
+            response = requests.post(
+                Config.MONDAY_API_URL,
+                json=self._consulta_entidade(tipo, nome),
+                headers=self.headers
+            )
+        dados = response.json() if response.status_code == 200 else None
+        return self._interpretar_consulta(tipo, nome, response.status_code, dados)
+
+    async def validar_intencoes_async(self, intencoes: dict) -> dict:
+        """
+        Variante assíncrona de validar_intencoes.
+        
+        As consultas de todas as pessoas e projetos são enviadas ao mesmo
+        tempo; a thread fica livre para outras transcrições enquanto a API
+        responde.
+        """
+        logger.info("Iniciando validação de intenções (async)...")
+        inicio_validacao = datetime.now()
+        
+        entidades = intencoes['entidades_validas']
+        consultas = [('users', 'monday.users', pessoa) for pessoa in entidades['pessoas']]
+        consultas += [('boards', 'monday.boards', projeto) for projeto in entidades['projetos']]
+        
+        cliente = self._cliente_async()
+        respostas = await asyncio.gather(*(
+            cliente.post(self._consulta_entidade(tipo, nome), medicao)
+            for tipo, medicao, nome in consultas
+        ))
+        
+        encontrados = {'users': [], 'boards': []}
+        for (tipo, _, nome), (status, dados) in zip(consultas, respostas):
+            identificador = self._interpretar_consulta(tipo, nome, status, dados)
+            if identificador is not None:
+                encontrados[tipo].append(identificador)
+        
+        return self._aplicar_regras(intencoes, encontrados['users'], encontrados['boards'], inicio_validacao)
+
+    def _cliente_async(self) -> ClienteMondayAsync:
+        if self.cliente_async is None:
+            self.cliente_async = ClienteMondayAsync(self.headers)
+        return self.cliente_async
+
+    @staticmethod
+    def _consulta_entidade(tipo: str, nome: str) -> dict:
+        """Monta a consulta GraphQL de uma pessoa ('users') ou projeto ('boards') pelo nome."""
+        if tipo == 'users':
             query = '''
                 query($name: String!) {
                     users(name: $name) {
@@ -210,24 +322,7 @@ class AgenteValidador:
                     }
                 }
             '''
-            response = requests.post(
-                Config.MONDAY_API_URL,
-                json={'query': query, 'variables': {'name': pessoa}},
-                headers=self.headers
-            )
-            if response.status_code == 200:
-                data = response.json()
-                if data['data']['users']:
-                    pessoas_validas.append(data['data']['users'][0]['id'])
-                else:
-                    logger.warning(f"Pessoa não encontrada: {pessoa}")
-            else:
-                logger.warning(f"Pessoa não encontrada: {pessoa}")
-        
-        # Validar projetos
-        projetos_validos = []
-        for projeto in entidades['projetos']:
-            # Consultar API do Monday.com para verificar se o projeto existe
+        else:
             query = '''
                 query($name: String!) {
                     boards(name: $name) {
@@ -236,19 +331,20 @@ class AgenteValidador:
                     }
                 }
             '''
-            response = requests.post(
-                Config.MONDAY_API_URL,
-                json={'query': query, 'variables': {'name': projeto}},
-                headers=self.headers
-            )
-            if response.status_code == 200:
-                data = response.json()
-                if data['data']['boards']:
-                    projetos_validos.append(data['data']['boards'][0]['id'])
-                else:
-                    logger.warning(f"Projeto não encontrado: {projeto}")
-            else:
-                logger.warning(f"Projeto não encontrado: {projeto}")
+        return {'query': query, 'variables': {'name': nome}}
+
+    @staticmethod
+    def _interpretar_consulta(tipo: str, nome: str, status: int, dados: dict):
+        """Retorna o id encontrado na resposta ou None (registrando o aviso)."""
+        if status == 200 and dados and dados['data'][tipo]:
+            return dados['data'][tipo][0]['id']
+        
+        logger.warning(f"{AVISOS_NAO_ENCONTRADO[tipo]}: {nome}")
+        return None
+
+    def _aplicar_regras(self, intencoes: dict, pessoas_validas: list, projetos_validos: list, inicio_validacao: datetime) -> dict:
+        """Valida as datas, aplica as regras de negócio e monta o resultado."""
+        entidades = intencoes['entidades_validas']
         
         # Validar datas
         datas_validas = []
@@ -295,6 +391,7 @@ class AgenteValidador:
             },
             'acao': intencoes['acao'],
             'prioridade': intencoes['prioridade'],
+            'objetivo': intencoes.get('objetivo', intencoes['texto_processado']),
             'texto_processado': intencoes['texto_processado'],
             'metricas': {
                 'tempo_validacao': datetime.now() - inicio_validacao,
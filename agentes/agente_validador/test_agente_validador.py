@@ -39,3 +39,84 @@ def test_converter_data():
     # Testar formato inválido
     with pytest.raises(ValueError):
         agente.converter_data('data inválida')
+
+def test_validar_intencoes_async(monkeypatch):
+    """Testa a validação assíncrona contra uma API local, com as consultas em paralelo"""
+    import asyncio
+    import time
+    from config import Config
+    from cliente_monday.test_cliente_monday import iniciar_api_falsa
+    
+    intencoes = {
+        'entidades_validas': {
+            'pessoas': ['João Silva', 'Ninguém'],
+            'projetos': ['XPTO'],
+            'datas': ['30/06/2099']
+        },
+        'acao': 'criar_tarefa',
+        'prioridade': 'alta',
+        'texto_processado': 'joão silva criar tarefa xpto'
+    }
+    
+    async def cenario():
+        runner, url = await iniciar_api_falsa(atraso=0.1)
+        monkeypatch.setattr(Config, 'MONDAY_API_URL', url)
+        agente = AgenteValidador()
+        try:
+            inicio = time.perf_counter()
+            resultado = await agente.validar_intencoes_async(intencoes)
+            duracao = time.perf_counter() - inicio
+        finally:
+            await agente.cliente_async.fechar()
+            await runner.cleanup()
+        return resultado, duracao
+    
+    resultado, duracao = asyncio.run(cenario())
+    assert resultado['entidades_validas']['pessoas'] == [1]
+    assert resultado['entidades_validas']['projetos'] == [10]
+    assert resultado['valido'] is True
+    # Três consultas de 0.1s em paralelo
+    assert duracao < 0.25
+
+def test_validar_intencoes_lote(monkeypatch):
+    """Testa que pessoas e projetos repetidos entre as tarefas são consultados uma única vez"""
+    import agente_validador.agente_validador as modulo
+    
+    consultas = []
+    
+    class Resposta:
+        status_code = 200
+        
+        def __init__(self, tipo, nome):
+            self.dados = {'data': {tipo: [{'id': f"{tipo}:{nome}"}]}}
+        
+        def json(self):
+            return self.dados
+    
+    def post(url, json, headers):
+        tipo = 'users' if 'users' in json['query'] else 'boards'
+        consultas.append((tipo, json['variables']['name']))
+        return Resposta(tipo, json['variables']['name'])
+    
+    monkeypatch.setattr(modulo.requests, 'post', post)
+    
+    def tarefa(pessoa, objetivo):
+        return {
+            'entidades_validas': {'pessoas': [pessoa], 'projetos': ['XPTO'], 'datas': []},
+            'acao': 'criar_tarefa',
+            'prioridade': 'media',
+            'texto_processado': objetivo,
+            'objetivo': objetivo
+        }
+    
+    agente = AgenteValidador()
+    resultados = agente.validar_intencoes_lote([
+        tarefa('João', 'revisar contrato'),
+        tarefa('Maria', 'enviar proposta'),
+        tarefa('João', 'agendar reunião')
+    ])
+    
+    assert sorted(consultas) == [('boards', 'XPTO'), ('users', 'João'), ('users', 'Maria')]
+    assert [resultado['objetivo'] for resultado in resultados] == ['revisar contrato', 'enviar proposta', 'agendar reunião']
+    assert resultados[1]['entidades_validas']['pessoas'] == ['users:Maria']
+    assert all(resultado['valido'] for resultado in resultados)
@@ -0,0 +1 @@
+from .cache_analise import CacheAnalise
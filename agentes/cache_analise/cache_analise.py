@@ -0,0 +1,208 @@
+import copy
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import unicodedata
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Callable
+
+try:
+    import fcntl
+except ImportError:  # Windows: sem bloqueio entre processos
+    fcntl = None
+
+from agentes.monitoramento import metricas
+
+logger = logging.getLogger(__name__)
+
+CONSULTAS = metricas.contador('cache_analise_consultas', 'Consultas ao cache de análise', ('resultado',))
+
+class CacheAnalise:
+    def __init__(self, tamanho_maximo: int = 1024, arquivo: str = None, versao_modelos: str = '',
+                 versao_dados: Callable[[], str] = None):
+        """
+        Inicializa o cache de resultados da análise de intenções.
+
+        Args:
+            tamanho_maximo (int): Número máximo de entradas (política LRU)
+            arquivo (str): Arquivo JSON-lines para persistência (opcional); pode ser compartilhado
+                pelos workers do supervisor, que gravam e compactam sob um bloqueio (fcntl) do arquivo
+            versao_modelos (str): Identificador dos modelos; entra na chave para invalidar o cache quando mudam
+            versao_dados: Função consultada a cada chave que identifica o que mais influencia a
+                análise (dicionário de entidades, limiares); entradas de outras versões deixam de ser encontradas
+        """
+        logger.info("Inicializando CacheAnalise...")
+
+        self.tamanho_maximo = tamanho_maximo
+        self.arquivo = arquivo
+        self.versao_modelos = versao_modelos
+        self.versao_dados = versao_dados
+
+        self.entradas = OrderedDict()
+        self.lock = threading.Lock()
+        self._linhas_arquivo = 0
+
+        # Métricas
+        self.metricas = {
+            'acertos': 0,
+            'falhas': 0,
+            'remocoes': 0
+        }
+
+        if self.arquivo:
+            self._carregar()
+
+        logger.info("CacheAnalise inicializado com sucesso!")
+
+    @staticmethod
+    def normalizar_texto(texto: str) -> str:
+        """Normaliza unicode e espaços; maiúsculas são mantidas porque o NER e o BERT são sensíveis a elas."""
+        texto = unicodedata.normalize('NFC', texto)
+        return re.sub(r'\s+', ' ', texto).strip()
+
+    def chave(self, texto: str) -> str:
+        """Calcula a chave do texto: hash do texto normalizado e das versões dos modelos e dos dados."""
+        versao_dados = self.versao_dados() if self.versao_dados is not None else ''
+        conteudo = f"{self.versao_modelos}\x00{versao_dados}\x00{self.normalizar_texto(texto)}"
+        return hashlib.sha256(conteudo.encode('utf-8')).hexdigest()
+
+    def obter(self, texto: str):
+        """
+        Busca o resultado da análise de um texto.
+
+        Args:
+            texto (str): Texto original da transcrição
+
+        Returns:
+            dict: Cópia do resultado armazenado, ou None se não estiver no cache
+        """
+        chave = self.chave(texto)
+        with self.lock:
+            valor = self.entradas.get(chave)
+            if valor is None:
+                self.metricas['falhas'] += 1
+                CONSULTAS.rotulos(resultado='falha').inc()
+                return None
+
+            self.entradas.move_to_end(chave)
+            self.metricas['acertos'] += 1
+            CONSULTAS.rotulos(resultado='acerto').inc()
+
+        return copy.deepcopy(valor)
+
+    def armazenar(self, texto: str, valor: dict):
+        """
+        Armazena o resultado da análise de um texto.
+
+        Args:
+            texto (str): Texto original da transcrição
+            valor (dict): Resultado de AgenteAnalista.analisar_intencoes
+        """
+        chave = self.chave(texto)
+        valor = copy.deepcopy(valor)
+        with self.lock:
+            self._inserir(chave, valor)
+            if self.arquivo:
+                self._persistir(chave, valor)
+
+    def limpar(self):
+        """Remove todas as entradas (inclusive do arquivo de persistência)."""
+        with self.lock:
+            self.entradas.clear()
+            if self.arquivo and os.path.exists(self.arquivo):
+                with self._bloqueio_arquivo():
+                    os.remove(self.arquivo)
+            self._linhas_arquivo = 0
+
+    def obter_metricas(self) -> dict:
+        """Retorna as métricas de acerto do cache"""
+        consultas = self.metricas['acertos'] + self.metricas['falhas']
+        return {
+            'acertos': self.metricas['acertos'],
+            'falhas': self.metricas['falhas'],
+            'remocoes': self.metricas['remocoes'],
+            'taxa_acerto': self.metricas['acertos'] / consultas if consultas else 0.0,
+            'tamanho': len(self.entradas)
+        }
+
+    def _inserir(self, chave: str, valor: dict):
+        self.entradas[chave] = valor
+        self.entradas.move_to_end(chave)
+        while len(self.entradas) > self.tamanho_maximo:
+            self.entradas.popitem(last=False)
+            self.metricas['remocoes'] += 1
+
+    def _carregar(self):
+        """Carrega as entradas persistidas; em chaves repetidas vale a última linha."""
+        if not os.path.exists(self.arquivo):
+            return
+
+        with open(self.arquivo, encoding='utf-8') as arquivo:
+            for linha in arquivo:
+                self._linhas_arquivo += 1
+                try:
+                    registro = json.loads(linha)
+                    self._inserir(registro['chave'], registro['valor'])
+                except (ValueError, KeyError):
+                    logger.warning("Linha inválida ignorada no arquivo de cache")
+
+        # As remoções da carga não refletem uso real
+        self.metricas['remocoes'] = 0
+        logger.info(f"{len(self.entradas)} entradas carregadas do cache em disco")
+
+    def _persistir(self, chave: str, valor: dict):
+        """Acrescenta a entrada ao arquivo, compactando-o quando cresce demais."""
+        diretorio = os.path.dirname(self.arquivo)
+        if diretorio:
+            os.makedirs(diretorio, exist_ok=True)
+
+        linha = json.dumps({'chave': chave, 'valor': valor}, ensure_ascii=False, default=str) + '\n'
+        with self._bloqueio_arquivo():
+            with open(self.arquivo, 'a', encoding='utf-8') as arquivo:
+                arquivo.write(linha)
+            # Contagem aproximada: só inclui as linhas deste processo desde a carga ou compactação
+            self._linhas_arquivo += 1
+            if self._linhas_arquivo >= 2 * self.tamanho_maximo:
+                self._compactar()
+
+    def _compactar(self):
+        """
+        Reescreve o arquivo com as tamanho_maximo entradas gravadas mais recentemente.
+
+        Parte do próprio arquivo, e não das entradas em memória, para não
+        descartar o que outros processos gravaram. Chamado com o bloqueio.
+        """
+        entradas = OrderedDict()
+        with open(self.arquivo, encoding='utf-8') as arquivo:
+            for linha in arquivo:
+                try:
+                    chave = json.loads(linha)['chave']
+                except (ValueError, KeyError):
+                    continue
+                entradas.pop(chave, None)
+                entradas[chave] = linha
+        while len(entradas) > self.tamanho_maximo:
+            entradas.popitem(last=False)
+
+        temporario = f"{self.arquivo}.{os.getpid()}.tmp"
+        with open(temporario, 'w', encoding='utf-8') as arquivo:
+            arquivo.writelines(entradas.values())
+        os.replace(temporario, self.arquivo)
+        self._linhas_arquivo = len(entradas)
+
+    @contextmanager
+    def _bloqueio_arquivo(self):
+        """Exclusão mútua entre processos que gravam no mesmo arquivo."""
+        if fcntl is None:
+            yield
+            return
+        with open(f"{self.arquivo}.lock", 'a') as trava:
+            fcntl.flock(trava, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(trava, fcntl.LOCK_UN)
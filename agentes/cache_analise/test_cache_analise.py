@@ -0,0 +1,79 @@
+import pytest
+from cache_analise import CacheAnalise
+
+def test_obter_e_armazenar():
+    """Testa acerto e falha do cache"""
+    cache = CacheAnalise(tamanho_maximo=10, versao_modelos='v1')
+    intencoes = {'acao': 'criar_tarefa', 'prioridade': 'alta'}
+    
+    assert cache.obter("Criar tarefa para o João") is None
+    cache.armazenar("Criar tarefa para o João", intencoes)
+    
+    # Textos que diferem só em espaços usam a mesma entrada
+    assert cache.obter("  Criar tarefa   para o João\n") == intencoes
+    
+    metricas = cache.obter_metricas()
+    assert metricas['acertos'] == 1
+    assert metricas['falhas'] == 1
+    assert metricas['taxa_acerto'] == 0.5
+
+def test_versao_modelos_na_chave():
+    """Testa que versões diferentes dos modelos não compartilham entradas"""
+    cache_v1 = CacheAnalise(versao_modelos='v1')
+    cache_v2 = CacheAnalise(versao_modelos='v2')
+    
+    assert cache_v1.chave("Criar tarefa") != cache_v2.chave("Criar tarefa")
+
+def test_versao_dados_na_chave():
+    """Testa que mudanças no dicionário de entidades ou nos limiares invalidam as entradas"""
+    versao = ['entidades-1|0.9']
+    cache = CacheAnalise(versao_modelos='v1', versao_dados=lambda: versao[0])
+    cache.armazenar("Criar tarefa para o projeto Site", {'acao': 'criar_tarefa'})
+    assert cache.obter("Criar tarefa para o projeto Site") is not None
+    
+    versao[0] = 'entidades-2|0.9'
+    assert cache.obter("Criar tarefa para o projeto Site") is None
+    
+    versao[0] = 'entidades-1|0.9'
+    assert cache.obter("Criar tarefa para o projeto Site") is not None
+
+def test_limite_lru():
+    """Testa a remoção da entrada menos usada quando o limite é atingido"""
+    cache = CacheAnalise(tamanho_maximo=2)
+    cache.armazenar("texto a", {'acao': 'a'})
+    cache.armazenar("texto b", {'acao': 'b'})
+    cache.obter("texto a")
+    cache.armazenar("texto c", {'acao': 'c'})
+    
+    assert cache.obter("texto b") is None
+    assert cache.obter("texto a") == {'acao': 'a'}
+    assert cache.obter_metricas()['remocoes'] == 1
+
+def test_persistencia_em_disco(tmp_path):
+    """Testa que as entradas sobrevivem a um novo processo"""
+    arquivo = str(tmp_path / 'cache.jsonl')
+    cache = CacheAnalise(arquivo=arquivo, versao_modelos='v1')
+    cache.armazenar("Criar tarefa", {'acao': 'criar_tarefa'})
+    
+    recarregado = CacheAnalise(arquivo=arquivo, versao_modelos='v1')
+    
+    assert recarregado.obter("Criar tarefa") == {'acao': 'criar_tarefa'}
+
+def test_arquivo_compartilhado_entre_processos(tmp_path):
+    """Testa que a compactação de um processo preserva o que outro gravou no mesmo arquivo"""
+    arquivo = str(tmp_path / 'cache.jsonl')
+    worker_a = CacheAnalise(tamanho_maximo=5, arquivo=arquivo, versao_modelos='v1')
+    worker_b = CacheAnalise(tamanho_maximo=5, arquivo=arquivo, versao_modelos='v1')
+    
+    for numero in range(9):
+        worker_b.armazenar(f"texto b{numero}", {'acao': f"b{numero}"})
+    worker_a.armazenar("texto a", {'acao': 'a'})
+    # Décima linha gravada por B: compacta para as 5 entradas mais recentes do arquivo
+    worker_b.armazenar("texto b9", {'acao': 'b9'})
+    
+    with open(arquivo, encoding='utf-8') as conteudo:
+        assert len(conteudo.readlines()) == 5
+    recarregado = CacheAnalise(tamanho_maximo=5, arquivo=arquivo, versao_modelos='v1')
+    assert recarregado.obter("texto a") == {'acao': 'a'}
+    assert recarregado.obter("texto b9") == {'acao': 'b9'}
+    assert recarregado.obter("texto b0") is None
@@ -0,0 +1 @@
+from .carregador import AgentesSobDemanda
@@ -0,0 +1,130 @@
+import logging
+import threading
+import time
+from collections.abc import Mapping
+from typing import Callable
+
+from agentes.monitoramento import medir, metricas
+
+logger = logging.getLogger(__name__)
+
+AGENTE_PRONTO = metricas.medidor('agente_pronto', 'Agente carregado e pronto para uso (1) ou não (0)', ('agente',))
+
+# Estados de carregamento de cada agente
+PENDENTE = 'pendente'
+CARREGANDO = 'carregando'
+PRONTO = 'pronto'
+ERRO = 'erro'
+
+class AgentesSobDemanda(Mapping):
+    """
+    Dicionário de agentes construídos sob demanda.
+
+    Cada agente é criado na primeira vez em que é acessado; os que
+    carregam modelos pesados podem ser iniciados em segundo plano, em
+    paralelo, com carregar_em_segundo_plano. Um acesso a um agente que
+    ainda está carregando aguarda o fim do carregamento, enquanto os
+    demais agentes já podem ser usados.
+    """
+
+    def __init__(self, fabricas: dict):
+        """
+        Args:
+            fabricas (dict): Nome do agente -> função sem argumentos que o constrói
+        """
+        self.fabricas = dict(fabricas)
+
+        self._instancias = {}
+        self._estados = {nome: PENDENTE for nome in self.fabricas}
+        self._erros = {}
+        self._duracoes = {}
+        self._condicao = threading.Condition()
+        for nome in self.fabricas:
+            AGENTE_PRONTO.rotulos(agente=nome).definir(0)
+
+    def __getitem__(self, nome: str):
+        if nome not in self.fabricas:
+            raise KeyError(nome)
+
+        with self._condicao:
+            self._condicao.wait_for(lambda: self._estados[nome] != CARREGANDO)
+            if self._estados[nome] == PRONTO:
+                return self._instancias[nome]
+            if self._estados[nome] == ERRO:
+                raise RuntimeError(f"Falha ao carregar o agente {nome}") from self._erros[nome]
+            self._estados[nome] = CARREGANDO
+
+        self._construir(nome)
+        return self[nome]
+
+    def __iter__(self):
+        return iter(self.fabricas)
+
+    def __len__(self) -> int:
+        return len(self.fabricas)
+
+    def carregado(self, nome: str) -> bool:
+        """True se o agente já foi construído (não dispara o carregamento)."""
+        return self._estados.get(nome) == PRONTO
+
+    def carregar_em_segundo_plano(self, nomes: list = None):
+        """
+        Inicia, cada um em sua thread, o carregamento dos agentes pendentes.
+
+        Args:
+            nomes (list): Agentes a carregar (padrão: todos)
+        """
+        for nome in nomes if nomes is not None else list(self.fabricas):
+            with self._condicao:
+                if self._estados[nome] != PENDENTE:
+                    continue
+                self._estados[nome] = CARREGANDO
+            threading.Thread(target=self._construir, args=(nome,), name=f"carregar-{nome}", daemon=True).start()
+
+    def aguardar(self, nomes: list = None, timeout: float = None) -> bool:
+        """
+        Aguarda o fim do carregamento dos agentes, iniciando os pendentes.
+
+        Returns:
+            bool: True se todos ficaram prontos; False em caso de erro ou timeout
+        """
+        nomes = list(nomes) if nomes is not None else list(self.fabricas)
+        self.carregar_em_segundo_plano(nomes)
+        with self._condicao:
+            self._condicao.wait_for(lambda: all(self._estados[nome] in (PRONTO, ERRO) for nome in nomes), timeout)
+            return all(self._estados[nome] == PRONTO for nome in nomes)
+
+    def obter_estado(self) -> dict:
+        """Estado, duração do carregamento e erro de cada agente"""
+        with self._condicao:
+            return {
+                nome: {
+                    'estado': self._estados[nome],
+                    'duracao': self._duracoes.get(nome),
+                    'erro': str(self._erros[nome]) if nome in self._erros else None
+                }
+                for nome in self.fabricas
+            }
+
+    def _construir(self, nome: str):
+        logger.info(f"Carregando agente {nome}...")
+        inicio = time.perf_counter()
+        try:
+            with medir(f"inicializacao.{nome}"):
+                instancia = self.fabricas[nome]()
+        except Exception as e:
+            logger.error(f"Erro ao carregar agente {nome}: {str(e)}")
+            with self._condicao:
+                self._erros[nome] = e
+                self._estados[nome] = ERRO
+                self._condicao.notify_all()
+            return
+
+        duracao = time.perf_counter() - inicio
+        with self._condicao:
+            self._instancias[nome] = instancia
+            self._duracoes[nome] = duracao
+            self._estados[nome] = PRONTO
+            self._condicao.notify_all()
+        AGENTE_PRONTO.rotulos(agente=nome).definir(1)
+        logger.info(f"Agente {nome} carregado em {duracao:.2f}s")
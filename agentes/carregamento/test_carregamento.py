@@ -0,0 +1,148 @@
+import os
+import subprocess
+import sys
+import threading
+import time
+import pytest
+from carregamento import AgentesSobDemanda
+
+RAIZ_PROJETO = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Bibliotecas que só podem ser importadas no primeiro uso, não ao importar os agentes
+DEPENDENCIAS_PESADAS = ('torch', 'transformers', 'spacy', 'nltk', 'pandas', 'sklearn', 'onnxruntime', 'aiohttp')
+
+# Orçamento de `import main` (milissegundos); com as dependências pesadas fica na casa dos segundos
+ORCAMENTO_IMPORTACAO_MS = 1000
+
+def tempos_importacao(modulo: str) -> dict:
+    """Executa `python -X importtime -c "import <modulo>"` e retorna o tempo acumulado (ms) de cada módulo"""
+    processo = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f"import {modulo}"],
+        cwd=RAIZ_PROJETO, capture_output=True, text=True, check=True
+    )
+    tempos = {}
+    for linha in processo.stderr.splitlines():
+        if not linha.startswith('import time:') or 'cumulative' in linha:
+            continue
+        _, acumulado, nome = linha[len('import time:'):].split('|')
+        tempos[nome.strip()] = int(acumulado) / 1000
+    return tempos
+
+def test_construcao_sob_demanda():
+    """Testa que cada agente só é construído no primeiro acesso, uma única vez"""
+    construcoes = []
+    def fabrica(nome):
+        def construir():
+            construcoes.append(nome)
+            return {'agente': nome}
+        return construir
+    
+    agentes = AgentesSobDemanda({'leve': fabrica('leve'), 'pesado': fabrica('pesado')})
+    assert construcoes == []
+    assert agentes.obter_estado()['pesado']['estado'] == 'pendente'
+    
+    assert agentes['leve'] == {'agente': 'leve'}
+    assert agentes['leve'] is agentes['leve']
+    assert construcoes == ['leve']
+    assert agentes.carregado('leve') and not agentes.carregado('pesado')
+    assert sorted(agentes) == ['leve', 'pesado']
+
+def test_carregamento_paralelo_em_segundo_plano():
+    """Testa que agentes pesados carregam em paralelo enquanto os leves já podem ser usados"""
+    liberar = threading.Event()
+    def pesado():
+        liberar.wait(5)
+        time.sleep(0.1)
+        return 'pesado'
+    
+    agentes = AgentesSobDemanda({'a': pesado, 'b': pesado, 'leve': lambda: 'leve'})
+    inicio = time.perf_counter()
+    agentes.carregar_em_segundo_plano(['a', 'b'])
+    
+    assert agentes['leve'] == 'leve'
+    assert agentes.obter_estado()['a']['estado'] == 'carregando'
+    
+    liberar.set()
+    assert agentes['a'] == 'pesado'
+    assert agentes.aguardar(timeout=5)
+    # Em série levariam 0.2s
+    assert time.perf_counter() - inicio < 0.19
+    assert agentes.obter_estado()['b']['duracao'] >= 0.1
+
+def test_erro_no_carregamento():
+    """Testa que a falha de um agente é reportada sem afetar os demais"""
+    def falhar():
+        raise OSError("modelo não encontrado")
+    
+    agentes = AgentesSobDemanda({'quebrado': falhar, 'ok': lambda: 1})
+    assert not agentes.aguardar(timeout=5)
+    
+    estado = agentes.obter_estado()
+    assert estado['quebrado'] == {'estado': 'erro', 'duracao': None, 'erro': 'modelo não encontrado'}
+    assert estado['ok']['estado'] == 'pronto'
+    with pytest.raises(RuntimeError):
+        agentes['quebrado']
+    assert agentes['ok'] == 1
+
+@pytest.mark.parametrize('modulo', [
+    'agentes.agente_pre', 'agentes.agente_analista', 'agentes.agente_validador',
+    'agentes.agente_mapeamap', 'agentes.agente_executor', 'agentes.agente_boss', 'main'
+])
+def test_importacao_sem_dependencias_pesadas(modulo):
+    """Testa que importar os agentes não carrega as bibliotecas de NLP, ML e análise"""
+    importados = {nome.split('.')[0] for nome in tempos_importacao(modulo)}
+    assert importados.isdisjoint(DEPENDENCIAS_PESADAS)
+
+def test_orcamento_tempo_importacao():
+    """Testa que `import main` cabe no orçamento de tempo (melhor de 3, para reduzir ruído)"""
+    tempo = min(tempos_importacao('main')['main'] for _ in range(3))
+    assert tempo < ORCAMENTO_IMPORTACAO_MS
+
+def test_sistemas_nao_acumulam_coletores(monkeypatch):
+    """Testa que o coletor de métricas de cada sistema sai do registro ao encerrar ou ao ser coletado"""
+    import gc
+    import weakref
+    from config import Config
+    import main
+    
+    monkeypatch.setattr(Config, 'AGENTES_SEGUNDO_PLANO', [])
+    monkeypatch.setattr(Config, 'METRICAS_PORTA', None)
+    metricas = main.metricas
+    coletores = len(metricas._coletores)
+    
+    sistema = main.SistemaMultiagentes()
+    assert len(metricas._coletores) == coletores + 1
+    sistema.encerrar()
+    assert len(metricas._coletores) == coletores
+    
+    sistema = main.SistemaMultiagentes()
+    referencia = weakref.ref(sistema)
+    del sistema
+    gc.collect()
+    assert referencia() is None
+    assert len(metricas._coletores) == coletores
+
+def test_exportador_spans_unico_por_arquivo(monkeypatch, tmp_path):
+    """Testa que vários sistemas compartilham um exportador de spans, fechado pelo último a encerrar"""
+    from config import Config
+    import main
+    
+    monkeypatch.setattr(Config, 'AGENTES_SEGUNDO_PLANO', [])
+    monkeypatch.setattr(Config, 'METRICAS_PORTA', None)
+    monkeypatch.setattr(Config, 'RASTREAMENTO_ARQUIVO', str(tmp_path / 'spans.jsonl'))
+    exportadores = list(main.rastreador.exportadores)
+    
+    primeiro = main.SistemaMultiagentes()
+    segundo = main.SistemaMultiagentes()
+    novos = [exportador for exportador in main.rastreador.exportadores if exportador not in exportadores]
+    assert len(novos) == 1
+    
+    with main.rastreador.iniciar('transcricao'):
+        pass
+    assert len((tmp_path / 'spans.jsonl').read_text(encoding='utf-8').splitlines()) == 1
+    
+    primeiro.encerrar()
+    assert novos[0] in main.rastreador.exportadores
+    segundo.encerrar()
+    assert main.rastreador.exportadores == exportadores
+    assert novos[0]._arquivo.closed
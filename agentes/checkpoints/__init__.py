@@ -0,0 +1 @@
+from .checkpoints import RegistroCheckpoints
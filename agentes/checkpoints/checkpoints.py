@@ -0,0 +1,127 @@
+import logging
+import os
+import pickle
+import sqlite3
+import threading
+import time
+
+from agentes.monitoramento import metricas
+
+logger = logging.getLogger(__name__)
+
+# Segundos que uma escrita espera outro processo (workers do supervisor) liberar o arquivo (busy_timeout do SQLite)
+ESPERA_BLOQUEIO = 30.0
+
+SALVOS = metricas.contador('checkpoints_salvos', 'Checkpoints de etapa gravados', ('etapa',))
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS checkpoints (
+    transcricao_id TEXT PRIMARY KEY,
+    etapa TEXT NOT NULL,
+    estado BLOB NOT NULL,
+    erro TEXT,
+    atualizado_em REAL NOT NULL
+);
+"""
+
+class RegistroCheckpoints:
+    """
+    Checkpoints das etapas de cada transcrição em disco (SQLite).
+
+    Guarda, por transcrição, a última etapa concluída e o estado
+    acumulado até ela (texto, intenções, validação, payload). Se uma
+    etapa posterior falhar, a transcrição pode ser retomada dali sem
+    refazer limpeza, NER, BERT e consultas de validação. O estado é
+    serializado com pickle, preservando datetime e timedelta da
+    validação; o arquivo é local e de uso exclusivo do sistema.
+    """
+
+    def __init__(self, arquivo: str):
+        """
+        Args:
+            arquivo (str): Arquivo SQLite (o diretório é criado se necessário)
+        """
+        self.arquivo = arquivo
+        diretorio = os.path.dirname(arquivo)
+        if diretorio:
+            os.makedirs(diretorio, exist_ok=True)
+
+        self._conexao = None
+        self._lock = threading.Lock()
+
+    def salvar(self, transcricao_id: str, etapa: str, estado: dict):
+        """Registra `etapa` como a última concluída e o estado acumulado até ela."""
+        dados = pickle.dumps(estado, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            conexao = self._conectar()
+            with conexao:
+                conexao.execute(
+                    "INSERT OR REPLACE INTO checkpoints VALUES (?, ?, ?, NULL, ?)",
+                    (transcricao_id, etapa, dados, time.time())
+                )
+        SALVOS.rotulos(etapa=etapa).inc()
+
+    def registrar_erro(self, transcricao_id: str, erro: str):
+        """Anota o erro que interrompeu a transcrição (o checkpoint é mantido)."""
+        with self._lock:
+            conexao = self._conectar()
+            with conexao:
+                conexao.execute(
+                    "UPDATE checkpoints SET erro = ?, atualizado_em = ? WHERE transcricao_id = ?",
+                    (erro, time.time(), transcricao_id)
+                )
+
+    def obter(self, transcricao_id: str):
+        """
+        Returns:
+            tuple: (etapa, estado) do último checkpoint, ou None se não houver
+        """
+        with self._lock:
+            linha = self._conectar().execute(
+                "SELECT etapa, estado FROM checkpoints WHERE transcricao_id = ?", (transcricao_id,)
+            ).fetchone()
+        if linha is None:
+            return None
+        return linha[0], pickle.loads(linha[1])
+
+    def remover(self, transcricao_id: str):
+        """Apaga o checkpoint de uma transcrição concluída."""
+        with self._lock:
+            conexao = self._conectar()
+            with conexao:
+                conexao.execute("DELETE FROM checkpoints WHERE transcricao_id = ?", (transcricao_id,))
+
+    def pendentes(self) -> list:
+        """
+        Lista as transcrições interrompidas, da mais antiga à mais recente.
+
+        Returns:
+            list: Dicts com transcricao_id, etapa (última concluída), erro e atualizado_em
+        """
+        with self._lock:
+            linhas = self._conectar().execute(
+                "SELECT transcricao_id, etapa, erro, atualizado_em FROM checkpoints ORDER BY atualizado_em"
+            ).fetchall()
+        return [
+            {'transcricao_id': transcricao_id, 'etapa': etapa, 'erro': erro, 'atualizado_em': atualizado_em}
+            for transcricao_id, etapa, erro, atualizado_em in linhas
+        ]
+
+    def fechar(self):
+        with self._lock:
+            if self._conexao is not None:
+                self._conexao.close()
+                self._conexao = None
+
+    def apos_fork(self):
+        """Descarta, sem fechar, a conexão herdada do processo pai (SQLite não a compartilha entre processos)."""
+        self._conexao = None
+        self._lock = threading.Lock()
+
+    def _conectar(self) -> sqlite3.Connection:
+        if self._conexao is None:
+            self._conexao = sqlite3.connect(self.arquivo, timeout=ESPERA_BLOQUEIO, check_same_thread=False)
+            self._conexao.execute("PRAGMA journal_mode=WAL")
+            self._conexao.execute("PRAGMA synchronous=NORMAL")
+            self._conexao.executescript(ESQUEMA)
+        return self._conexao
@@ -0,0 +1,222 @@
+import pytest
+from datetime import datetime, timedelta
+from checkpoints import RegistroCheckpoints
+
+def test_salvar_obter_e_pendentes(tmp_path):
+    """Testa que o último checkpoint de cada transcrição sobrevive a um novo processo"""
+    arquivo = str(tmp_path / 'checkpoints' / 'etapas.sqlite3')
+    registro = RegistroCheckpoints(arquivo)
+    estado = {'texto': 'criar tarefa', 'validacao': {'datas': [datetime(2099, 6, 30)], 'tempo': timedelta(seconds=1)}}
+    
+    registro.salvar('t1', 'analise', {'texto': 'criar tarefa'})
+    registro.salvar('t1', 'validacao', estado)
+    registro.registrar_erro('t1', 'API indisponível')
+    registro.salvar('t2', 'analise', {'texto': 'mover item'})
+    registro.remover('t2')
+    registro.fechar()
+    
+    novo = RegistroCheckpoints(arquivo)
+    assert novo.obter('t1') == ('validacao', estado)
+    assert novo.obter('t2') is None
+    pendentes = novo.pendentes()
+    assert [(p['transcricao_id'], p['etapa'], p['erro']) for p in pendentes] == [('t1', 'validacao', 'API indisponível')]
+
+class AgenteFalso:
+    def __init__(self, chamadas, nome):
+        self.chamadas = chamadas
+        self.nome = nome
+        self.falhar = False
+        self.micro_lotes = None
+    
+    def __getattr__(self, metodo):
+        def chamar(*args):
+            self.chamadas.append(self.nome)
+            if self.falhar:
+                raise ConnectionError("API indisponível")
+            return {
+                'processar_texto': 'criar tarefa joão',
+                'analisar_intencoes': {'acao': 'criar_tarefa'},
+                'validar_intencoes': {'valido': True, 'acao': 'criar_tarefa', 'prioridade': 'alta',
+                                      'entidades_validas': {}, 'metricas': {}},
+                'criar_payload_mutation': {'query': 'mutation { create_item }'},
+                'executar_mutation': {'data': {}},
+                'obter_metricas_operacao': {}
+            }.get(metodo)
+        return chamar
+
+def test_retomar_da_ultima_etapa(tmp_path, monkeypatch):
+    """Testa que, após a falha do executor, a retomada não refaz análise, validação nem mapeamento"""
+    from config import Config
+    from cache_analise import CacheAnalise
+    from carregamento import AgentesSobDemanda
+    import main
+    
+    monkeypatch.setattr(Config, 'CHECKPOINT_ARQUIVO', str(tmp_path / 'etapas.sqlite3'))
+    monkeypatch.setattr(Config, 'AGENTES_SEGUNDO_PLANO', [])
+    chamadas = []
+    agentes = {nome: AgenteFalso(chamadas, nome) for nome in ('pre', 'analista', 'validador', 'mapeamap', 'executor', 'boss')}
+    
+    sistema = main.SistemaMultiagentes()
+    sistema.agentes = AgentesSobDemanda({nome: (lambda agente=agente: agente) for nome, agente in agentes.items()})
+    sistema._cache_analise = CacheAnalise()
+    
+    agentes['executor'].falhar = True
+    resultado = sistema.processar_transcricao("Criar tarefa para o João", transcricao_id='ata-1')
+    assert resultado['sucesso'] is False
+    assert resultado['transcricao_id'] == 'ata-1'
+    assert sistema.checkpoints.pendentes()[0]['etapa'] == 'mapeamento'
+    
+    chamadas.clear()
+    agentes['executor'].falhar = False
+    assert [r['sucesso'] for r in sistema.retomar_pendentes()] == [True]
+    assert 'pre' not in chamadas and 'analista' not in chamadas
+    assert 'validador' not in chamadas and 'mapeamap' not in chamadas
+    assert chamadas[0] == 'executor'
+    assert sistema.checkpoints.pendentes() == []
+    
+    with pytest.raises(KeyError):
+        sistema.retomar_transcricao('ata-1')
+
+def test_limite_da_api_mantem_checkpoint(tmp_path, monkeypatch):
+    """Testa que limites da API atingidos em todas as tentativas deixam a transcrição pendente"""
+    import time
+    from config import Config
+    from cache_analise import CacheAnalise
+    from carregamento import AgentesSobDemanda
+    from agente_executor import AgenteExecutor
+    import main
+    
+    monkeypatch.setattr(Config, 'CHECKPOINT_ARQUIVO', str(tmp_path / 'etapas.sqlite3'))
+    monkeypatch.setattr(Config, 'AGENTES_SEGUNDO_PLANO', [])
+    monkeypatch.setattr(time, 'sleep', lambda segundos: None)
+    chamadas = []
+    agentes = {nome: AgenteFalso(chamadas, nome) for nome in ('pre', 'analista', 'validador', 'mapeamap', 'boss')}
+    
+    executor = AgenteExecutor()
+    executor.max_retries = 1
+    limitado = [True]
+    enviados = []
+    
+    class Resposta:
+        status_code = 200
+        
+        def json(self):
+            return {'data': {'create_item': {'id': '1'}}}
+    
+    monkeypatch.setattr(executor, '_consultar_limites', lambda: not limitado[0])
+    monkeypatch.setattr(executor, '_enviar', lambda payload: enviados.append(payload) or Resposta())
+    agentes['executor'] = executor
+    
+    sistema = main.SistemaMultiagentes()
+    sistema.agentes = AgentesSobDemanda({nome: (lambda agente=agente: agente) for nome, agente in agentes.items()})
+    sistema._cache_analise = CacheAnalise()
+    
+    resultado = sistema.processar_transcricao("Criar tarefa para o João", transcricao_id='ata-2')
+    assert resultado['sucesso'] is False
+    assert enviados == []
+    pendentes = sistema.checkpoints.pendentes()
+    assert [(p['transcricao_id'], p['etapa']) for p in pendentes] == [('ata-2', 'mapeamento')]
+    assert 'Limite da API' in pendentes[0]['erro']
+    
+    # Ainda limitada: a retomada falha e a transcrição continua pendente
+    assert [r['sucesso'] for r in sistema.retomar_pendentes()] == [False]
+    assert [p['transcricao_id'] for p in sistema.checkpoints.pendentes()] == ['ata-2']
+    
+    limitado[0] = False
+    assert [r['sucesso'] for r in sistema.retomar_pendentes()] == [True]
+    assert len(enviados) == 1
+    assert sistema.checkpoints.pendentes() == []
+
+def test_mutation_incerta_nao_e_reenviada(tmp_path, monkeypatch):
+    """Testa que uma mutation sem resposta conclusiva só é retomada após confirmação"""
+    import time
+    import requests
+    from config import Config
+    from cache_analise import CacheAnalise
+    from carregamento import AgentesSobDemanda
+    import main
+    
+    monkeypatch.setattr(Config, 'CHECKPOINT_ARQUIVO', str(tmp_path / 'etapas.sqlite3'))
+    monkeypatch.setattr(Config, 'AGENTES_SEGUNDO_PLANO', [])
+    monkeypatch.setattr(time, 'sleep', lambda segundos: None)
+    chamadas = []
+    agentes = {nome: AgenteFalso(chamadas, nome) for nome in ('pre', 'analista', 'validador', 'mapeamap', 'boss')}
+    
+    # Mesma classe de exceção que main.py reconhece
+    executor = main.AgenteExecutor()
+    executor.max_retries = 1
+    perdida = [True]
+    enviados = []
+    
+    class Resposta:
+        status_code = 200
+        
+        def json(self):
+            return {'data': {'create_item': {'id': '1'}}}
+    
+    def enviar(payload):
+        # O Monday.com recebe a mutation, mas a resposta não chega
+        enviados.append(payload)
+        if perdida[0]:
+            raise requests.Timeout("Tempo de resposta esgotado")
+        return Resposta()
+    
+    monkeypatch.setattr(executor, '_consultar_limites', lambda: True)
+    monkeypatch.setattr(executor, '_enviar', enviar)
+    agentes['executor'] = executor
+    
+    sistema = main.SistemaMultiagentes()
+    sistema.agentes = AgentesSobDemanda({nome: (lambda agente=agente: agente) for nome, agente in agentes.items()})
+    sistema._cache_analise = CacheAnalise()
+    
+    for transcricao_id in ('ata-3', 'ata-4'):
+        assert sistema.processar_transcricao("Criar tarefa para o João", transcricao_id=transcricao_id)['sucesso'] is False
+    assert len(enviados) == 4
+    
+    # Sem confirmação, nada é reenviado e as transcrições seguem pendentes
+    perdida[0] = False
+    resultados = sistema.retomar_pendentes()
+    assert [(r['sucesso'], r.get('mutation_incerta')) for r in resultados] == [(False, True), (False, True)]
+    assert len(enviados) == 4
+    assert [p['transcricao_id'] for p in sistema.checkpoints.pendentes()] == ['ata-3', 'ata-4']
+    
+    # Item encontrado no board: conclui sem reenviar
+    assert sistema.retomar_transcricao('ata-3', mutation_aplicada=True)['sucesso'] is True
+    assert len(enviados) == 4
+    
+    # Item ausente: reenvio explícito
+    assert sistema.retomar_transcricao('ata-4', reenviar_mutation=True)['sucesso'] is True
+    assert len(enviados) == 5
+    assert sistema.checkpoints.pendentes() == []
+
+def test_queda_durante_mutation_exige_confirmacao(tmp_path, monkeypatch):
+    """Testa que a queda do processo durante a mutation deixa a marca no checkpoint"""
+    from config import Config
+    from cache_analise import CacheAnalise
+    from carregamento import AgentesSobDemanda
+    import main
+    
+    monkeypatch.setattr(Config, 'CHECKPOINT_ARQUIVO', str(tmp_path / 'etapas.sqlite3'))
+    monkeypatch.setattr(Config, 'AGENTES_SEGUNDO_PLANO', [])
+    chamadas = []
+    agentes = {nome: AgenteFalso(chamadas, nome) for nome in ('pre', 'analista', 'validador', 'mapeamap', 'executor', 'boss')}
+    
+    sistema = main.SistemaMultiagentes()
+    sistema.agentes = AgentesSobDemanda({nome: (lambda agente=agente: agente) for nome, agente in agentes.items()})
+    sistema._cache_analise = CacheAnalise()
+    
+    class Queda(BaseException):
+        pass
+    
+    def cair(payload):
+        raise Queda()
+    
+    monkeypatch.setattr(agentes['executor'], 'executar_mutation', cair, raising=False)
+    with pytest.raises(Queda):
+        sistema.processar_transcricao("Criar tarefa para o João", transcricao_id='ata-5')
+    monkeypatch.undo()
+    monkeypatch.setattr(Config, 'CHECKPOINT_ARQUIVO', str(tmp_path / 'etapas.sqlite3'))
+    
+    chamadas.clear()
+    assert sistema.retomar_transcricao('ata-5')['mutation_incerta'] is True
+    assert 'executor' not in chamadas
@@ -0,0 +1 @@
+from .cliente_monday import ClienteMondayAsync
@@ -0,0 +1,75 @@
+import asyncio
+import logging
+from typing import Tuple
+
+from config import Config
+from agentes.monitoramento import medir
+
+logger = logging.getLogger(__name__)
+
+class ClienteMondayAsync:
+    """
+    Cliente HTTP assíncrono da API do Monday.com (aiohttp).
+
+    Mantém uma sessão com pool de conexões por event loop, de modo que
+    centenas de consultas em voo compartilham poucas conexões TCP/TLS.
+    Usado pelas variantes *_async dos agentes. A sessão deve ser fechada
+    com fechar() antes de o loop terminar; sessões de loops já
+    encerrados são descartadas, para não manter esses loops vivos.
+    """
+
+    def __init__(self, headers: dict, limite_conexoes: int = None, timeout: float = None):
+        """
+        Args:
+            headers (dict): Headers das requisições (Authorization, Content-Type)
+            limite_conexoes (int): Conexões simultâneas por sessão (padrão: Config.ASYNC_LIMITE_CONEXOES)
+            timeout (float): Timeout total de cada requisição em segundos (padrão: Config.ASYNC_TIMEOUT)
+        """
+        # Como no requests, headers sem valor (ex.: token não configurado) não são enviados
+        self.headers = {nome: valor for nome, valor in headers.items() if valor is not None}
+        self.limite_conexoes = limite_conexoes or Config.ASYNC_LIMITE_CONEXOES
+        self.timeout = timeout or Config.ASYNC_TIMEOUT
+        self._sessoes = {}
+
+    async def post(self, payload: dict, nome_medicao: str) -> Tuple[int, dict]:
+        """
+        Envia uma query/mutation GraphQL.
+
+        Args:
+            payload (dict): Corpo JSON com query e variáveis
+            nome_medicao (str): Nome do histograma/span (ex.: 'monday.users')
+
+        Returns:
+            tuple: Status HTTP e corpo JSON (None se a resposta não for JSON)
+        """
+        sessao = self._sessao()
+        with medir(nome_medicao):
+            async with sessao.post(Config.MONDAY_API_URL, json=payload) as resposta:
+                try:
+                    dados = await resposta.json(content_type=None)
+                except ValueError:
+                    dados = None
+                return resposta.status, dados
+
+    async def fechar(self):
+        """Fecha a sessão do event loop atual."""
+        sessao = self._sessoes.pop(asyncio.get_running_loop(), None)
+        if sessao is not None:
+            await sessao.close()
+
+    def _sessao(self):
+        import aiohttp
+
+        loop = asyncio.get_running_loop()
+        # A sessão referencia o próprio loop, então a limpeza não pode depender do coletor
+        for encerrado in [outro for outro in self._sessoes if outro.is_closed()]:
+            del self._sessoes[encerrado]
+        sessao = self._sessoes.get(loop)
+        if sessao is None or sessao.closed:
+            sessao = aiohttp.ClientSession(
+                headers=self.headers,
+                connector=aiohttp.TCPConnector(limit=self.limite_conexoes),
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+            self._sessoes[loop] = sessao
+        return sessao
@@ -0,0 +1,106 @@
+import asyncio
+import time
+from aiohttp import web
+from config import Config
+from cliente_monday import ClienteMondayAsync
+
+async def iniciar_api_falsa(atraso: float):
+    """Servidor local que responde às consultas GraphQL após `atraso` segundos"""
+    async def graphql(request):
+        corpo = await request.json()
+        await asyncio.sleep(atraso)
+        nome = corpo.get('variables', {}).get('name')
+        if 'users' in corpo['query']:
+            usuarios = [{'id': 1, 'name': nome}] if nome != 'Ninguém' else []
+            return web.json_response({'data': {'users': usuarios}, 'auth': request.headers.get('Authorization')})
+        return web.json_response({'data': {'boards': [{'id': 10, 'name': nome}]}})
+    
+    app = web.Application()
+    app.router.add_post('/v2', graphql)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    porta = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{porta}/v2"
+
+def test_consultas_concorrentes(monkeypatch):
+    """Testa que várias consultas em voo compartilham a sessão e não se serializam"""
+    async def cenario():
+        runner, url = await iniciar_api_falsa(atraso=0.1)
+        monkeypatch.setattr(Config, 'MONDAY_API_URL', url)
+        cliente = ClienteMondayAsync({'Authorization': 'token-teste'})
+        try:
+            inicio = time.perf_counter()
+            respostas = await asyncio.gather(*(
+                cliente.post({'query': 'query { users }', 'variables': {'name': f'Pessoa {i}'}}, 'monday.users')
+                for i in range(50)
+            ))
+            duracao = time.perf_counter() - inicio
+        finally:
+            await cliente.fechar()
+            await runner.cleanup()
+        return respostas, duracao
+    
+    respostas, duracao = asyncio.run(cenario())
+    assert all(status == 200 for status, _ in respostas)
+    assert respostas[7][1]['data']['users'][0]['name'] == 'Pessoa 7'
+    assert respostas[0][1]['auth'] == 'token-teste'
+    # Em sequência seriam 5s
+    assert duracao < 1.0
+
+def test_sessoes_nao_prendem_loops():
+    """Testa que o cliente não mantém vivos os event loops já encerrados"""
+    cliente = ClienteMondayAsync({'Authorization': 'token-teste'})
+    
+    async def cenario():
+        await cliente._sessao().close()
+    
+    for _ in range(3):
+        asyncio.run(cenario())
+    assert len(cliente._sessoes) == 1
+    
+    async def fechar():
+        cliente._sessao()
+        await cliente.fechar()
+    
+    asyncio.run(fechar())
+    assert len(cliente._sessoes) == 0
+
+def test_lote_async_fecha_sessoes(monkeypatch):
+    """Testa que processar_lote_async fecha as sessões HTTP dos agentes ao terminar"""
+    from carregamento import AgentesSobDemanda
+    import main
+    
+    monkeypatch.setattr(Config, 'AGENTES_SEGUNDO_PLANO', [])
+    monkeypatch.setattr(Config, 'METRICAS_PORTA', None)
+    
+    class ExecutorFalso:
+        def __init__(self):
+            self.cliente_async = ClienteMondayAsync({'Authorization': 'token-teste'})
+    
+    executor = ExecutorFalso()
+    sistema = main.SistemaMultiagentes()
+    sistema.agentes = AgentesSobDemanda({'executor': lambda: executor})
+    sessoes = []
+    
+    async def processar_transcricao_async(texto):
+        cliente = sistema.agentes['executor'].cliente_async
+        status, _ = await cliente.post({'query': 'query { users }', 'variables': {'name': texto}}, 'monday.users')
+        sessoes.append(cliente._sessao())
+        return {'sucesso': status == 200}
+    
+    monkeypatch.setattr(sistema, 'processar_transcricao_async', processar_transcricao_async)
+    
+    async def cenario():
+        runner, url = await iniciar_api_falsa(atraso=0.01)
+        monkeypatch.setattr(Config, 'MONDAY_API_URL', url)
+        try:
+            return await sistema.processar_lote_async(['Ana', 'Bruno', 'Carla'])
+        finally:
+            await runner.cleanup()
+    
+    assert [resultado['sucesso'] for resultado in asyncio.run(cenario())] == [True] * 3
+    assert all(sessao.closed for sessao in sessoes)
+    assert len(executor.cliente_async._sessoes) == 0
+    sistema.encerrar()
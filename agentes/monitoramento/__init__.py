@@ -0,0 +1,5 @@
+from .histograma import HistogramaLatencia, RegistroLatencias
+from .metricas import Amostra, Contador, FamiliaMetrica, HistogramaMetrica, Medidor, RegistroMetricas
+from .rastreamento import ColetorMemoria, ExportadorJsonl, Rastreador, Span, span_atual
+from .servidor_metricas import iniciar_servidor_metricas
+from .instrumentacao import coletor_spans, latencias, medir, metricas, rastreador, rastrear
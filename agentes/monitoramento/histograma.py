@@ -0,0 +1,171 @@
+import math
+import threading
+
+class HistogramaLatencia:
+    """
+    Histograma de latências com buckets logarítmicos e memória fixa.
+
+    Cada bucket cobre um intervalo cuja largura é `precisao` (relativa) do
+    seu limite inferior, no estilo HDR: os percentis têm erro relativo
+    limitado a `precisao` em toda a faixa [minimo, maximo]. Histogramas
+    com os mesmos parâmetros podem ser mesclados, inclusive entre processos
+    (ver para_dict/de_dict).
+    """
+
+    def __init__(self, minimo: float = 1e-6, maximo: float = 3600.0, precisao: float = 0.01):
+        """
+        Args:
+            minimo (float): Menor latência distinguível em segundos
+            maximo (float): Maior latência distinguível em segundos
+            precisao (float): Erro relativo máximo dos percentis
+        """
+        self.minimo = minimo
+        self.maximo = maximo
+        self.precisao = precisao
+
+        self._log_base = math.log1p(precisao)
+        self._ultimo = int(math.log(maximo / minimo) / self._log_base)
+        self._contagens = [0] * (self._ultimo + 1)
+        self.contagem = 0
+        self.soma = 0.0
+        self.menor = math.inf
+        self.maior = 0.0
+        self._lock = threading.Lock()
+
+    def registrar(self, valor: float):
+        """Registra uma latência em segundos."""
+        indice = self._indice(valor)
+        with self._lock:
+            self._contagens[indice] += 1
+            self.contagem += 1
+            self.soma += valor
+            if valor < self.menor:
+                self.menor = valor
+            if valor > self.maior:
+                self.maior = valor
+
+    def percentil(self, p: float) -> float:
+        """
+        Retorna o percentil p (0-100) em segundos.
+
+        Args:
+            p (float): Percentil desejado
+
+        Returns:
+            float: Latência estimada (0 se o histograma estiver vazio)
+        """
+        if not self.contagem:
+            return 0.0
+
+        alvo = max(1, math.ceil(p / 100 * self.contagem))
+        acumulado = 0
+        for indice, quantidade in enumerate(self._contagens):
+            acumulado += quantidade
+            if acumulado >= alvo:
+                return min(max(self._valor_bucket(indice), self.menor), self.maior)
+        return self.maior
+
+    def resumo(self) -> dict:
+        """Retorna contagem, média e p50/p90/p99/max em segundos."""
+        return {
+            'contagem': self.contagem,
+            'media': self.soma / self.contagem if self.contagem else 0.0,
+            'p50': self.percentil(50),
+            'p90': self.percentil(90),
+            'p99': self.percentil(99),
+            'max': self.maior
+        }
+
+    def mesclar(self, outro: 'HistogramaLatencia'):
+        """Soma as contagens de outro histograma com os mesmos parâmetros."""
+        if (outro.minimo, outro.maximo, outro.precisao) != (self.minimo, self.maximo, self.precisao):
+            raise ValueError("Só é possível mesclar histogramas com os mesmos parâmetros")
+
+        with self._lock:
+            for indice, quantidade in enumerate(outro._contagens):
+                if quantidade:
+                    self._contagens[indice] += quantidade
+            self.contagem += outro.contagem
+            self.soma += outro.soma
+            self.menor = min(self.menor, outro.menor)
+            self.maior = max(self.maior, outro.maior)
+
+    def para_dict(self) -> dict:
+        """Serializa o histograma (apenas buckets não vazios) para envio entre processos."""
+        return {
+            'minimo': self.minimo,
+            'maximo': self.maximo,
+            'precisao': self.precisao,
+            'contagem': self.contagem,
+            'soma': self.soma,
+            'menor': self.menor if self.contagem else None,
+            'maior': self.maior,
+            'buckets': {indice: quantidade for indice, quantidade in enumerate(self._contagens) if quantidade}
+        }
+
+    @classmethod
+    def de_dict(cls, dados: dict) -> 'HistogramaLatencia':
+        """Reconstrói um histograma serializado com para_dict()."""
+        histograma = cls(dados['minimo'], dados['maximo'], dados['precisao'])
+        for indice, quantidade in dados['buckets'].items():
+            histograma._contagens[int(indice)] = quantidade
+        histograma.contagem = dados['contagem']
+        histograma.soma = dados['soma']
+        histograma.menor = dados['menor'] if dados['menor'] is not None else math.inf
+        histograma.maior = dados['maior']
+        return histograma
+
+    def _indice(self, valor: float) -> int:
+        if valor <= self.minimo:
+            return 0
+        return min(self._ultimo, int(math.log(valor / self.minimo) / self._log_base))
+
+    def _valor_bucket(self, indice: int) -> float:
+        """Ponto médio (geométrico) do bucket."""
+        return self.minimo * math.exp((indice + 0.5) * self._log_base)
+
+class RegistroLatencias:
+    """Conjunto de histogramas nomeados (ex.: 'etapa.analista', 'monday.create_item')."""
+
+    def __init__(self):
+        self._histogramas = {}
+        self._lock = threading.Lock()
+
+    def histograma(self, nome: str) -> HistogramaLatencia:
+        """Retorna o histograma do nome, criando-o se necessário."""
+        histograma = self._histogramas.get(nome)
+        if histograma is None:
+            with self._lock:
+                histograma = self._histogramas.setdefault(nome, HistogramaLatencia())
+        return histograma
+
+    def registrar(self, nome: str, valor: float):
+        """Registra uma latência em segundos no histograma do nome."""
+        self.histograma(nome).registrar(valor)
+
+    def nomes(self) -> list:
+        return sorted(self._histogramas)
+
+    def resumo(self) -> dict:
+        """Retorna o resumo (p50/p90/p99/max) de cada histograma."""
+        return {nome: self._histogramas[nome].resumo() for nome in self.nomes()}
+
+    def para_dict(self) -> dict:
+        """Serializa todos os histogramas para envio entre processos."""
+        return {nome: self._histogramas[nome].para_dict() for nome in self.nomes()}
+
+    def mesclar(self, outro):
+        """
+        Mescla outro registro nos histogramas deste.
+
+        Args:
+            outro: RegistroLatencias ou o dict produzido por para_dict() em outro processo
+        """
+        if isinstance(outro, RegistroLatencias):
+            outro = outro.para_dict()
+        for nome, dados in outro.items():
+            self.histograma(nome).mesclar(HistogramaLatencia.de_dict(dados))
+
+    def limpar(self):
+        with self._lock:
+            self._histogramas = {}
@@ -0,0 +1,64 @@
+import time
+from contextlib import contextmanager
+
+from .histograma import RegistroLatencias
+from .metricas import Amostra, FamiliaMetrica, RegistroMetricas
+from .rastreamento import ColetorMemoria, Rastreador
+
+# Registro de latências do processo (etapas do pipeline e chamadas à API do Monday.com)
+latencias = RegistroLatencias()
+
+# Métricas do processo no formato do Prometheus (ver servidor_metricas)
+metricas = RegistroMetricas()
+
+# Rastreador do processo; os spans recentes ficam no coletor em memória
+coletor_spans = ColetorMemoria()
+rastreador = Rastreador([coletor_spans])
+
+@contextmanager
+def medir(nome: str, **atributos):
+    """
+    Mede a duração do bloco, registra no histograma `nome` e, dentro de um
+    rastreamento ativo, abre um span filho com o mesmo nome.
+
+    Exemplo:
+        with medir('monday.create_item'):
+            requests.post(...)
+    """
+    inicio = time.perf_counter()
+    try:
+        with rastreador.span(nome, **atributos) as span:
+            yield span
+    finally:
+        latencias.registrar(nome, time.perf_counter() - inicio)
+
+@contextmanager
+def rastrear(nome: str, trace_id: str = None, **atributos):
+    """
+    Inicia um rastreamento (span raiz) e mede sua duração como `medir`.
+
+    Exemplo:
+        with rastrear('transcricao') as raiz:
+            ...
+            raiz.trace_id
+    """
+    inicio = time.perf_counter()
+    try:
+        with rastreador.iniciar(nome, trace_id, **atributos) as span:
+            yield span
+    finally:
+        latencias.registrar(nome, time.perf_counter() - inicio)
+
+def _coletar_latencias() -> list:
+    """Expõe os histogramas de latência como um summary do Prometheus por operação."""
+    amostras = []
+    for nome in latencias.nomes():
+        histograma = latencias.histograma(nome)
+        rotulos = {'operacao': nome}
+        for quantil in (0.5, 0.9, 0.99):
+            amostras.append(Amostra('', {**rotulos, 'quantile': str(quantil)}, histograma.percentil(quantil * 100)))
+        amostras.append(Amostra('_sum', rotulos, histograma.soma))
+        amostras.append(Amostra('_count', rotulos, histograma.contagem))
+    return [FamiliaMetrica('latencia_segundos', 'summary', 'Latência das etapas do pipeline e das chamadas à API', amostras)]
+
+metricas.registrar_coletor(_coletar_latencias)
@@ -0,0 +1,285 @@
+import math
+import threading
+import weakref
+from typing import Callable, List, NamedTuple
+
+class Amostra(NamedTuple):
+    sufixo: str
+    rotulos: dict
+    valor: float
+
+class FamiliaMetrica(NamedTuple):
+    nome: str
+    tipo: str
+    ajuda: str
+    amostras: List[Amostra]
+
+class _DonoCelula:
+    """Guardado só no threading.local: é coletado quando a thread termina."""
+    __slots__ = ('__weakref__',)
+
+class _Celulas:
+    """
+    Vetor de acumuladores com uma cópia por thread.
+
+    Cada thread escreve apenas na própria célula, sem lock; a leitura
+    (raspagem) soma a base e as células das threads vivas. O lock só é
+    usado na primeira escrita de cada thread, para registrar a célula, e
+    quando ela termina: a célula é somada à base e descartada, para que
+    threads de curta duração (handlers HTTP, trabalhadores do pipeline)
+    não acumulem células.
+    """
+
+    def __init__(self, tamanho: int):
+        self.tamanho = tamanho
+        self._local = threading.local()
+        self._base = [0.0] * tamanho
+        self._vivas = {}
+        self._lock = threading.Lock()
+
+    def celula(self) -> list:
+        celula = getattr(self._local, 'celula', None)
+        if celula is None:
+            celula = [0.0] * self.tamanho
+            dono = _DonoCelula()
+            with self._lock:
+                self._vivas[id(celula)] = celula
+            # Ao fim da thread, o threading.local libera o dono e a célula é absorvida
+            weakref.finalize(dono, self._absorver, celula)
+            self._local.dono = dono
+            self._local.celula = celula
+        return celula
+
+    def _absorver(self, celula: list):
+        with self._lock:
+            for i, valor in enumerate(celula):
+                self._base[i] += valor
+            del self._vivas[id(celula)]
+
+    def somar(self) -> list:
+        with self._lock:
+            total = list(self._base)
+            for celula in self._vivas.values():
+                for i, valor in enumerate(celula):
+                    total[i] += valor
+        return total
+
+class _Metrica:
+    """Base das métricas com rótulos: cada combinação de valores vira um filho."""
+    tipo = None
+
+    def __init__(self, nome: str, ajuda: str, rotulos: tuple = ()):
+        self.nome = nome
+        self.ajuda = ajuda
+        self.nomes_rotulos = tuple(rotulos)
+        self._filhos = {}
+        self._lock = threading.Lock()
+
+    def rotulos(self, **valores):
+        """Retorna a série com os valores de rótulo informados (criada na primeira vez)."""
+        chave = tuple(str(valores[nome]) for nome in self.nomes_rotulos)
+        filho = self._filhos.get(chave)
+        if filho is None:
+            with self._lock:
+                filho = self._filhos.setdefault(chave, self._criar_filho())
+        return filho
+
+    def _padrao(self):
+        if self.nomes_rotulos:
+            raise ValueError(f"A métrica {self.nome} exige os rótulos {self.nomes_rotulos}")
+        return self.rotulos()
+
+    def coletar(self) -> FamiliaMetrica:
+        amostras = []
+        for chave, filho in sorted(self._filhos.items()):
+            rotulos = dict(zip(self.nomes_rotulos, chave))
+            amostras.extend(filho.amostras(rotulos))
+        return FamiliaMetrica(self.nome, self.tipo, self.ajuda, amostras)
+
+    def _criar_filho(self):
+        raise NotImplementedError
+
+class _SerieContador:
+    def __init__(self):
+        self._celulas = _Celulas(1)
+
+    def inc(self, valor: float = 1.0):
+        self._celulas.celula()[0] += valor
+
+    @property
+    def valor(self) -> float:
+        return self._celulas.somar()[0]
+
+    def amostras(self, rotulos: dict) -> list:
+        return [Amostra('_total', rotulos, self.valor)]
+
+class Contador(_Metrica):
+    """Valor que só cresce (ex.: operações, acertos de cache, retries)."""
+    tipo = 'counter'
+
+    def _criar_filho(self):
+        return _SerieContador()
+
+    def inc(self, valor: float = 1.0):
+        self._padrao().inc(valor)
+
+class _SerieMedidor:
+    def __init__(self):
+        self.valor = 0.0
+        self._lock = threading.Lock()
+
+    def definir(self, valor: float):
+        # Atribuição simples é atômica no CPython
+        self.valor = float(valor)
+
+    def inc(self, valor: float = 1.0):
+        with self._lock:
+            self.valor += valor
+
+    def dec(self, valor: float = 1.0):
+        self.inc(-valor)
+
+    def amostras(self, rotulos: dict) -> list:
+        return [Amostra('', rotulos, self.valor)]
+
+class Medidor(_Metrica):
+    """Valor que sobe e desce (ex.: orçamento restante da API, profundidade de fila)."""
+    tipo = 'gauge'
+
+    def _criar_filho(self):
+        return _SerieMedidor()
+
+    def definir(self, valor: float):
+        self._padrao().definir(valor)
+
+    def inc(self, valor: float = 1.0):
+        self._padrao().inc(valor)
+
+    def dec(self, valor: float = 1.0):
+        self._padrao().dec(valor)
+
+BUCKETS_PADRAO = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+class _SerieHistograma:
+    def __init__(self, buckets: tuple):
+        self.buckets = buckets
+        # Contagem por bucket, +Inf, soma
+        self._celulas = _Celulas(len(buckets) + 2)
+
+    def observar(self, valor: float):
+        celula = self._celulas.celula()
+        indice = len(self.buckets)
+        for i, limite in enumerate(self.buckets):
+            if valor <= limite:
+                indice = i
+                break
+        celula[indice] += 1
+        celula[-1] += valor
+
+    def amostras(self, rotulos: dict) -> list:
+        totais = self._celulas.somar()
+        amostras = []
+        acumulado = 0.0
+        for limite, quantidade in zip(self.buckets + (math.inf,), totais[:-1]):
+            acumulado += quantidade
+            amostras.append(Amostra('_bucket', {**rotulos, 'le': _formatar(limite)}, acumulado))
+        amostras.append(Amostra('_sum', rotulos, totais[-1]))
+        amostras.append(Amostra('_count', rotulos, acumulado))
+        return amostras
+
+class HistogramaMetrica(_Metrica):
+    """Distribuição em buckets fixos, no formato de histograma do Prometheus."""
+    tipo = 'histogram'
+
+    def __init__(self, nome: str, ajuda: str, rotulos: tuple = (), buckets: tuple = BUCKETS_PADRAO):
+        super().__init__(nome, ajuda, rotulos)
+        self.buckets = tuple(sorted(buckets))
+
+    def _criar_filho(self):
+        return _SerieHistograma(self.buckets)
+
+    def observar(self, valor: float):
+        self._padrao().observar(valor)
+
+class RegistroMetricas:
+    """
+    Registro das métricas do processo, exportadas no formato texto do Prometheus.
+
+    Além das métricas atualizadas diretamente pelos agentes, aceita
+    coletores: funções chamadas a cada raspagem que devolvem
+    FamiliaMetrica com valores lidos na hora (tamanho de cache, filas...).
+    """
+
+    def __init__(self, prefixo: str = 'agentes_'):
+        self.prefixo = prefixo
+        self._metricas = {}
+        self._coletores = []
+        self._lock = threading.Lock()
+
+    def contador(self, nome: str, ajuda: str, rotulos: tuple = ()) -> Contador:
+        return self._registrar(Contador, nome, ajuda, rotulos)
+
+    def medidor(self, nome: str, ajuda: str, rotulos: tuple = ()) -> Medidor:
+        return self._registrar(Medidor, nome, ajuda, rotulos)
+
+    def histograma(self, nome: str, ajuda: str, rotulos: tuple = (), buckets: tuple = BUCKETS_PADRAO) -> HistogramaMetrica:
+        return self._registrar(HistogramaMetrica, nome, ajuda, rotulos, buckets=buckets)
+
+    def registrar_coletor(self, coletor: Callable[[], List[FamiliaMetrica]]):
+        """Adiciona uma função que gera famílias de métricas no momento da raspagem."""
+        with self._lock:
+            self._coletores.append(coletor)
+
+    def remover_coletor(self, coletor: Callable):
+        with self._lock:
+            if coletor in self._coletores:
+                self._coletores.remove(coletor)
+
+    def coletar(self) -> List[FamiliaMetrica]:
+        familias = [metrica.coletar() for metrica in list(self._metricas.values())]
+        for coletor in list(self._coletores):
+            familias.extend(coletor())
+        return familias
+
+    def exportar_texto(self) -> str:
+        """Gera a exposição no formato texto do Prometheus (versão 0.0.4)."""
+        linhas = []
+        for familia in self.coletar():
+            nome = self.prefixo + familia.nome
+            linhas.append(f"# HELP {nome} {_escapar_ajuda(familia.ajuda)}")
+            linhas.append(f"# TYPE {nome} {familia.tipo}")
+            for amostra in familia.amostras:
+                linhas.append(f"{nome}{amostra.sufixo}{_formatar_rotulos(amostra.rotulos)} {_formatar(amostra.valor)}")
+        return '\n'.join(linhas) + '\n'
+
+    def _registrar(self, classe, nome: str, ajuda: str, rotulos: tuple, **kwargs):
+        metrica = self._metricas.get(nome)
+        if metrica is None:
+            with self._lock:
+                metrica = self._metricas.get(nome)
+                if metrica is None:
+                    metrica = self._metricas[nome] = classe(nome, ajuda, rotulos, **kwargs)
+        if not isinstance(metrica, classe) or metrica.nomes_rotulos != tuple(rotulos):
+            raise ValueError(f"Métrica {nome} já registrada com outro tipo ou rótulos")
+        return metrica
+
+def _formatar(valor: float) -> str:
+    if valor == math.inf:
+        return '+Inf'
+    if valor == -math.inf:
+        return '-Inf'
+    if math.isnan(valor):
+        return 'NaN'
+    return repr(float(valor))
+
+def _formatar_rotulos(rotulos: dict) -> str:
+    if not rotulos:
+        return ''
+    pares = ','.join(f'{nome}="{_escapar_valor(valor)}"' for nome, valor in rotulos.items())
+    return '{' + pares + '}'
+
+def _escapar_valor(valor) -> str:
+    return str(valor).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+def _escapar_ajuda(texto: str) -> str:
+    return texto.replace('\\', '\\\\').replace('\n', '\\n')
@@ -0,0 +1,158 @@
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+logger = logging.getLogger(__name__)
+
+# Span ativo no contexto atual (thread ou tarefa asyncio)
+_span_atual = ContextVar('span_atual', default=None)
+
+class Span:
+    """Intervalo de tempo nomeado dentro de um rastreamento (uma transcrição)."""
+
+    __slots__ = ('nome', 'trace_id', 'span_id', 'pai_id', 'inicio', 'duracao', 'atributos', 'erro', '_inicio_relogio')
+
+    def __init__(self, nome: str, trace_id: str, pai_id: str = None, atributos: dict = None):
+        self.nome = nome
+        self.trace_id = trace_id
+        self.span_id = uuid.uuid4().hex[:16]
+        self.pai_id = pai_id
+        self.inicio = time.time()
+        self.duracao = None
+        self.atributos = dict(atributos or {})
+        self.erro = None
+        self._inicio_relogio = time.perf_counter()
+
+    def definir(self, chave: str, valor):
+        """Anexa um atributo ao span (ex.: ação detectada, status HTTP)."""
+        self.atributos[chave] = valor
+
+    def finalizar(self, erro: BaseException = None):
+        self.duracao = time.perf_counter() - self._inicio_relogio
+        if erro is not None:
+            self.erro = f"{type(erro).__name__}: {erro}"
+
+    def para_dict(self) -> dict:
+        return {
+            'trace_id': self.trace_id,
+            'span_id': self.span_id,
+            'pai_id': self.pai_id,
+            'nome': self.nome,
+            'inicio': self.inicio,
+            'duracao': self.duracao,
+            'atributos': self.atributos,
+            'erro': self.erro
+        }
+
+class ColetorMemoria:
+    """Guarda os spans finalizados mais recentes em memória."""
+
+    def __init__(self, limite: int = 10000):
+        self.spans = deque(maxlen=limite)
+
+    def exportar(self, span: Span):
+        self.spans.append(span.para_dict())
+
+    def por_trace(self, trace_id: str) -> list:
+        """Retorna os spans de um rastreamento em ordem de início."""
+        return sorted((s for s in list(self.spans) if s['trace_id'] == trace_id), key=lambda s: s['inicio'])
+
+    def limpar(self):
+        self.spans.clear()
+
+class ExportadorJsonl:
+    """Acrescenta cada span finalizado como uma linha JSON em um arquivo local."""
+
+    def __init__(self, caminho: str):
+        diretorio = os.path.dirname(caminho)
+        if diretorio:
+            os.makedirs(diretorio, exist_ok=True)
+        self.caminho = caminho
+        self._arquivo = open(caminho, 'a', encoding='utf-8')
+        self._lock = threading.Lock()
+
+    def exportar(self, span: Span):
+        linha = json.dumps(span.para_dict(), ensure_ascii=False, default=str)
+        with self._lock:
+            self._arquivo.write(linha + '\n')
+            self._arquivo.flush()
+
+    def fechar(self):
+        with self._lock:
+            self._arquivo.close()
+
+class Rastreador:
+    """
+    Cria spans aninhados e os entrega aos exportadores ao finalizar.
+
+    O span ativo é propagado por contextvars: blocos aninhados na mesma
+    thread ou tarefa asyncio viram filhos automaticamente. Fora de um
+    rastreamento iniciado com `iniciar`, `span` não cria nada (custo quase
+    nulo para chamadas avulsas).
+    """
+
+    def __init__(self, exportadores: list = None):
+        self.exportadores = list(exportadores or [])
+
+    def adicionar_exportador(self, exportador):
+        # Lista nova a cada alteração: _exportar pode estar percorrendo a anterior
+        self.exportadores = self.exportadores + [exportador]
+
+    def remover_exportador(self, exportador):
+        self.exportadores = [outro for outro in self.exportadores if outro is not exportador]
+
+    @contextmanager
+    def iniciar(self, nome: str, trace_id: str = None, **atributos):
+        """
+        Inicia um novo rastreamento com um span raiz.
+
+        Args:
+            nome (str): Nome do span raiz (ex.: 'transcricao')
+            trace_id (str): Identificador do rastreamento (gerado se omitido)
+        """
+        span = Span(nome, trace_id or uuid.uuid4().hex, atributos=atributos)
+        with self._ativar(span):
+            yield span
+
+    @contextmanager
+    def span(self, nome: str, **atributos):
+        """Abre um span filho do span ativo; não faz nada fora de um rastreamento."""
+        pai = _span_atual.get()
+        if pai is None:
+            yield None
+            return
+
+        span = Span(nome, pai.trace_id, pai.span_id, atributos)
+        with self._ativar(span):
+            yield span
+
+    @contextmanager
+    def _ativar(self, span: Span):
+        token = _span_atual.set(span)
+        try:
+            yield
+        except BaseException as e:
+            span.finalizar(e)
+            raise
+        else:
+            span.finalizar()
+        finally:
+            _span_atual.reset(token)
+            self._exportar(span)
+
+    def _exportar(self, span: Span):
+        for exportador in self.exportadores:
+            try:
+                exportador.exportar(span)
+            except Exception as e:
+                logger.warning(f"Falha ao exportar span {span.nome}: {str(e)}")
+
+def span_atual() -> Span:
+    """Retorna o span ativo no contexto atual (ou None)."""
+    return _span_atual.get()
@@ -0,0 +1,42 @@
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logger = logging.getLogger(__name__)
+
+TIPO_CONTEUDO = 'text/plain; version=0.0.4; charset=utf-8'
+
+def iniciar_servidor_metricas(registro, porta: int, endereco: str = '127.0.0.1') -> ThreadingHTTPServer:
+    """
+    Expõe o registro de métricas em GET /metrics numa thread em segundo plano.
+
+    Args:
+        registro (RegistroMetricas): Registro a exportar
+        porta (int): Porta local (0 escolhe uma livre)
+        endereco (str): Interface de escuta (padrão: apenas local)
+
+    Returns:
+        ThreadingHTTPServer: Servidor iniciado; use shutdown() para parar
+    """
+    class ManipuladorMetricas(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?')[0] != '/metrics':
+                self.send_error(404)
+                return
+
+            corpo = registro.exportar_texto().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', TIPO_CONTEUDO)
+            self.send_header('Content-Length', str(len(corpo)))
+            self.end_headers()
+            self.wfile.write(corpo)
+
+        def log_message(self, formato, *args):
+            logger.debug(formato % args)
+
+    servidor = ThreadingHTTPServer((endereco, porta), ManipuladorMetricas)
+    servidor.daemon_threads = True
+    threading.Thread(target=servidor.serve_forever, name='servidor-metricas', daemon=True).start()
+
+    logger.info(f"Métricas disponíveis em http://{endereco}:{servidor.server_address[1]}/metrics")
+    return servidor
@@ -0,0 +1,166 @@
+import json
+import random
+import threading
+import urllib.request
+import pytest
+from monitoramento import (
+    ColetorMemoria, ExportadorJsonl, HistogramaLatencia, Rastreador, RegistroLatencias,
+    RegistroMetricas, iniciar_servidor_metricas
+)
+
+def test_percentis_histograma():
+    """Testa os percentis do histograma contra os valores exatos"""
+    gerador = random.Random(0)
+    valores = [gerador.lognormvariate(-3, 1) for _ in range(10000)]
+    histograma = HistogramaLatencia()
+    for valor in valores:
+        histograma.registrar(valor)
+    
+    ordenados = sorted(valores)
+    for p in (50, 90, 99):
+        exato = ordenados[int(p / 100 * len(ordenados)) - 1]
+        assert histograma.percentil(p) == pytest.approx(exato, rel=0.02)
+    
+    resumo = histograma.resumo()
+    assert resumo['contagem'] == len(valores)
+    assert resumo['max'] == max(valores)
+
+def test_mesclar_histogramas_entre_processos():
+    """Testa que mesclar histogramas serializados equivale a um único histograma"""
+    completo = HistogramaLatencia()
+    workers = [RegistroLatencias(), RegistroLatencias()]
+    for i in range(1000):
+        valor = 0.001 * (i + 1)
+        completo.registrar(valor)
+        workers[i % 2].registrar('etapa.analista', valor)
+    
+    agregado = RegistroLatencias()
+    for worker in workers:
+        agregado.mesclar(worker.para_dict())
+    
+    resumo = agregado.resumo()['etapa.analista']
+    esperado = completo.resumo()
+    for chave in ('contagem', 'p50', 'p90', 'p99', 'max'):
+        assert resumo[chave] == esperado[chave]
+    assert resumo['media'] == pytest.approx(esperado['media'])
+
+def test_mesclar_parametros_diferentes():
+    """Testa que histogramas incompatíveis não são mesclados"""
+    with pytest.raises(ValueError):
+        HistogramaLatencia(precisao=0.01).mesclar(HistogramaLatencia(precisao=0.05))
+
+def test_spans_aninhados():
+    """Testa que spans abertos dentro de um rastreamento viram filhos do span ativo"""
+    coletor = ColetorMemoria()
+    rastreador = Rastreador([coletor])
+    
+    with rastreador.iniciar('transcricao') as raiz:
+        with rastreador.span('etapa.validador'):
+            with rastreador.span('monday.users', status=200):
+                pass
+        with pytest.raises(RuntimeError):
+            with rastreador.span('etapa.executor'):
+                raise RuntimeError("API indisponível")
+    
+    spans = {span['nome']: span for span in coletor.por_trace(raiz.trace_id)}
+    assert set(spans) == {'transcricao', 'etapa.validador', 'monday.users', 'etapa.executor'}
+    assert spans['transcricao']['pai_id'] is None
+    assert spans['etapa.validador']['pai_id'] == spans['transcricao']['span_id']
+    assert spans['monday.users']['pai_id'] == spans['etapa.validador']['span_id']
+    assert spans['monday.users']['atributos'] == {'status': 200}
+    assert 'API indisponível' in spans['etapa.executor']['erro']
+    assert spans['transcricao']['duracao'] >= spans['etapa.validador']['duracao']
+
+def test_span_fora_de_rastreamento():
+    """Testa que span() fora de um rastreamento não gera nada"""
+    coletor = ColetorMemoria()
+    rastreador = Rastreador([coletor])
+    with rastreador.span('monday.users') as span:
+        assert span is None
+    assert len(coletor.spans) == 0
+
+def test_exportador_jsonl(tmp_path):
+    """Testa a exportação dos spans em JSON-lines"""
+    caminho = tmp_path / "rastreamento.jsonl"
+    exportador = ExportadorJsonl(str(caminho))
+    rastreador = Rastreador([exportador])
+    with rastreador.iniciar('transcricao', trace_id='abc'):
+        with rastreador.span('etapa.pre'):
+            pass
+    exportador.fechar()
+    
+    linhas = [json.loads(linha) for linha in caminho.read_text(encoding='utf-8').splitlines()]
+    assert [linha['nome'] for linha in linhas] == ['etapa.pre', 'transcricao']
+    assert all(linha['trace_id'] == 'abc' for linha in linhas)
+
+def test_contador_entre_threads():
+    """Testa que incrementos concorrentes (células por thread) não se perdem"""
+    registro = RegistroMetricas()
+    contador = registro.contador('operacoes', 'Operações', ('resultado',))
+    
+    def incrementar():
+        for _ in range(10000):
+            contador.rotulos(resultado='sucesso').inc()
+    
+    threads = [threading.Thread(target=incrementar) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert contador.rotulos(resultado='sucesso').valor == 40000
+    assert registro.contador('operacoes', 'Operações', ('resultado',)) is contador
+    with pytest.raises(ValueError):
+        registro.medidor('operacoes', 'Operações')
+
+def test_celulas_de_threads_encerradas():
+    """Testa que as células de threads que terminaram são somadas à base e descartadas"""
+    registro = RegistroMetricas()
+    contador = registro.contador('requisicoes', 'Requisições')
+    histograma = registro.histograma('duracao', 'Duração', buckets=(0.1, 1.0))
+    
+    def atender():
+        contador.inc()
+        histograma.observar(0.5)
+    
+    for _ in range(500):
+        thread = threading.Thread(target=atender)
+        thread.start()
+        thread.join()
+    
+    assert contador.rotulos().valor == 500
+    assert len(contador.rotulos()._celulas._vivas) <= 1
+    assert len(histograma.rotulos()._celulas._vivas) <= 1
+    assert histograma.rotulos()._celulas.somar()[-1] == 250.0
+
+def test_exportacao_formato_prometheus():
+    """Testa o formato texto de contadores, medidores, histogramas e coletores"""
+    registro = RegistroMetricas()
+    registro.contador('retries', 'Novas tentativas').inc(3)
+    registro.medidor('orcamento', 'Orçamento', ('limite',)).rotulos(limite='minutos').definir(250)
+    histograma = registro.histograma('duracao', 'Duração', buckets=(0.1, 1.0))
+    for valor in (0.05, 0.5, 5.0):
+        histograma.observar(valor)
+    registro.registrar_coletor(lambda: [])
+    
+    texto = registro.exportar_texto()
+    assert '# TYPE agentes_retries counter' in texto
+    assert 'agentes_retries_total 3.0' in texto
+    assert 'agentes_orcamento{limite="minutos"} 250.0' in texto
+    assert 'agentes_duracao_bucket{le="0.1"} 1.0' in texto
+    assert 'agentes_duracao_bucket{le="1.0"} 2.0' in texto
+    assert 'agentes_duracao_bucket{le="+Inf"} 3.0' in texto
+    assert 'agentes_duracao_count 3.0' in texto
+
+def test_servidor_metricas():
+    """Testa o endpoint /metrics"""
+    registro = RegistroMetricas()
+    registro.contador('operacoes', 'Operações').inc()
+    servidor = iniciar_servidor_metricas(registro, 0)
+    try:
+        url = f"http://127.0.0.1:{servidor.server_address[1]}/metrics"
+        with urllib.request.urlopen(url) as resposta:
+            assert resposta.headers['Content-Type'].startswith('text/plain')
+            assert 'agentes_operacoes_total 1.0' in resposta.read().decode('utf-8')
+    finally:
+        servidor.shutdown()
@@ -0,0 +1 @@
+from .pipeline import Concluido, Etapa, PipelineEtapas
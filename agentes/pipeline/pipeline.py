@@ -0,0 +1,184 @@
+import logging
+import queue
+import threading
+from typing import Callable, Iterable, Iterator, NamedTuple
+
+from agentes.monitoramento import metricas
+
+logger = logging.getLogger(__name__)
+
+FILAS = metricas.medidor('fila_profundidade', 'Itens aguardando em filas internas', ('fila',))
+
+# Marca o fim das entradas em cada fila
+_FIM = object()
+
+class Etapa(NamedTuple):
+    """Etapa do pipeline: função aplicada a cada item por `trabalhadores` threads."""
+    nome: str
+    funcao: Callable
+    trabalhadores: int = 1
+
+class Concluido:
+    """Resultado final antecipado: as etapas seguintes repassam o item sem processá-lo."""
+    __slots__ = ('resultado',)
+
+    def __init__(self, resultado):
+        self.resultado = resultado
+
+class _Item:
+    __slots__ = ('indice', 'entrada', 'valor', 'erro')
+
+    def __init__(self, indice: int, entrada):
+        self.indice = indice
+        self.entrada = entrada
+        self.valor = entrada
+        self.erro = None
+
+class PipelineEtapas:
+    """
+    Executa uma sequência de etapas como um pipeline com filas limitadas.
+
+    Cada etapa tem suas próprias threads e uma fila de entrada com
+    `capacidade` itens: enquanto uma etapa de E/S aguarda a API para o
+    item N, a etapa de NLP já processa o item N+1. Quando uma etapa fica
+    para trás, sua fila enche e as anteriores bloqueiam (contrapressão),
+    limitando a memória em uso. Os resultados saem na ordem das entradas.
+    """
+
+    def __init__(self, etapas: list, capacidade: int = 8, tratar_erro: Callable = None):
+        """
+        Args:
+            etapas (list): Etapas na ordem de execução
+            capacidade (int): Tamanho máximo da fila de entrada de cada etapa
+            tratar_erro: Função (erro, entrada) -> resultado para itens que falharam;
+                sem ela, o erro é relançado ao consumir o resultado
+        """
+        if not etapas:
+            raise ValueError("O pipeline precisa de ao menos uma etapa")
+
+        self.etapas = list(etapas)
+        self.capacidade = capacidade
+        self.tratar_erro = tratar_erro
+
+    def processar(self, entradas: Iterable) -> Iterator:
+        """
+        Processa as entradas em fluxo, devolvendo os resultados em ordem.
+
+        Args:
+            entradas (Iterable): Entradas do pipeline (consumidas sob demanda)
+
+        Yields:
+            Resultado de cada entrada, na ordem de entrada
+        """
+        filas = [queue.Queue(self.capacidade) for _ in self.etapas]
+        saida = queue.Queue()
+        parar = threading.Event()
+        threads = []
+
+        for posicao, etapa in enumerate(self.etapas):
+            destino = filas[posicao + 1] if posicao + 1 < len(self.etapas) else saida
+            restantes = [etapa.trabalhadores]
+            lock = threading.Lock()
+            for numero in range(etapa.trabalhadores):
+                thread = threading.Thread(
+                    target=self._trabalhar,
+                    args=(etapa, filas[posicao], destino, restantes, lock, posicao),
+                    name=f"pipeline-{etapa.nome}-{numero}",
+                    daemon=True
+                )
+                thread.start()
+                threads.append(thread)
+
+        alimentador = threading.Thread(
+            target=self._alimentar,
+            args=(entradas, filas[0], saida, parar),
+            name="pipeline-entrada",
+            daemon=True
+        )
+        alimentador.start()
+
+        try:
+            yield from self._ordenar(saida)
+        finally:
+            # Consumidor abandonou o gerador: parar de alimentar e drenar
+            parar.set()
+            alimentador.join()
+            for thread in threads:
+                thread.join()
+
+    def _alimentar(self, entradas: Iterable, primeira: queue.Queue, saida: queue.Queue, parar: threading.Event):
+        total = 0
+        erro = None
+        try:
+            for indice, entrada in enumerate(entradas):
+                if parar.is_set():
+                    break
+                self._colocar(primeira, _Item(indice, entrada), self.etapas[0].nome)
+                total += 1
+        except Exception as e:
+            logger.error(f"Erro ao ler entradas do pipeline: {str(e)}")
+            erro = e
+        finally:
+            for _ in range(self.etapas[0].trabalhadores):
+                primeira.put(_FIM)
+            saida.put((_FIM, total, erro))
+
+    def _trabalhar(self, etapa: Etapa, entrada: queue.Queue, destino: queue.Queue, restantes: list, lock, posicao: int):
+        proxima = self.etapas[posicao + 1] if posicao + 1 < len(self.etapas) else None
+        while True:
+            item = entrada.get()
+            if item is _FIM:
+                break
+            FILAS.rotulos(fila=f"pipeline.{etapa.nome}").definir(entrada.qsize())
+
+            if item.erro is None and not isinstance(item.valor, Concluido):
+                try:
+                    item.valor = etapa.funcao(item.valor)
+                except Exception as e:
+                    logger.error(f"Erro na etapa {etapa.nome}: {str(e)}")
+                    item.erro = e
+
+            if proxima is not None:
+                self._colocar(destino, item, proxima.nome)
+            else:
+                destino.put(item)
+
+        # O último trabalhador da etapa avisa a próxima
+        with lock:
+            restantes[0] -= 1
+            ultimo = restantes[0] == 0
+        if ultimo and proxima is not None:
+            for _ in range(proxima.trabalhadores):
+                destino.put(_FIM)
+
+    def _colocar(self, fila: queue.Queue, item: _Item, nome: str):
+        fila.put(item)
+        FILAS.rotulos(fila=f"pipeline.{nome}").definir(fila.qsize())
+
+    def _ordenar(self, saida: queue.Queue) -> Iterator:
+        pendentes = {}
+        proximo = 0
+        total = None
+        erro_entradas = None
+        while total is None or proximo < total:
+            item = saida.get()
+            if isinstance(item, tuple) and item[0] is _FIM:
+                _, total, erro_entradas = item
+                continue
+
+            pendentes[item.indice] = item
+            while proximo in pendentes:
+                yield self._resultado(pendentes.pop(proximo))
+                proximo += 1
+
+        if erro_entradas is not None:
+            raise erro_entradas
+
+    def _resultado(self, item: _Item):
+        if item.erro is not None:
+            if self.tratar_erro is None:
+                raise item.erro
+            return self.tratar_erro(item.erro, item.entrada)
+        if isinstance(item.valor, Concluido):
+            return item.valor.resultado
+        return item.valor
@@ -0,0 +1,84 @@
+import threading
+import time
+import pytest
+from pipeline import Concluido, Etapa, PipelineEtapas
+
+def test_resultados_em_ordem():
+    """Testa que os resultados saem na ordem das entradas mesmo com várias threads"""
+    def lento(x):
+        time.sleep(0.001 * (x % 3))
+        return x * 2
+    
+    pipeline = PipelineEtapas([Etapa('dobrar', lento, 4), Etapa('somar', lambda x: x + 1, 2)], capacidade=2)
+    assert list(pipeline.processar(range(50))) == [x * 2 + 1 for x in range(50)]
+
+def test_etapas_sobrepostas():
+    """Testa que a etapa de CPU do item N+1 roda enquanto a de E/S do item N aguarda"""
+    def cpu(x):
+        time.sleep(0.02)
+        return x
+    
+    def io(x):
+        time.sleep(0.02)
+        return x
+    
+    pipeline = PipelineEtapas([Etapa('cpu', cpu), Etapa('io', io)])
+    inicio = time.perf_counter()
+    list(pipeline.processar(range(10)))
+    duracao = time.perf_counter() - inicio
+    
+    # Em sequência seriam 0.4s; em pipeline, cerca de 0.22s
+    assert duracao < 0.35
+
+def test_contrapressao():
+    """Testa que uma etapa lenta limita quantos itens entram no pipeline"""
+    liberar = threading.Event()
+    lidos = []
+    
+    def entradas():
+        for i in range(100):
+            lidos.append(i)
+            yield i
+    
+    def bloqueada(x):
+        liberar.wait()
+        return x
+    
+    pipeline = PipelineEtapas([Etapa('rapida', lambda x: x), Etapa('lenta', bloqueada)], capacidade=2)
+    resultados = pipeline.processar(entradas())
+    consumidor = threading.Thread(target=lambda: lidos.append(list(resultados)))
+    consumidor.start()
+    
+    time.sleep(0.1)
+    # Um item em cada thread mais as duas filas cheias, e um aguardando no alimentador
+    assert len(lidos) <= 7
+    
+    liberar.set()
+    consumidor.join()
+    assert lidos[-1] == list(range(100))
+
+def test_erros_e_conclusao_antecipada():
+    """Testa itens que falham ou terminam antes da última etapa"""
+    executados = []
+    
+    def validar(x):
+        if x == 1:
+            raise ValueError("inválido")
+        if x == 2:
+            return Concluido('rejeitado')
+        return x
+    
+    def executar(x):
+        executados.append(x)
+        return f"ok {x}"
+    
+    pipeline = PipelineEtapas(
+        [Etapa('validar', validar), Etapa('executar', executar)],
+        tratar_erro=lambda erro, entrada: f"erro {entrada}: {erro}"
+    )
+    assert list(pipeline.processar(range(4))) == ['ok 0', 'erro 1: inválido', 'rejeitado', 'ok 3']
+    assert sorted(executados) == [0, 3]
+    
+    sem_tratamento = PipelineEtapas([Etapa('validar', validar)])
+    with pytest.raises(ValueError):
+        list(sem_tratamento.processar(range(4)))
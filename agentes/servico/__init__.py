@@ -0,0 +1 @@
+from .servico import FilaCheia, Job, ServicoTranscricoes
@@ -0,0 +1,321 @@
+import json
+import logging
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable
+
+from agentes.agendamento import NIVEIS, FilaPrioridades
+from agentes.monitoramento import metricas
+from agentes.monitoramento.servidor_metricas import TIPO_CONTEUDO
+
+logger = logging.getLogger(__name__)
+
+REQUISICOES = metricas.contador('servico_requisicoes', 'Requisições HTTP recebidas pelo serviço', ('rota', 'status'))
+ESPERA_FILA = metricas.histograma('servico_espera_fila_segundos', 'Tempo das transcrições na fila do serviço')
+
+# Estados de um job
+PENDENTE = 'pendente'
+PROCESSANDO = 'processando'
+CONCLUIDO = 'concluido'
+ERRO = 'erro'
+
+# Estados do serviço
+CARREGANDO = 'carregando'
+PRONTO = 'pronto'
+FALHOU = 'falhou'
+
+class FilaCheia(Exception):
+    """A fila de transcrições atingiu a capacidade máxima."""
+
+class Job:
+    """Transcrição enviada ao serviço e seu resultado."""
+    __slots__ = ('id', 'texto', 'trace_id', 'prioridade', 'status', 'resultado', 'erro', 'criado_em', 'concluido')
+
+    def __init__(self, texto: str, trace_id: str = None, prioridade: str = 'media'):
+        self.id = uuid.uuid4().hex
+        self.texto = texto
+        self.trace_id = trace_id
+        self.prioridade = prioridade
+        self.status = PENDENTE
+        self.resultado = None
+        self.erro = None
+        self.criado_em = time.monotonic()
+        self.concluido = threading.Event()
+
+    def para_dict(self) -> dict:
+        dados = {'job_id': self.id, 'status': self.status, 'prioridade': self.prioridade}
+        if self.status == CONCLUIDO:
+            dados['resultado'] = self.resultado
+        elif self.status == ERRO:
+            dados['erro'] = self.erro
+        return dados
+
+class ServicoTranscricoes:
+    """
+    Serviço HTTP local que mantém os modelos carregados entre requisições.
+
+    O objeto de processamento (ex.: SistemaMultiagentes) é criado uma vez,
+    em segundo plano: /health responde desde o início e /ready só passa a
+    200 quando a inicialização termina. As transcrições entram numa fila
+    por prioridade (FilaPrioridades) atendida por `trabalhadores` threads:
+    as urgentes passam à frente do acúmulo e as cotas reservam threads para
+    elas. Com a fila de uma prioridade cheia, novas requisições dessa
+    prioridade recebem 429 em vez de acumular latência.
+
+    Rotas:
+        POST /transcricoes   processa e responde com o resultado
+        POST /jobs           enfileira e responde 202 com o job_id
+        GET  /jobs/<job_id>  estado e resultado de um job
+        GET  /health         processo no ar
+        GET  /ready          modelos carregados
+        GET  /metrics        métricas no formato do Prometheus
+    """
+
+    def __init__(self, inicializar: Callable[[], object], processar: Callable, trabalhadores: int = 4,
+                 capacidade_fila: int = 64, max_jobs: int = 1000, timeout: float = 60.0,
+                 classificar: Callable[[str], str] = None, cotas: dict = None, envelhecimento: float = 30.0,
+                 slo: dict = None):
+        """
+        Args:
+            inicializar: Cria o objeto de processamento (executado uma vez, em segundo plano)
+            processar: Função (objeto, texto, trace_id) -> dict serializável em JSON
+            trabalhadores (int): Threads que processam a fila
+            capacidade_fila (int): Máximo de transcrições aguardando por prioridade; acima disso, 429
+            max_jobs (int): Jobs concluídos mantidos para consulta em /jobs/<job_id>
+            timeout (float): Espera máxima de POST /transcricoes, em segundos
+            classificar: Função texto -> prioridade, usada quando a requisição não informa uma (padrão: 'media')
+            cotas, envelhecimento, slo: Ver FilaPrioridades
+        """
+        self.inicializar = inicializar
+        self.processar = processar
+        self.classificar = classificar
+        self.trabalhadores = trabalhadores
+        self.max_jobs = max_jobs
+        self.timeout = timeout
+
+        self.objeto = None
+        self.estado = CARREGANDO
+        self.erro_inicializacao = None
+        self.servidor = None
+
+        self.capacidade_fila = capacidade_fila
+        self._fila = FilaPrioridades(capacidade_fila, cotas, envelhecimento, slo, nome='servico')
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+        self._pronto = threading.Event()
+        self._threads = []
+
+    def iniciar(self, porta: int, endereco: str = '127.0.0.1') -> ThreadingHTTPServer:
+        """
+        Abre a porta HTTP e inicia o carregamento e as threads de trabalho.
+
+        Args:
+            porta (int): Porta local (0 escolhe uma livre)
+            endereco (str): Interface de escuta (padrão: apenas local)
+
+        Returns:
+            ThreadingHTTPServer: Servidor em execução (server_address tem a porta)
+        """
+        self.servidor = ThreadingHTTPServer((endereco, porta), _criar_manipulador(self))
+        self.servidor.daemon_threads = True
+
+        alvos = [(self._carregar, 'servico-carregamento'), (self.servidor.serve_forever, 'servico-http')]
+        alvos += [(self._trabalhar, f"servico-trabalhador-{numero}") for numero in range(self.trabalhadores)]
+        for alvo, nome in alvos:
+            thread = threading.Thread(target=alvo, name=nome, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+        logger.info(f"Serviço de transcrições em http://{endereco}:{self.servidor.server_address[1]}")
+        return self.servidor
+
+    def aguardar_pronto(self, timeout: float = None) -> bool:
+        """Bloqueia até o fim da inicialização; retorna True se o serviço ficou pronto."""
+        self._pronto.wait(timeout)
+        return self.estado == PRONTO
+
+    def enfileirar(self, texto: str, trace_id: str = None, prioridade: str = None) -> Job:
+        """
+        Coloca uma transcrição na fila sem bloquear.
+
+        Args:
+            prioridade (str): 'alta', 'media' ou 'baixa' (padrão: obtida com `classificar`)
+
+        Raises:
+            FilaCheia: Se a fila da prioridade estiver na capacidade máxima
+        """
+        if prioridade is None:
+            prioridade = self.classificar(texto) if self.classificar is not None else 'media'
+        job = Job(texto, trace_id, prioridade)
+        with self._lock:
+            try:
+                self._fila.colocar(job, prioridade)
+            except queue.Full:
+                raise FilaCheia(f"Fila '{prioridade}' com {self.capacidade_fila} transcrições aguardando")
+            self._jobs[job.id] = job
+            self._descartar_jobs_antigos()
+        return job
+
+    def obter_job(self, job_id: str) -> Job:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def obter_estado(self) -> dict:
+        """Retorna o estado da inicialização e a ocupação da fila"""
+        return {
+            'estado': self.estado,
+            'erro': self.erro_inicializacao,
+            'fila': self._fila.qsize(),
+            'capacidade_fila': self.capacidade_fila,
+            'prioridades': self._fila.obter_estado(),
+            'jobs': len(self._jobs)
+        }
+
+    def encerrar(self):
+        """Para o servidor HTTP e as threads de trabalho (jobs ainda na fila são descartados)."""
+        if self.servidor is not None:
+            self.servidor.shutdown()
+            self.servidor.server_close()
+        for job in self._fila.fechar():
+            job.status, job.erro = ERRO, "Serviço encerrado"
+            job.concluido.set()
+
+    def _carregar(self):
+        try:
+            inicio = time.perf_counter()
+            self.objeto = self.inicializar()
+            self.estado = PRONTO
+            logger.info(f"Serviço pronto em {time.perf_counter() - inicio:.1f}s")
+        except Exception as e:
+            logger.error(f"Erro ao inicializar o serviço: {str(e)}")
+            self.erro_inicializacao = str(e)
+            self.estado = FALHOU
+        finally:
+            self._pronto.set()
+
+    def _trabalhar(self):
+        self._pronto.wait()
+        while True:
+            retirado = self._fila.retirar()
+            if retirado is None:
+                break
+            job, prioridade = retirado
+            ESPERA_FILA.observar(time.monotonic() - job.criado_em)
+
+            job.status = PROCESSANDO
+            try:
+                if self.estado != PRONTO:
+                    raise RuntimeError(f"Serviço indisponível: {self.erro_inicializacao}")
+                job.resultado = self.processar(self.objeto, job.texto, job.trace_id)
+                job.status = CONCLUIDO
+            except Exception as e:
+                logger.error(f"Erro ao processar job {job.id}: {str(e)}")
+                job.erro = str(e)
+                job.status = ERRO
+            finally:
+                self._fila.concluir(prioridade)
+                job.texto = None
+                job.concluido.set()
+
+    def _descartar_jobs_antigos(self):
+        """Mantém no máximo max_jobs concluídos (chamado com o lock)."""
+        excedentes = len(self._jobs) - self.max_jobs
+        for job_id in list(self._jobs):
+            if excedentes <= 0:
+                break
+            if self._jobs[job_id].concluido.is_set():
+                del self._jobs[job_id]
+                excedentes -= 1
+
+def _criar_manipulador(servico: ServicoTranscricoes):
+    class ManipuladorServico(BaseHTTPRequestHandler):
+        def do_GET(self):
+            caminho = self.path.split('?')[0]
+            if caminho == '/health':
+                self._responder('/health', 200, {'status': 'ok'})
+            elif caminho == '/ready':
+                estado = servico.obter_estado()
+                self._responder('/ready', 200 if estado['estado'] == PRONTO else 503, estado)
+            elif caminho == '/metrics':
+                self._responder_metricas()
+            elif caminho.startswith('/jobs/'):
+                job = servico.obter_job(caminho[len('/jobs/'):])
+                if job is None:
+                    self._responder('/jobs', 404, {'erro': 'Job não encontrado'})
+                else:
+                    self._responder('/jobs', 200, job.para_dict())
+            else:
+                self._responder('desconhecida', 404, {'erro': 'Rota não encontrada'})
+
+        def do_POST(self):
+            rota = self.path.split('?')[0]
+            if rota not in ('/transcricoes', '/jobs'):
+                self._responder('desconhecida', 404, {'erro': 'Rota não encontrada'})
+                return
+
+            corpo = self._ler_corpo()
+            if corpo is None:
+                self._responder(rota, 400, {'erro': "Corpo deve ser JSON com o campo 'texto' (e 'prioridade' opcional: alta, media ou baixa)"})
+                return
+            if servico.estado != PRONTO:
+                self._responder(rota, 503, servico.obter_estado(), {'Retry-After': '5'})
+                return
+
+            try:
+                job = servico.enfileirar(corpo['texto'], corpo.get('trace_id'), corpo.get('prioridade'))
+            except FilaCheia as e:
+                self._responder(rota, 429, {'erro': str(e)}, {'Retry-After': '1'})
+                return
+
+            if rota == '/jobs':
+                self._responder(rota, 202, job.para_dict(), {'Location': f"/jobs/{job.id}"})
+                return
+
+            if not job.concluido.wait(servico.timeout):
+                # Continua na fila; o cliente pode acompanhar pelo job_id
+                self._responder(rota, 504, job.para_dict(), {'Location': f"/jobs/{job.id}"})
+            elif job.status == ERRO:
+                self._responder(rota, 500, job.para_dict())
+            else:
+                self._responder(rota, 200, job.resultado)
+
+        def _ler_corpo(self):
+            try:
+                tamanho = int(self.headers.get('Content-Length', 0))
+                corpo = json.loads(self.rfile.read(tamanho) or b'null')
+            except ValueError:
+                return None
+            if not isinstance(corpo, dict) or not isinstance(corpo.get('texto'), str) or not corpo['texto'].strip():
+                return None
+            if corpo.get('prioridade') not in (None, *NIVEIS):
+                return None
+            return corpo
+
+        def _responder(self, rota: str, status: int, dados, cabecalhos: dict = None):
+            REQUISICOES.rotulos(rota=rota, status=str(status)).inc()
+            corpo = json.dumps(dados, ensure_ascii=False, default=str).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(corpo)))
+            for nome, valor in (cabecalhos or {}).items():
+                self.send_header(nome, valor)
+            self.end_headers()
+            self.wfile.write(corpo)
+
+        def _responder_metricas(self):
+            REQUISICOES.rotulos(rota='/metrics', status='200').inc()
+            corpo = metricas.exportar_texto().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', TIPO_CONTEUDO)
+            self.send_header('Content-Length', str(len(corpo)))
+            self.end_headers()
+            self.wfile.write(corpo)
+
+        def log_message(self, formato, *args):
+            logger.debug(formato % args)
+
+    return ManipuladorServico
@@ -0,0 +1,138 @@
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+import pytest
+from servico import ServicoTranscricoes
+
+def requisitar(servico, metodo, caminho, corpo=None):
+    """Faz uma requisição ao serviço e retorna (status, JSON da resposta)"""
+    url = f"http://127.0.0.1:{servico.servidor.server_address[1]}{caminho}"
+    dados = json.dumps(corpo).encode('utf-8') if corpo is not None else None
+    requisicao = urllib.request.Request(url, data=dados, method=metodo)
+    try:
+        with urllib.request.urlopen(requisicao, timeout=5) as resposta:
+            return resposta.status, json.loads(resposta.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+class SistemaFalso:
+    def __init__(self, liberar=None):
+        self.liberar = liberar
+    
+    def processar(self, texto, trace_id=None):
+        if self.liberar is not None:
+            self.liberar.wait()
+        if texto == 'falhar':
+            raise ValueError("falhou")
+        return {'sucesso': True, 'texto': texto.upper(), 'trace_id': trace_id}
+
+def iniciar(sistema, **opcoes):
+    servico = ServicoTranscricoes(lambda: sistema, lambda s, texto, trace_id: s.processar(texto, trace_id), **opcoes)
+    servico.iniciar(0)
+    return servico
+
+def test_prontidao_apos_carregar():
+    """Testa que /health responde durante o carregamento e /ready só depois dele"""
+    carregado = threading.Event()
+    def inicializar():
+        carregado.wait()
+        return SistemaFalso()
+    
+    servico = ServicoTranscricoes(inicializar, lambda s, texto, trace_id: s.processar(texto))
+    servico.iniciar(0)
+    try:
+        assert requisitar(servico, 'GET', '/health') == (200, {'status': 'ok'})
+        assert requisitar(servico, 'GET', '/ready')[0] == 503
+        assert requisitar(servico, 'POST', '/transcricoes', {'texto': 'oi'})[0] == 503
+        
+        carregado.set()
+        assert servico.aguardar_pronto(5)
+        assert requisitar(servico, 'GET', '/ready')[0] == 200
+    finally:
+        servico.encerrar()
+
+def test_sincrono_e_jobs():
+    """Testa o endpoint síncrono e o fluxo de job assíncrono"""
+    servico = iniciar(SistemaFalso())
+    try:
+        assert servico.aguardar_pronto(5)
+        status, corpo = requisitar(servico, 'POST', '/transcricoes', {'texto': 'criar tarefa', 'trace_id': 't1'})
+        assert status == 200
+        assert corpo == {'sucesso': True, 'texto': 'CRIAR TAREFA', 'trace_id': 't1'}
+        
+        status, corpo = requisitar(servico, 'POST', '/jobs', {'texto': 'mover item'})
+        assert status == 202
+        job_id = corpo['job_id']
+        prazo = time.monotonic() + 5
+        while corpo['status'] != 'concluido' and time.monotonic() < prazo:
+            status, corpo = requisitar(servico, 'GET', f"/jobs/{job_id}")
+        assert corpo['resultado']['texto'] == 'MOVER ITEM'
+        
+        assert requisitar(servico, 'POST', '/transcricoes', {'texto': 'falhar'})[0] == 500
+        assert requisitar(servico, 'POST', '/transcricoes', {'sem_texto': 1})[0] == 400
+        assert requisitar(servico, 'GET', '/jobs/inexistente')[0] == 404
+    finally:
+        servico.encerrar()
+
+def test_fila_cheia_retorna_429():
+    """Testa que, com a fila cheia, novas transcrições são recusadas com 429"""
+    liberar = threading.Event()
+    servico = iniciar(SistemaFalso(liberar), trabalhadores=1, capacidade_fila=2)
+    try:
+        assert servico.aguardar_pronto(5)
+        # Um em processamento e dois na fila
+        respostas = [requisitar(servico, 'POST', '/jobs', {'texto': 't0'})]
+        primeiro = servico.obter_job(respostas[0][1]['job_id'])
+        prazo = time.monotonic() + 5
+        while primeiro.status != 'processando' and time.monotonic() < prazo:
+            time.sleep(0.01)
+        respostas += [requisitar(servico, 'POST', '/jobs', {'texto': f"t{i}"}) for i in (1, 2)]
+        assert [status for status, _ in respostas] == [202, 202, 202]
+        
+        status, corpo = requisitar(servico, 'POST', '/jobs', {'texto': 'excedente'})
+        assert status == 429
+        assert requisitar(servico, 'POST', '/transcricoes', {'texto': 'excedente'})[0] == 429
+        
+        liberar.set()
+        ultimo = servico.obter_job(respostas[-1][1]['job_id'])
+        assert ultimo.concluido.wait(5) and ultimo.status == 'concluido'
+        assert requisitar(servico, 'POST', '/transcricoes', {'texto': 'depois'})[0] == 200
+    finally:
+        servico.encerrar()
+
+def test_urgentes_passam_a_frente():
+    """Testa que transcrições urgentes são atendidas antes do acúmulo de prioridade baixa"""
+    from agendamento import ClassificadorPrioridade
+    
+    liberar = threading.Event()
+    ordem = []
+    
+    class SistemaOrdenado(SistemaFalso):
+        def processar(self, texto, trace_id=None):
+            ordem.append(texto)
+            return super().processar(texto, trace_id)
+    
+    servico = iniciar(SistemaOrdenado(liberar), trabalhadores=1, classificar=ClassificadorPrioridade())
+    try:
+        assert servico.aguardar_pronto(5)
+        primeiro = servico.enfileirar('importação 0', prioridade='baixa')
+        prazo = time.monotonic() + 5
+        while primeiro.status != 'processando' and time.monotonic() < prazo:
+            time.sleep(0.01)
+        
+        for numero in (1, 2):
+            requisitar(servico, 'POST', '/jobs', {'texto': f"importação {numero}", 'prioridade': 'baixa'})
+        status, corpo = requisitar(servico, 'POST', '/jobs', {'texto': 'servidor fora do ar, urgente'})
+        assert status == 202 and corpo['prioridade'] == 'alta'
+        assert requisitar(servico, 'POST', '/jobs', {'texto': 'x', 'prioridade': 'altissima'})[0] == 400
+        
+        liberar.set()
+        assert servico.obter_job(corpo['job_id']).concluido.wait(5)
+        prazo = time.monotonic() + 5
+        while len(ordem) < 4 and time.monotonic() < prazo:
+            time.sleep(0.01)
+        assert ordem == ['importação 0', 'servidor fora do ar, urgente', 'importação 1', 'importação 2']
+    finally:
+        servico.encerrar()
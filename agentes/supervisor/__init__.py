@@ -0,0 +1 @@
+from .supervisor import SupervisorWorkers, WorkerEncerrado
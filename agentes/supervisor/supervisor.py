@@ -0,0 +1,313 @@
+import gc
+import itertools
+import logging
+import multiprocessing
+import os
+import pickle
+import threading
+import traceback
+from collections import deque
+from concurrent.futures import Future
+from multiprocessing.connection import wait
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+# Respostas dos workers para o supervisor
+_CONCLUIDA = 'concluida'
+_FALHOU = 'falhou'
+
+class WorkerEncerrado(RuntimeError):
+    """O worker que processava a tarefa terminou antes de responder."""
+
+class _Worker:
+    __slots__ = ('processo', 'conexao', 'tarefa')
+
+    def __init__(self, processo, conexao):
+        self.processo = processo
+        self.conexao = conexao
+        self.tarefa = None
+
+class SupervisorWorkers:
+    """
+    Pool pré-fork de processos que compartilham os modelos carregados.
+
+    O supervisor executa `inicializar` uma única vez (carregando spaCy,
+    BERT etc.), congela o heap com gc.freeze() e cria os workers com
+    fork: os pesos ficam em páginas compartilhadas copy-on-write, e cada
+    worker adicional custa só a memória que efetivamente escreve.
+
+    Cada worker tem um pipe próprio com o supervisor, que entrega uma
+    tarefa por vez ao próximo worker livre e sabe qual tarefa cada um
+    tem em mãos. Não há fila compartilhada entre os processos, então um
+    worker morto (OOM killer, SIGKILL) não deixa nenhum lock preso para
+    os outros: ele é recriado a partir do supervisor, que ainda tem tudo
+    carregado, e a tarefa que estava com ele falha com WorkerEncerrado.
+
+    Uma única thread do supervisor entrega tarefas, recebe resultados e
+    recria workers. Depois de iniciar(), o processo pai não usa mais o
+    objeto compartilhado, então nenhum lock dele pode estar preso quando
+    a thread faz um novo fork.
+
+    Só funciona em sistemas com fork (Linux/macOS) e com modelos em CPU.
+    """
+
+    def __init__(self, inicializar: Callable[[], object], processar: Callable, trabalhadores: int = 2,
+                 ao_iniciar_worker: Callable = None, intervalo_monitor: float = 0.5):
+        """
+        Args:
+            inicializar: Cria o objeto compartilhado (ex.: SistemaMultiagentes); roda no supervisor
+            processar: Função (objeto, tarefa) -> resultado executada nos workers
+            trabalhadores (int): Número de processos worker
+            ao_iniciar_worker: Função (objeto) executada em cada worker logo após o fork
+                (ex.: recriar threads, que não sobrevivem ao fork)
+            intervalo_monitor (float): Intervalo máximo, em segundos, entre verificações de workers mortos
+        """
+        if 'fork' not in multiprocessing.get_all_start_methods():
+            raise RuntimeError("SupervisorWorkers requer suporte a fork")
+
+        self.inicializar = inicializar
+        self.processar = processar
+        self.trabalhadores = trabalhadores
+        self.ao_iniciar_worker = ao_iniciar_worker
+        self.intervalo_monitor = intervalo_monitor
+
+        self.objeto = None
+        self.reinicios = 0
+        self._contexto = multiprocessing.get_context('fork')
+        self._workers = {}
+        self._fila = deque()
+        self._pendentes = {}
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+        self._encerrando = threading.Event()
+        self._despertar = None
+        self._aviso = None
+        self._thread = None
+
+    def iniciar(self):
+        """Inicializa o objeto compartilhado e cria os workers."""
+        logger.info("Inicializando objeto compartilhado no supervisor...")
+        self.objeto = self.inicializar()
+
+        # Objetos que já existem vão para a geração permanente: o coletor
+        # dos workers não toca seus cabeçalhos, evitando cópias de páginas
+        gc.collect()
+        gc.freeze()
+
+        # Acorda a thread do supervisor quando chega tarefa ou pedido de encerramento
+        self._despertar, self._aviso = self._contexto.Pipe(duplex=False)
+        for indice in range(self.trabalhadores):
+            self._criar_worker(indice)
+
+        self._thread = threading.Thread(target=self._supervisionar, name='supervisor', daemon=True)
+        self._thread.start()
+
+        logger.info(f"{self.trabalhadores} workers iniciados")
+
+    def submeter(self, tarefa) -> Future:
+        """
+        Envia uma tarefa para o próximo worker livre.
+
+        Args:
+            tarefa: Argumento passado a processar(objeto, tarefa); precisa ser serializável
+
+        Returns:
+            Future: Resultado de processar, ou a exceção levantada no worker
+        """
+        if self._thread is None or self._encerrando.is_set():
+            raise RuntimeError("Supervisor não está em execução")
+
+        futuro = Future()
+        identificador = next(self._ids)
+        with self._lock:
+            self._pendentes[identificador] = futuro
+            self._fila.append((identificador, tarefa))
+            self._aviso.send_bytes(b'')
+        return futuro
+
+    def mapear(self, tarefas: list) -> list:
+        """Processa as tarefas nos workers e devolve os resultados na ordem de entrada."""
+        return [futuro.result() for futuro in [self.submeter(tarefa) for tarefa in tarefas]]
+
+    def encerrar(self, timeout: float = 10.0):
+        """Pede aos workers que terminem após as tarefas em fila e aguarda."""
+        if self._thread is None or self._encerrando.is_set():
+            return
+
+        self._encerrando.set()
+        with self._lock:
+            self._aviso.send_bytes(b'')
+        self._thread.join(timeout)
+
+        # Se o prazo acabou antes de a fila esvaziar, os workers restantes são terminados
+        with self._lock:
+            workers = list(self._workers.values())
+            abandonadas = list(self._pendentes.values())
+            self._pendentes.clear()
+            self._fila.clear()
+        for worker in workers:
+            worker.processo.join(timeout)
+            if worker.processo.is_alive():
+                worker.processo.terminate()
+                worker.processo.join()
+        for futuro in abandonadas:
+            futuro.set_exception(WorkerEncerrado("Supervisor encerrado antes de processar a tarefa"))
+
+        gc.unfreeze()
+        logger.info("Workers encerrados")
+
+    def obter_estado(self) -> dict:
+        """Retorna pids, tarefas pendentes, tarefa de cada worker e número de reinícios"""
+        with self._lock:
+            return {
+                'workers': {indice: worker.processo.pid for indice, worker in self._workers.items()},
+                'pendentes': len(self._pendentes),
+                'em_andamento': {
+                    indice: worker.tarefa for indice, worker in self._workers.items() if worker.tarefa is not None
+                },
+                'reinicios': self.reinicios
+            }
+
+    def _criar_worker(self, indice: int):
+        conexao, conexao_worker = self._contexto.Pipe()
+        processo = self._contexto.Process(
+            target=_executar_worker,
+            args=(indice, self.objeto, self.processar, self.ao_iniciar_worker, conexao_worker,
+                  [worker.conexao for worker in self._workers.values()] + [conexao, self._despertar, self._aviso]),
+            name=f"worker-{indice}",
+            daemon=True
+        )
+        processo.start()
+        # Só o worker fica com a ponta dele: se morrer, o pipe fecha
+        conexao_worker.close()
+        with self._lock:
+            self._workers[indice] = _Worker(processo, conexao)
+
+    def _supervisionar(self):
+        """Laço da thread do supervisor: entrega tarefas, recebe resultados e recria workers mortos."""
+        while True:
+            self._distribuir()
+            with self._lock:
+                ociosos = all(worker.tarefa is None for worker in self._workers.values())
+                if self._encerrando.is_set() and not self._fila and ociosos:
+                    break
+                workers = dict(self._workers)
+
+            esperados = [self._despertar]
+            for worker in workers.values():
+                esperados.extend((worker.conexao, worker.processo.sentinel))
+            prontos = set(wait(esperados, self.intervalo_monitor))
+
+            if self._despertar in prontos:
+                while self._despertar.poll():
+                    self._despertar.recv_bytes()
+            for indice, worker in workers.items():
+                if worker.conexao in prontos:
+                    self._receber(indice, worker)
+                if worker.processo.sentinel in prontos or not worker.processo.is_alive():
+                    self._substituir(indice, worker)
+
+        for worker in self._workers.values():
+            try:
+                worker.conexao.send(None)
+            except OSError:
+                pass
+
+    def _distribuir(self):
+        """Entrega as tarefas da fila aos workers livres, uma por worker."""
+        recusadas = []
+        with self._lock:
+            for worker in self._workers.values():
+                if not self._fila:
+                    break
+                if worker.tarefa is not None:
+                    continue
+                identificador, tarefa = self._fila.popleft()
+                try:
+                    worker.conexao.send((identificador, tarefa))
+                    worker.tarefa = identificador
+                except OSError:
+                    # Worker morto ainda não substituído: a tarefa espera o próximo
+                    self._fila.appendleft((identificador, tarefa))
+                except Exception as e:
+                    # Tarefa não serializável
+                    recusadas.append((self._pendentes.pop(identificador, None), e))
+        for futuro, erro in recusadas:
+            if futuro is not None:
+                futuro.set_exception(erro)
+
+    def _receber(self, indice: int, worker: _Worker):
+        try:
+            while worker.conexao.poll():
+                tipo, identificador, conteudo = worker.conexao.recv()
+                with self._lock:
+                    worker.tarefa = None
+                    futuro = self._pendentes.pop(identificador, None)
+                if futuro is None:
+                    continue
+                if tipo == _CONCLUIDA:
+                    futuro.set_result(conteudo)
+                else:
+                    futuro.set_exception(conteudo)
+        except (EOFError, OSError):
+            # Pipe fechado: o worker morreu, o sentinel trata da substituição
+            pass
+
+    def _substituir(self, indice: int, worker: _Worker):
+        """Falha a tarefa que estava com o worker morto e cria outro no lugar."""
+        # Uma resposta enviada antes de morrer ainda vale
+        self._receber(indice, worker)
+        worker.processo.join()
+        worker.conexao.close()
+        logger.error(f"Worker {indice} (pid {worker.processo.pid}) terminou com código {worker.processo.exitcode}; recriando...")
+
+        with self._lock:
+            futuro = self._pendentes.pop(worker.tarefa, None) if worker.tarefa is not None else None
+            del self._workers[indice]
+            recriar = not self._encerrando.is_set() or bool(self._fila)
+        if futuro is not None:
+            futuro.set_exception(WorkerEncerrado(f"Worker {indice} terminou com código {worker.processo.exitcode}"))
+
+        if recriar:
+            self._criar_worker(indice)
+            with self._lock:
+                self.reinicios += 1
+
+def _executar_worker(indice: int, objeto, processar: Callable, ao_iniciar_worker: Callable, conexao, herdadas: list):
+    """Laço de cada worker: recebe tarefas pelo seu pipe até receber None."""
+    # Pontas de pipe do supervisor herdadas no fork não são usadas pelo worker
+    for outra in herdadas:
+        outra.close()
+    if ao_iniciar_worker is not None:
+        ao_iniciar_worker(objeto)
+    logger.info(f"Worker {indice} iniciado (pid {os.getpid()})")
+
+    while True:
+        try:
+            item = conexao.recv()
+        except (EOFError, OSError, KeyboardInterrupt):
+            break
+        if item is None:
+            break
+
+        identificador, tarefa = item
+        try:
+            resposta = (_CONCLUIDA, identificador, processar(objeto, tarefa))
+        except Exception as e:
+            logger.error(f"Erro no worker {indice}: {str(e)}\n{traceback.format_exc()}")
+            resposta = (_FALHOU, identificador, _serializavel(e))
+        try:
+            conexao.send(resposta)
+        except (EOFError, OSError, KeyboardInterrupt):
+            break
+        except Exception as e:
+            conexao.send((_FALHOU, identificador, RuntimeError(f"Resultado não serializável: {e}")))
+
+def _serializavel(erro: Exception) -> Exception:
+    """Garante que a exceção possa voltar ao supervisor pela fila."""
+    try:
+        pickle.dumps(erro)
+        return erro
+    except Exception:
+        return RuntimeError(f"{type(erro).__name__}: {erro}")
@@ -0,0 +1,88 @@
+import os
+import time
+import pytest
+from supervisor import SupervisorWorkers, WorkerEncerrado
+
+class ModeloFalso:
+    """Objeto pesado inicializado uma única vez no supervisor"""
+    def __init__(self):
+        self.pid_inicializacao = os.getpid()
+        self.pesos = list(range(1000))
+
+def processar(modelo, tarefa):
+    if tarefa == 'morrer':
+        os._exit(3)
+    if tarefa == 'erro':
+        raise ValueError("tarefa inválida")
+    return {'pid': os.getpid(), 'pid_inicializacao': modelo.pid_inicializacao, 'resultado': tarefa * 2}
+
+@pytest.fixture
+def supervisor():
+    supervisor = SupervisorWorkers(ModeloFalso, processar, trabalhadores=2, intervalo_monitor=0.05)
+    supervisor.iniciar()
+    yield supervisor
+    supervisor.encerrar()
+
+def test_inicializa_uma_vez_e_distribui(supervisor):
+    """Testa que o objeto é criado no supervisor e as tarefas rodam nos workers"""
+    resultados = supervisor.mapear(list(range(20)))
+    
+    assert [r['resultado'] for r in resultados] == [x * 2 for x in range(20)]
+    assert all(r['pid_inicializacao'] == os.getpid() for r in resultados)
+    assert all(r['pid'] != os.getpid() for r in resultados)
+    assert {r['pid'] for r in resultados} <= set(supervisor.obter_estado()['workers'].values())
+
+def test_erro_na_tarefa(supervisor):
+    """Testa que a exceção do worker chega ao Future sem derrubar o worker"""
+    with pytest.raises(ValueError):
+        supervisor.submeter('erro').result(timeout=5)
+    
+    assert supervisor.submeter(1).result(timeout=5)['resultado'] == 2
+    assert supervisor.obter_estado()['reinicios'] == 0
+
+def test_worker_morto_e_recriado(supervisor):
+    """Testa que um worker que morre é recriado e sua tarefa falha com WorkerEncerrado"""
+    pids_antes = set(supervisor.obter_estado()['workers'].values())
+    
+    with pytest.raises(WorkerEncerrado):
+        supervisor.submeter('morrer').result(timeout=5)
+    
+    assert supervisor.mapear([1, 2, 3])[2]['resultado'] == 6
+    prazo = time.monotonic() + 5
+    while supervisor.obter_estado()['reinicios'] == 0 and time.monotonic() < prazo:
+        time.sleep(0.01)
+    estado = supervisor.obter_estado()
+    assert estado['reinicios'] == 1
+    assert len(estado['workers']) == 2
+    assert set(estado['workers'].values()) != pids_antes
+    assert estado['pendentes'] == 0
+
+def test_worker_ocioso_morto(supervisor):
+    """Testa que matar um worker parado não trava os demais nem deixa tarefas sem resposta"""
+    import signal
+    
+    assert supervisor.mapear([1, 2])[1]['resultado'] == 4
+    estado = supervisor.obter_estado()
+    assert estado['em_andamento'] == {}
+    pid_morto = estado['workers'][0]
+    os.kill(pid_morto, signal.SIGKILL)
+    
+    prazo = time.monotonic() + 5
+    while supervisor.obter_estado()['reinicios'] == 0 and time.monotonic() < prazo:
+        time.sleep(0.01)
+    estado = supervisor.obter_estado()
+    assert estado['reinicios'] == 1
+    
+    # Os workers que sobraram e o recriado seguem atendendo
+    futuros = [supervisor.submeter(numero) for numero in range(10)]
+    assert [futuro.result(timeout=10)['resultado'] for futuro in futuros] == [numero * 2 for numero in range(10)]
+    estado = supervisor.obter_estado()
+    assert pid_morto not in estado['workers'].values()
+    assert estado['pendentes'] == 0
+
+def test_tarefa_nao_serializavel(supervisor):
+    """Testa que uma tarefa que não pode ir ao worker falha sem ocupar o worker"""
+    with pytest.raises(Exception):
+        supervisor.submeter(lambda: None).result(timeout=5)
+    
+    assert supervisor.submeter(3).result(timeout=5)['resultado'] == 6
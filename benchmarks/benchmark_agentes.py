@@ -0,0 +1,249 @@
+"""
+Micro-benchmarks por agente, com linha de base e limite de regressão.
+
+Um benchmark por método, sobre um corpus de transcrições em português de
+tamanhos variados (curta, media, longa):
+
+- pre.processar_texto
+- analista.analisar_intencoes
+- validador.validar_intencoes (API do Monday.com simulada em processo)
+- mapeamap.criar_payload_mutation (API simulada)
+- boss.registrar_operacao
+- boss.analisar_desempenho (histórico com --operacoes-historico operações)
+
+As entradas dos agentes de E/S vêm das entidades anotadas no corpus, e não
+da saída dos modelos, para que cada benchmark meça só o seu agente. Com a
+API simulada, os números medem o custo do próprio agente, sem a rede.
+
+A mediana (p50) de cada benchmark é comparada com a linha de base; o
+script termina com código 1 se algum ficar mais lento que a base além de
+--limite (fração) e de --tolerancia-ms. Benchmarks cujas dependências não
+estão instaladas (spaCy, nltk, PyTorch) aparecem como indisponíveis.
+
+Uso:
+    python benchmarks/benchmark_agentes.py --salvar-base      # grava a linha de base
+    python benchmarks/benchmark_agentes.py [--limite 0.25]    # compara com a base
+    python benchmarks/benchmark_agentes.py --apenas validador boss
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import sys
+import zlib
+from datetime import datetime
+from unittest import mock
+
+import utilitarios
+
+CORPUS_PADRAO = os.path.join(utilitarios.RAIZ_PROJETO, 'dados', 'transcricoes_benchmark.jsonl')
+BASE_PADRAO = os.path.join(utilitarios.RAIZ_PROJETO, 'benchmarks', 'linha_base_agentes.json')
+
+class RespostaSimulada:
+    status_code = 200
+    headers = {}
+
+    def __init__(self, dados: dict):
+        self.dados = dados
+
+    def json(self) -> dict:
+        return self.dados
+
+def api_simulada(usuarios: list):
+    """requests.post substituto que responde às consultas do validador e do mapeamap."""
+    def post(url, json=None, headers=None, **opcoes):
+        query = json['query']
+        nome = (json.get('variables') or {}).get('name') or (json.get('variables') or {}).get('nome')
+        if 'columns' in query:
+            colunas = [{'id': tipo, 'title': tipo, 'type': tipo} for tipo in ('text', 'person', 'date', 'status', 'priority')]
+            return RespostaSimulada({'data': {'boards': [{'columns': colunas}]}})
+        if 'users' in query and nome is None:
+            return RespostaSimulada({'data': {'users': usuarios}})
+        if 'users' in query:
+            encontrados = [usuario for usuario in usuarios if usuario['name'] == nome]
+            return RespostaSimulada({'data': {'users': encontrados}})
+        return RespostaSimulada({'data': {'boards': [{'id': zlib.crc32(nome.encode('utf-8')), 'name': nome}]}})
+    return post
+
+def carregar_corpus(caminho: str) -> list:
+    with open(caminho, encoding='utf-8') as arquivo:
+        return [json.loads(linha) for linha in arquivo if linha.strip()]
+
+def intencoes_do_corpus(registro: dict) -> dict:
+    """Intenções no formato do AgenteAnalista, a partir das entidades anotadas."""
+    return {
+        'entidades_validas': {
+            'pessoas': registro['pessoas'],
+            'projetos': registro['projetos'],
+            'datas': registro['datas']
+        },
+        'acao': registro['acao'],
+        'prioridade': registro['prioridade'],
+        'texto_processado': registro['texto'],
+        'objetivo': registro['texto'][:80]
+    }
+
+def validacao_do_corpus(registro: dict) -> dict:
+    """Resultado de validação no formato do AgenteValidador (ids simulados, datas ISO)."""
+    return {
+        'entidades_validas': {
+            'pessoas': registro['pessoas'],
+            'projetos': registro['projetos'],
+            'datas': [datetime.strptime(data, '%d/%m/%Y').strftime('%Y-%m-%d') for data in registro['datas']],
+            'prioridade': [registro['prioridade']]
+        },
+        'acao': registro['acao'],
+        'prioridade': registro['prioridade'],
+        'objetivo': registro['texto'][:80]
+    }
+
+def medir_por_tamanho(nome: str, funcao, corpus: list, entrada, repeticoes: int) -> list:
+    """Mede `funcao(entrada(registro))` para cada tamanho do corpus, após uma chamada de aquecimento."""
+    linhas = []
+    for tamanho in sorted({registro['tamanho'] for registro in corpus}):
+        entradas = [entrada(registro) for registro in corpus if registro['tamanho'] == tamanho]
+        funcao(entradas[0])
+        latencias = utilitarios.medir_latencias(funcao, entradas, repeticoes)
+        linhas.append({'benchmark': nome, 'tamanho': tamanho, **utilitarios.resumir_latencias(latencias)})
+    return linhas
+
+def bench_pre(corpus: list, repeticoes: int, contexto: dict) -> list:
+    from agentes.agente_pre import AgentePre
+
+    pre = AgentePre()
+    for registro in corpus:
+        contexto.setdefault('processados', {})[registro['id']] = pre.processar_texto(registro['texto'])
+    return medir_por_tamanho('pre.processar_texto', pre.processar_texto, corpus, lambda r: r['texto'], repeticoes)
+
+def bench_analista(corpus: list, repeticoes: int, contexto: dict) -> list:
+    from agentes.agente_analista import AgenteAnalista
+
+    analista = AgenteAnalista()
+    # Sem o AgentePre, o texto bruto faz as vezes do processado
+    processados = contexto.get('processados', {})
+    return medir_por_tamanho('analista.analisar_intencoes', analista.analisar_intencoes, corpus,
+                             lambda r: processados.get(r['id'], r['texto']), repeticoes)
+
+def bench_validador(corpus: list, repeticoes: int, contexto: dict) -> list:
+    from agentes.agente_validador import AgenteValidador
+
+    validador = AgenteValidador()
+    with mock.patch('requests.post', api_simulada(contexto['usuarios'])):
+        return medir_por_tamanho('validador.validar_intencoes', validador.validar_intencoes, corpus,
+                                 intencoes_do_corpus, repeticoes)
+
+def bench_mapeamap(corpus: list, repeticoes: int, contexto: dict) -> list:
+    from agentes.agente_mapeamap import AgenteMapeaMap
+
+    mapeamap = AgenteMapeaMap()
+    with mock.patch('requests.post', api_simulada(contexto['usuarios'])):
+        return medir_por_tamanho('mapeamap.criar_payload_mutation', mapeamap.criar_payload_mutation, corpus,
+                                 validacao_do_corpus, repeticoes)
+
+def bench_boss(corpus: list, repeticoes: int, contexto: dict) -> list:
+    from agentes.agente_boss import AgenteBoss
+
+    operacoes = [
+        {'acao': registro['acao'], 'sucesso': indice % 10 != 0, 'tempo_execucao': 0.5 + len(registro['texto']) / 1000}
+        for indice, registro in enumerate(corpus)
+    ]
+    boss = AgenteBoss()
+    latencias = utilitarios.medir_latencias(boss.registrar_operacao, operacoes, repeticoes * 10)
+    linhas = [{'benchmark': 'boss.registrar_operacao', 'tamanho': '-', **utilitarios.resumir_latencias(latencias)}]
+
+    boss = AgenteBoss()
+    for indice in range(contexto['operacoes_historico']):
+        boss.registrar_operacao(operacoes[indice % len(operacoes)])
+    boss.analisar_desempenho()
+    latencias = utilitarios.medir_latencias(lambda _: boss.analisar_desempenho(), range(repeticoes * 10))
+    linhas.append({'benchmark': 'boss.analisar_desempenho', 'tamanho': '-', **utilitarios.resumir_latencias(latencias)})
+    return linhas
+
+BENCHMARKS = {
+    'pre': bench_pre,
+    'analista': bench_analista,
+    'validador': bench_validador,
+    'mapeamap': bench_mapeamap,
+    'boss': bench_boss
+}
+
+def comparar(linhas: list, base: dict, limite: float, tolerancia_ms: float) -> list:
+    """
+    Anota cada linha com a mediana da base e a variação.
+
+    Returns:
+        list: Linhas que regrediram além do limite
+    """
+    regressoes = []
+    for linha in linhas:
+        referencia = base.get(f"{linha['benchmark']}[{linha['tamanho']}]")
+        if 'p50_ms' not in linha:
+            continue
+        if referencia is None:
+            linha['status'] = 'sem base'
+            continue
+
+        linha['base_p50_ms'] = referencia['p50_ms']
+        linha['variacao_%'] = (linha['p50_ms'] / referencia['p50_ms'] - 1) * 100 if referencia['p50_ms'] else 0.0
+        regrediu = (linha['p50_ms'] > referencia['p50_ms'] * (1 + limite)
+                    and linha['p50_ms'] - referencia['p50_ms'] > tolerancia_ms)
+        linha['status'] = 'REGRESSAO' if regrediu else 'ok'
+        if regrediu:
+            regressoes.append(linha)
+    return regressoes
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--corpus', default=CORPUS_PADRAO)
+    parser.add_argument('--base', default=BASE_PADRAO, help="Arquivo JSON da linha de base")
+    parser.add_argument('--salvar-base', action='store_true', help="Gravar os resultados como nova linha de base")
+    parser.add_argument('--limite', type=float, default=0.25, help="Regressão tolerada no p50 (fração da base)")
+    parser.add_argument('--tolerancia-ms', type=float, default=0.02, help="Diferença mínima, em ms, para acusar regressão")
+    parser.add_argument('--repeticoes', type=int, default=20, help="Vezes que cada entrada é medida")
+    parser.add_argument('--operacoes-historico', type=int, default=100_000)
+    parser.add_argument('--apenas', nargs='+', choices=list(BENCHMARKS), default=list(BENCHMARKS))
+    args = parser.parse_args()
+
+    # O log por chamada dominaria a medição
+    logging.disable(logging.INFO)
+
+    corpus = carregar_corpus(args.corpus)
+    nomes = sorted({pessoa for registro in corpus for pessoa in registro['pessoas']})
+    contexto = {
+        'usuarios': [{'id': indice, 'name': nome, 'email': f"usuario{indice}@exemplo.com"} for indice, nome in enumerate(nomes)],
+        'operacoes_historico': args.operacoes_historico
+    }
+
+    linhas = []
+    for nome in args.apenas:
+        try:
+            linhas.extend(BENCHMARKS[nome](corpus, args.repeticoes, contexto))
+        except ImportError as e:
+            linhas.append({'benchmark': nome, 'tamanho': '-', 'status': f"indisponível ({e.name or e})"})
+
+    if args.salvar_base:
+        with open(args.base, 'w', encoding='utf-8') as arquivo:
+            json.dump({
+                'criado_em': datetime.now().isoformat(timespec='seconds'),
+                'python': platform.python_version(),
+                'maquina': platform.machine(),
+                'resultados': {f"{linha['benchmark']}[{linha['tamanho']}]": linha for linha in linhas if 'p50_ms' in linha}
+            }, arquivo, ensure_ascii=False, indent=2)
+        print(f"Linha de base gravada em {args.base}\n")
+
+    regressoes = []
+    if not args.salvar_base and os.path.exists(args.base):
+        with open(args.base, encoding='utf-8') as arquivo:
+            regressoes = comparar(linhas, json.load(arquivo)['resultados'], args.limite, args.tolerancia_ms)
+    elif not args.salvar_base:
+        print(f"Sem linha de base em {args.base}; use --salvar-base para criá-la\n")
+
+    utilitarios.imprimir_tabela(linhas, ['benchmark', 'tamanho', 'chamadas', 'p50_ms', 'p90_ms', 'base_p50_ms', 'variacao_%', 'status'])
+
+    if regressoes:
+        print(f"\n{len(regressoes)} benchmark(s) acima do limite de {args.limite:.0%} em relação à base")
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
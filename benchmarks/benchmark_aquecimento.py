@@ -0,0 +1,109 @@
+"""
+Benchmark de aquecimento e configuração de threads do AgenteAnalista.
+
+1. Latência da primeira requisição com e sem aquecimento na inicialização.
+2. Vazão agregada de N workers (processos) para cada configuração de
+   threads intra-op, todos classificando ao mesmo tempo.
+
+Uso:
+    python benchmarks/benchmark_aquecimento.py [--workers 1 2 4] [--threads 1 2 0] [--textos 50]
+
+Em --threads, 0 significa deixar o PyTorch escolher (padrão atual).
+"""
+import argparse
+import multiprocessing
+import os
+import time
+
+import utilitarios
+
+def _criar_analista(aquecer: bool, threads_intra: int):
+    from config import Config
+    Config.AQUECER_MODELOS = aquecer
+    Config.TORCH_THREADS_INTRA = threads_intra or None
+    Config.TORCH_THREADS_INTER = 1 if threads_intra else None
+
+    from agentes.agente_analista import AgenteAnalista
+    return AgenteAnalista()
+
+def _primeira_requisicao(aquecer: bool, fila):
+    inicio = time.perf_counter()
+    analista = _criar_analista(aquecer, 0)
+    tempo_inicializacao = time.perf_counter() - inicio
+
+    textos = utilitarios.TEXTOS_EXEMPLO
+    latencias = utilitarios.medir_latencias(analista.classificar, textos[:2])
+    fila.put({
+        'aquecimento': 'sim' if aquecer else 'nao',
+        'inicializacao_s': tempo_inicializacao,
+        'primeira_ms': latencias[0] * 1000,
+        'segunda_ms': latencias[1] * 1000
+    })
+
+def _worker_vazao(threads_intra: int, quantidade: int, barreira, fila):
+    analista = _criar_analista(True, threads_intra)
+    textos = (utilitarios.TEXTOS_EXEMPLO * (quantidade // len(utilitarios.TEXTOS_EXEMPLO) + 1))[:quantidade]
+
+    barreira.wait()
+    inicio = time.perf_counter()
+    for texto in textos:
+        analista.classificar(texto)
+    fila.put((inicio, time.perf_counter()))
+
+def medir_primeira_requisicao(contexto) -> list:
+    resultados = []
+    for aquecer in (False, True):
+        fila = contexto.Queue()
+        processo = contexto.Process(target=_primeira_requisicao, args=(aquecer, fila))
+        processo.start()
+        resultados.append(fila.get())
+        processo.join()
+    return resultados
+
+def medir_vazao(contexto, workers: int, threads_intra: int, quantidade: int) -> dict:
+    barreira = contexto.Barrier(workers)
+    fila = contexto.Queue()
+    processos = [
+        contexto.Process(target=_worker_vazao, args=(threads_intra, quantidade, barreira, fila))
+        for _ in range(workers)
+    ]
+    for processo in processos:
+        processo.start()
+    intervalos = [fila.get() for _ in processos]
+    for processo in processos:
+        processo.join()
+
+    duracao = max(fim for _, fim in intervalos) - min(inicio for inicio, _ in intervalos)
+    return {
+        'workers': workers,
+        'threads_intra': threads_intra or 'padrao',
+        'textos': workers * quantidade,
+        'duracao_s': duracao,
+        'vazao_por_s': workers * quantidade / duracao
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workers', nargs='+', type=int, default=[1, 2, 4])
+    parser.add_argument('--threads', nargs='+', type=int, default=[1, 2, 0])
+    parser.add_argument('--textos', type=int, default=50, help='Textos classificados por worker')
+    args = parser.parse_args()
+
+    contexto = multiprocessing.get_context('spawn')
+
+    print("Latência da primeira requisição")
+    utilitarios.imprimir_tabela(
+        medir_primeira_requisicao(contexto),
+        ['aquecimento', 'inicializacao_s', 'primeira_ms', 'segunda_ms']
+    )
+
+    print(f"\nVazão agregada ({os.cpu_count()} CPUs)")
+    resultados = [
+        medir_vazao(contexto, workers, threads, args.textos)
+        for workers in args.workers
+        for threads in args.threads
+    ]
+    utilitarios.imprimir_tabela(resultados, ['workers', 'threads_intra', 'textos', 'duracao_s', 'vazao_por_s'])
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""
+Benchmark dos backends de inferência do classificador de intenções.
+
+Cada backend roda em um processo separado para que a memória medida seja
+apenas a dele. Reporta latência, vazão, RSS e concordância de rótulos com fp32.
+
+Uso:
+    python benchmarks/benchmark_backends.py [--backends fp32 int8 onnx] [--repeticoes 5]
+"""
+import argparse
+import multiprocessing
+import time
+
+import utilitarios
+
+def _executar_backend(nome: str, textos: list, repeticoes: int, fila):
+    import torch
+    from transformers import BertTokenizer
+    from config import Config
+    from agentes.agente_analista.backends import criar_backend
+
+    # A cabeça de classificação é inicializada aleatoriamente: fixar a semente
+    # para que todos os backends partam dos mesmos pesos
+    torch.manual_seed(0)
+
+    rss_inicial = utilitarios.memoria_rss_mb()
+    inicio = time.perf_counter()
+    tokenizer = BertTokenizer.from_pretrained(Config.BERT_MODEL)
+    backend = criar_backend(nome, tokenizer, torch.device('cpu'))
+    tempo_carga = time.perf_counter() - inicio
+
+    def classificar(texto):
+        inputs = tokenizer(texto, return_tensors="pt", truncation=True, max_length=512)
+        return torch.argmax(backend.logits(inputs), dim=-1).item()
+
+    # Primeira chamada fora da medição
+    classificar(textos[0])
+    latencias = utilitarios.medir_latencias(classificar, textos, repeticoes)
+    rotulos = [classificar(texto) for texto in textos]
+
+    fila.put({
+        'backend': nome,
+        'carga_s': tempo_carga,
+        'rss_mb': utilitarios.memoria_rss_mb() - rss_inicial,
+        'rotulos': rotulos,
+        **utilitarios.resumir_latencias(latencias)
+    })
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--backends', nargs='+', default=['fp32', 'int8', 'onnx'])
+    parser.add_argument('--repeticoes', type=int, default=5)
+    args = parser.parse_args()
+
+    contexto = multiprocessing.get_context('spawn')
+    resultados = []
+    for nome in args.backends:
+        fila = contexto.Queue()
+        processo = contexto.Process(
+            target=_executar_backend,
+            args=(nome, utilitarios.TEXTOS_EXEMPLO, args.repeticoes, fila)
+        )
+        processo.start()
+        resultados.append(fila.get())
+        processo.join()
+
+    # Concordância de rótulos em relação ao fp32 (ou ao primeiro backend)
+    referencia = next((r for r in resultados if r['backend'] == 'fp32'), resultados[0])
+    for resultado in resultados:
+        iguais = sum(a == b for a, b in zip(resultado['rotulos'], referencia['rotulos']))
+        resultado['concordancia'] = iguais / len(referencia['rotulos'])
+
+    utilitarios.imprimir_tabela(
+        resultados,
+        ['backend', 'carga_s', 'rss_mb', 'p50_ms', 'p90_ms', 'p99_ms', 'vazao_por_s', 'concordancia']
+    )
+
+if __name__ == '__main__':
+    main()
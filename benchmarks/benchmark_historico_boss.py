@@ -0,0 +1,71 @@
+"""
+Benchmark do histórico persistente do AgenteBoss.
+
+Gera --dias partições diárias com --por-dia operações cada e mede a
+análise por hora (agregar_por_hora) em janelas de 7 dias e do período
+inteiro, comparando com a abordagem antiga: filtrar por timestamp um
+DataFrame com todo o histórico e agrupar por hora.
+
+Uso:
+    python benchmarks/benchmark_historico_boss.py [--dias 90] [--por-dia 2000]
+"""
+import argparse
+import logging
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import utilitarios
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--dias', type=int, default=90)
+    parser.add_argument('--por-dia', type=int, default=2000)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+
+    from agentes.agente_boss.historico_persistente import HistoricoPersistente
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        historico = HistoricoPersistente(diretorio)
+        fim = datetime.now().replace(microsecond=0)
+        inicio_total = fim - timedelta(days=args.dias)
+        intervalo = timedelta(days=1) / args.por_dia
+
+        inicio = time.perf_counter()
+        for i in range(args.dias * args.por_dia):
+            historico.adicionar(inicio_total + i * intervalo, 'executor', 'criar_tarefa', 'sucesso', 0.5 + (i % 7) * 0.1)
+        tempo_escrita = time.perf_counter() - inicio
+        total = args.dias * args.por_dia
+
+        resultados = []
+        for dias in (7, args.dias):
+            janela = fim - timedelta(days=dias)
+
+            inicio = time.perf_counter()
+            agregados = historico.agregar_por_hora(janela, fim)
+            tempo_particionado = time.perf_counter() - inicio
+
+            # Abordagem antiga: histórico inteiro em um DataFrame, filtro por timestamp
+            df = historico.consultar(inicio_total, fim)
+            inicio = time.perf_counter()
+            recente = df[df['timestamp'] >= janela]
+            esperado = recente.groupby(recente['timestamp'].dt.hour)['agente'].count()
+            tempo_dataframe = time.perf_counter() - inicio
+            assert int(agregados['operacoes'].sum()) == int(esperado.sum())
+
+            resultados.append({
+                'janela_dias': dias,
+                'operacoes_janela': int(esperado.sum()),
+                'particionado_s': tempo_particionado,
+                'dataframe_s': tempo_dataframe
+            })
+
+        historico.fechar()
+
+    print(f"{total} operações gravadas em {tempo_escrita:.1f}s ({total / tempo_escrita:.0f}/s)")
+    utilitarios.imprimir_tabela(resultados, ['janela_dias', 'operacoes_janela', 'particionado_s', 'dataframe_s'])
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""
+Benchmark de inicialização do SistemaMultiagentes (partida a frio).
+
+Cada modo roda em um processo novo, para incluir a importação das
+bibliotecas, e mede a partir do início do processo:
+
+- criar_s: retorno de SistemaMultiagentes()
+- leves_s: AgenteValidador utilizável
+- primeiro_resultado_s: primeira análise (AgentePre + AgenteAnalista) concluída
+- pronto_s: todos os agentes carregados
+
+Modos:
+    sequencial  agentes carregados um após o outro (comportamento antigo)
+    paralelo    AgentePre e AgenteAnalista em segundo plano, em paralelo
+
+Uso:
+    python benchmarks/benchmark_inicializacao.py [--repeticoes 3]
+"""
+import argparse
+import multiprocessing
+import time
+
+import utilitarios
+
+def _medir(modo: str, fila):
+    inicio = time.perf_counter()
+    import logging
+    logging.disable(logging.INFO)
+
+    from config import Config
+    Config.AGENTES_SEGUNDO_PLANO = ['pre', 'analista'] if modo == 'paralelo' else []
+    import main
+
+    marcas = {'modo': modo}
+    sistema = main.SistemaMultiagentes()
+    if modo == 'sequencial':
+        for nome in sistema.agentes:
+            sistema.agentes[nome]
+    marcas['criar_s'] = time.perf_counter() - inicio
+
+    sistema.agentes['validador']
+    marcas['leves_s'] = time.perf_counter() - inicio
+
+    texto = utilitarios.TEXTOS_EXEMPLO[0]
+    sistema.agentes['analista'].analisar_intencoes(sistema.agentes['pre'].processar_texto(texto))
+    marcas['primeiro_resultado_s'] = time.perf_counter() - inicio
+
+    sistema.aguardar_pronto()
+    marcas['pronto_s'] = time.perf_counter() - inicio
+    fila.put(marcas)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeticoes', type=int, default=3)
+    args = parser.parse_args()
+
+    contexto = multiprocessing.get_context('spawn')
+    resultados = []
+    for modo in ('sequencial', 'paralelo'):
+        execucoes = []
+        for _ in range(args.repeticoes):
+            fila = contexto.Queue()
+            processo = contexto.Process(target=_medir, args=(modo, fila))
+            processo.start()
+            execucoes.append(fila.get())
+            processo.join()
+
+        # Mediana de cada marca
+        linha = {'modo': modo}
+        for coluna in ('criar_s', 'leves_s', 'primeiro_resultado_s', 'pronto_s'):
+            linha[coluna] = utilitarios.percentil([execucao[coluna] for execucao in execucoes], 50)
+        resultados.append(linha)
+
+    utilitarios.imprimir_tabela(resultados, ['modo', 'criar_s', 'leves_s', 'primeiro_resultado_s', 'pronto_s'])
+
+if __name__ == '__main__':
+    main()
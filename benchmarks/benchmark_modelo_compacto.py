@@ -0,0 +1,88 @@
+"""
+Compara o modelo compacto de intenções com o BERT atual.
+
+Divide o conjunto rotulado em treino/teste, treina o modelo compacto no
+treino e mede, no teste, acurácia, latência p50/p99 por comando e RSS.
+Cada modelo roda em um processo separado.
+
+Uso:
+    python benchmarks/benchmark_modelo_compacto.py [--dados dados/intencoes_exemplo.jsonl] [--backends compacto fp32 int8]
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import time
+
+import utilitarios
+
+def _avaliar(backend: str, treino: list, teste: list, fila):
+    import numpy as np
+    from agentes.agente_analista.agente_analista import ACOES
+
+    rss_inicial = utilitarios.memoria_rss_mb()
+    inicio = time.perf_counter()
+
+    if backend == 'compacto':
+        from agentes.agente_analista.modelo_compacto import ModeloCompacto
+        modelo = ModeloCompacto(ACOES)
+        modelo.treinar([r['texto'] for r in treino], [r['acao'] for r in treino])
+
+        def classificar(texto):
+            return ACOES[int(np.argmax(modelo.prever_proba([texto])[0]))]
+    else:
+        import torch
+        from transformers import BertTokenizer
+        from config import Config
+        from agentes.agente_analista.backends import criar_backend
+
+        torch.manual_seed(0)
+        tokenizer = BertTokenizer.from_pretrained(Config.BERT_MODEL)
+        modelo = criar_backend(backend, tokenizer, torch.device('cpu'))
+
+        def classificar(texto):
+            inputs = tokenizer(texto, return_tensors="pt", truncation=True, max_length=512)
+            return ACOES[torch.argmax(modelo.logits(inputs), dim=-1).item()]
+
+    tempo_preparo = time.perf_counter() - inicio
+    textos = [r['texto'] for r in teste]
+    classificar(textos[0])
+    latencias = utilitarios.medir_latencias(classificar, textos, repeticoes=5)
+    acertos = sum(classificar(r['texto']) == r['acao'] for r in teste)
+
+    fila.put({
+        'modelo': backend,
+        'preparo_s': tempo_preparo,
+        'acuracia': acertos / len(teste),
+        'rss_mb': utilitarios.memoria_rss_mb() - rss_inicial,
+        **utilitarios.resumir_latencias(latencias)
+    })
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--dados', default=os.path.join(utilitarios.RAIZ_PROJETO, 'dados', 'intencoes_exemplo.jsonl'))
+    parser.add_argument('--backends', nargs='+', default=['compacto', 'fp32', 'int8'])
+    parser.add_argument('--fracao-teste', type=float, default=0.25)
+    args = parser.parse_args()
+
+    from agentes.agente_analista.modelo_compacto import carregar_dados
+
+    registros = [r for r in carregar_dados(args.dados) if 'acao' in r]
+    random.Random(0).shuffle(registros)
+    corte = int(len(registros) * (1 - args.fracao_teste))
+    treino, teste = registros[:corte], registros[corte:]
+    print(f"{len(treino)} exemplos de treino, {len(teste)} de teste\n")
+
+    contexto = multiprocessing.get_context('spawn')
+    resultados = []
+    for backend in args.backends:
+        fila = contexto.Queue()
+        processo = contexto.Process(target=_avaliar, args=(backend, treino, teste, fila))
+        processo.start()
+        resultados.append(fila.get())
+        processo.join()
+
+    utilitarios.imprimir_tabela(resultados, ['modelo', 'preparo_s', 'acuracia', 'p50_ms', 'p99_ms', 'rss_mb'])
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""
+Benchmark do registro de operações do AgenteBoss.
+
+Mede inserções por segundo no histórico colunar até --registros operações
+e o tempo para montar a visão em DataFrame. Para referência, mede também
+a abordagem antiga (pd.concat por operação) com um número menor de
+registros, já que ela é O(n²).
+
+Uso:
+    python benchmarks/benchmark_registro_boss.py [--registros 1000000] [--registros-concat 5000]
+"""
+import argparse
+import logging
+import time
+from datetime import datetime
+
+import utilitarios
+
+def medir_colunar(quantidade: int) -> dict:
+    from agentes.agente_boss import AgenteBoss
+
+    boss = AgenteBoss()
+    resultados = [
+        {'acao': 'criar_tarefa', 'sucesso': True, 'tempo_execucao': 0.8},
+        {'acao': 'mover_tarefa', 'sucesso': False, 'tempo_execucao': 2.1, 'erro': 'Status code: 500'},
+    ]
+
+    inicio = time.perf_counter()
+    for i in range(quantidade):
+        boss.registrar_operacao(resultados[i % 50 == 0])
+    duracao = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    historico = boss.historico
+    tempo_visao = time.perf_counter() - inicio
+    assert len(historico) == quantidade
+
+    return {
+        'estrutura': 'colunar',
+        'registros': quantidade,
+        'insercoes_por_s': quantidade / duracao,
+        'visao_dataframe_s': tempo_visao,
+        'rss_mb': utilitarios.memoria_rss_mb()
+    }
+
+def medir_concat(quantidade: int) -> dict:
+    import pandas as pd
+
+    historico = pd.DataFrame(columns=['timestamp', 'agente', 'acao', 'resultado', 'tempo_execucao', 'erro'])
+    inicio = time.perf_counter()
+    for _ in range(quantidade):
+        registro = {
+            'timestamp': datetime.now(),
+            'agente': 'executor',
+            'acao': 'criar_tarefa',
+            'resultado': 'sucesso',
+            'tempo_execucao': 0.8,
+            'erro': None
+        }
+        historico = pd.concat([historico, pd.DataFrame([registro])], ignore_index=True)
+    duracao = time.perf_counter() - inicio
+
+    return {
+        'estrutura': 'pd.concat',
+        'registros': quantidade,
+        'insercoes_por_s': quantidade / duracao,
+        'visao_dataframe_s': 0.0,
+        'rss_mb': utilitarios.memoria_rss_mb()
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--registros', type=int, default=1_000_000)
+    parser.add_argument('--registros-concat', type=int, default=5000)
+    args = parser.parse_args()
+
+    # O log por operação dominaria a medição
+    logging.disable(logging.INFO)
+
+    resultados = [medir_concat(args.registros_concat), medir_colunar(args.registros)]
+    utilitarios.imprimir_tabela(resultados, ['estrutura', 'registros', 'insercoes_por_s', 'visao_dataframe_s', 'rss_mb'])
+
+if __name__ == '__main__':
+    main()
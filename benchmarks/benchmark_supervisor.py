@@ -0,0 +1,93 @@
+"""
+Benchmark de memória do supervisor pré-fork.
+
+Cria os workers com SupervisorWorkers, processa --tarefas transcrições
+e lê /proc/<pid>/smaps_rollup de cada worker: RSS conta as páginas
+compartilhadas com o supervisor em cada processo, PSS as divide entre
+eles e Private_* é o que o worker efetivamente copiou. Com modelos
+compartilhados, o PSS total fica perto do tamanho de uma única cópia.
+
+Sem --sistema, usa um objeto sintético (array numpy + objetos Python)
+de --mb megabytes no lugar dos modelos, dispensando spaCy e BERT.
+
+Uso:
+    python benchmarks/benchmark_supervisor.py [--workers 4] [--tarefas 200] [--mb 500] [--sistema]
+"""
+import argparse
+import logging
+import os
+import time
+
+import utilitarios
+
+class ModelosSinteticos:
+    """Ocupa memória como modelos carregados: um tensor de pesos e muitos objetos pequenos."""
+
+    def __init__(self, mb: int):
+        import numpy as np
+        self.pesos = np.random.rand(mb * 1024 * 1024 // 16)  # metade em float64
+        self.vocabulario = {f"token{i}": i for i in range(mb * 1024 * 1024 // 2 // 200)}
+
+def processar_sintetico(modelos: ModelosSinteticos, texto: str) -> int:
+    return int(modelos.pesos[:1000].sum()) + len(texto) + modelos.vocabulario.get('token1', 0)
+
+def processar_sistema(sistema, texto: str) -> str:
+    return sistema.processar_transcricao(texto)['status']
+
+def memoria_processo_mb(pid: int) -> dict:
+    """Lê RSS, PSS e memória privada de um processo em /proc (Linux)."""
+    valores = {}
+    with open(f'/proc/{pid}/smaps_rollup') as arquivo:
+        for linha in arquivo:
+            partes = linha.split()
+            if len(partes) == 3 and partes[2] == 'kB':
+                valores[partes[0].rstrip(':')] = int(partes[1]) / 1024
+    return {
+        'rss_mb': valores.get('Rss', 0.0),
+        'pss_mb': valores.get('Pss', 0.0),
+        'privada_mb': valores.get('Private_Clean', 0.0) + valores.get('Private_Dirty', 0.0)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--tarefas', type=int, default=200)
+    parser.add_argument('--mb', type=int, default=500)
+    parser.add_argument('--sistema', action='store_true', help="Usar SistemaMultiagentes com os modelos reais")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+
+    from agentes.supervisor import SupervisorWorkers
+
+    if args.sistema:
+        from main import SistemaMultiagentes, criar_sistema_carregado
+        supervisor = SupervisorWorkers(
+            criar_sistema_carregado, processar_sistema, args.workers,
+            ao_iniciar_worker=SistemaMultiagentes.preparar_worker
+        )
+    else:
+        supervisor = SupervisorWorkers(lambda: ModelosSinteticos(args.mb), processar_sintetico, args.workers)
+
+    inicio = time.perf_counter()
+    supervisor.iniciar()
+    tempo_inicio = time.perf_counter() - inicio
+
+    textos = (utilitarios.TEXTOS_EXEMPLO * (args.tarefas // len(utilitarios.TEXTOS_EXEMPLO) + 1))[:args.tarefas]
+    inicio = time.perf_counter()
+    supervisor.mapear(textos)
+    tempo_tarefas = time.perf_counter() - inicio
+
+    linhas = [{'processo': 'supervisor', **memoria_processo_mb(os.getpid())}]
+    for indice, pid in sorted(supervisor.obter_estado()['workers'].items()):
+        linhas.append({'processo': f"worker-{indice}", **memoria_processo_mb(pid)})
+    supervisor.encerrar()
+
+    total = {coluna: sum(linha[coluna] for linha in linhas) for coluna in ('rss_mb', 'pss_mb', 'privada_mb')}
+    linhas.append({'processo': 'total', **total})
+
+    print(f"Inicialização: {tempo_inicio:.1f}s; {args.tarefas} tarefas em {tempo_tarefas:.2f}s")
+    utilitarios.imprimir_tabela(linhas, ['processo', 'rss_mb', 'pss_mb', 'privada_mb'])
+
+if __name__ == '__main__':
+    main()
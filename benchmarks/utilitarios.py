@@ -0,0 +1,94 @@
+"""Funções auxiliares compartilhadas pelos scripts de benchmark."""
+import os
+import sys
+import time
+
+# Permitir importar config e agentes a partir da raiz do projeto
+RAIZ_PROJETO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if RAIZ_PROJETO not in sys.path:
+    sys.path.insert(0, RAIZ_PROJETO)
+
+# Comandos representativos usados quando nenhum corpus é informado
+TEXTOS_EXEMPLO = [
+    "João precisa criar uma tarefa para o projeto Marketing até sexta-feira",
+    "Criar uma nova tarefa para o projeto XPTO até 30/06/2025",
+    "Atualizar o status da tarefa de revisão do contrato para concluído",
+    "Mover a tarefa de deploy para a coluna Em andamento no quadro Infraestrutura",
+    "Comentar na tarefa do relatório mensal que os números foram revisados",
+    "Maria Souza vai atualizar a planilha de custos do projeto Expansão, é urgente",
+    "Adicionar tarefa para Pedro revisar o layout do site até 15/07/2025",
+    "Mover o item de onboarding para a coluna Concluído",
+    "Deixar um comentário na tarefa de auditoria pedindo os anexos",
+    "Precisamos criar uma tarefa de alta prioridade para corrigir o login do aplicativo",
+]
+
+def percentil(valores: list, p: float) -> float:
+    """Retorna o percentil p (0-100) de uma lista de valores."""
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    indice = min(len(ordenados) - 1, max(0, int(round(p / 100 * (len(ordenados) - 1)))))
+    return ordenados[indice]
+
+def medir_latencias(funcao, entradas: list, repeticoes: int = 1) -> list:
+    """
+    Executa a função para cada entrada e mede a latência de cada chamada.
+
+    Args:
+        funcao: Função chamada com uma entrada por vez
+        entradas (list): Entradas do benchmark
+        repeticoes (int): Quantas vezes percorrer as entradas
+
+    Returns:
+        list: Latências em segundos
+    """
+    latencias = []
+    for _ in range(repeticoes):
+        for entrada in entradas:
+            inicio = time.perf_counter()
+            funcao(entrada)
+            latencias.append(time.perf_counter() - inicio)
+    return latencias
+
+def resumir_latencias(latencias: list) -> dict:
+    """Resume latências (segundos) em p50/p90/p99 (ms) e vazão (itens/s)."""
+    total = sum(latencias)
+    return {
+        'chamadas': len(latencias),
+        'p50_ms': percentil(latencias, 50) * 1000,
+        'p90_ms': percentil(latencias, 90) * 1000,
+        'p99_ms': percentil(latencias, 99) * 1000,
+        'vazao_por_s': len(latencias) / total if total else 0.0
+    }
+
+def memoria_rss_mb() -> float:
+    """Retorna a memória residente (RSS) atual do processo em MB."""
+    try:
+        with open('/proc/self/status') as arquivo:
+            for linha in arquivo:
+                if linha.startswith('VmRSS:'):
+                    return int(linha.split()[1]) / 1024
+    except OSError:
+        pass
+
+    # Fallback para sistemas sem /proc: pico de RSS
+    import resource
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return pico / (1024 * 1024) if sys.platform == 'darwin' else pico / 1024
+
+def imprimir_tabela(linhas: list, colunas: list):
+    """Imprime uma lista de dicts como tabela de texto alinhada."""
+    larguras = {
+        coluna: max([len(coluna)] + [len(_formatar(linha.get(coluna))) for linha in linhas])
+        for coluna in colunas
+    }
+    print('  '.join(coluna.ljust(larguras[coluna]) for coluna in colunas))
+    for linha in linhas:
+        print('  '.join(_formatar(linha.get(coluna)).ljust(larguras[coluna]) for coluna in colunas))
+
+def _formatar(valor) -> str:
+    if valor is None:
+        return ''
+    if isinstance(valor, float):
+        return f"{valor:.2f}"
+    return str(valor)
@@ -8,6 +8,71 @@ class Config:
     
     # Configurações do NLP
     NLP_MODEL = "pt_core_news_lg"  # Modelo do spaCy para português
+    BERT_MODEL = "neuralmind/bert-base-portuguese-cased"
+    BERT_NUM_LABELS = 4
+    BERT_BACKEND = "fp32"  # fp32, int8 (quantização dinâmica), onnx (ONNX Runtime) ou compacto
+    BERT_ONNX_PATH = "modelos/bert_intencoes.onnx"  # Exportado automaticamente se não existir
+    MODELO_COMPACTO_PATH = "modelos/intencoes_compacto.npz"  # Treinado com agentes.agente_analista.modelo_compacto
+    BERT_BATCH_MAX = 32  # Máximo de textos por forward
+    BERT_MICRO_LOTE = False  # Agrupar chamadas concorrentes de classificação
+    BERT_MICRO_LOTE_ESPERA = 0.005  # Janela de espera do micro-lote (segundos)
+    TORCH_THREADS_INTRA = None  # Threads intra-op por worker (None = padrão do PyTorch)
+    TORCH_THREADS_INTER = None  # Threads inter-op por worker (None = padrão do PyTorch)
+    AQUECER_MODELOS = True  # Executar inferências de aquecimento na inicialização
+    LIMIAR_REGRAS = 0.9  # Confiança mínima para aceitar a ação das regras sem consultar o BERT
+    LIMIAR_TAREFA = 0.5  # Confiança mínima para uma frase virar tarefa em analisar_intencoes_multiplas
+    
+    # Configurações do cache de análise (AgentePre + AgenteAnalista)
+    CACHE_ANALISE_TAMANHO = 1024  # Número máximo de textos em memória
+    CACHE_ANALISE_ARQUIVO = None  # Ex.: "cache/analise.jsonl" para persistir em disco
+    
+    # Configurações do histórico do AgenteBoss
+    HISTORICO_DIRETORIO = None  # Ex.: "historico" para persistir as operações em partições diárias (SQLite)
+    
+    # Checkpoints das etapas de cada transcrição (retomada após falhas)
+    CHECKPOINT_ARQUIVO = None  # Ex.: "checkpoints/etapas.sqlite3" para retomar transcrições da última etapa concluída
+    
+    # Configurações de monitoramento
+    RASTREAMENTO_ARQUIVO = None  # Ex.: "logs/rastreamento.jsonl" para exportar os spans em JSON-lines
+    METRICAS_PORTA = None  # Ex.: 9100 para expor /metrics no formato do Prometheus
+    METRICAS_ENDERECO = "127.0.0.1"
+    
+    # Configurações do controle adaptativo do executor
+    CONCORRENCIA_INICIAL = 4  # Mutations simultâneas no início (o teto é o limite de concorrência da API)
+    CONCORRENCIA_LATENCIA_ALVO = 2.0  # segundos; acima disso a API é tratada como congestionada
+    LOTE_MUTATIONS_INICIAL = 10
+    LOTE_MUTATIONS_MAXIMO = 50
+    
+    # Configurações do processamento em lote (SistemaMultiagentes.processar_lote)
+    PIPELINE_CAPACIDADE_FILA = 8  # Itens aguardando entre uma etapa e a seguinte
+    PIPELINE_TRABALHADORES_ANALISE = 1  # Threads de AgentePre + AgenteAnalista
+    PIPELINE_TRABALHADORES_IO = 4  # Threads de cada etapa de E/S (validação; mapeamento + mutation)
+    
+    # Configurações do modo assíncrono (processar_transcricao_async)
+    ASYNC_MAX_EM_VOO = 200  # Transcrições simultâneas em processar_lote_async
+    ASYNC_TRABALHADORES_NLP = 1  # Threads que executam AgentePre + AgenteAnalista
+    ASYNC_LIMITE_CONEXOES = 100  # Conexões HTTP simultâneas por agente
+    ASYNC_TIMEOUT = 30  # segundos por requisição
+    
+    # Agentes carregados em paralelo, em segundo plano, ao criar o SistemaMultiagentes (os demais, no primeiro uso)
+    AGENTES_SEGUNDO_PLANO = ['pre', 'analista']
+    
+    # Configurações do supervisor pré-fork (iniciar_workers)
+    SUPERVISOR_WORKERS = 2  # Processos que compartilham os modelos carregados (copy-on-write)
+    SUPERVISOR_INTERVALO_MONITOR = 0.5  # segundos entre verificações de workers mortos
+    
+    # Configurações do modo serviço (python main.py --servico)
+    SERVICO_PORTA = 8080
+    SERVICO_ENDERECO = "127.0.0.1"  # Apenas local por padrão
+    SERVICO_TRABALHADORES = 4  # Threads que processam a fila de transcrições
+    SERVICO_CAPACIDADE_FILA = 64  # Transcrições aguardando; acima disso o serviço responde 429
+    SERVICO_MAX_JOBS = 1000  # Jobs concluídos mantidos para consulta
+    SERVICO_TIMEOUT = 60  # segundos de espera em POST /transcricoes
+    
+    # Agendamento por prioridade no modo serviço
+    AGENDADOR_COTAS = {'alta': 4, 'media': 3, 'baixa': 2}  # Máximo em execução da prioridade ou menos urgentes (reserva threads para as urgentes)
+    AGENDADOR_ENVELHECIMENTO = 30  # segundos de espera para uma transcrição subir um nível de prioridade
+    AGENDADOR_SLO = {'alta': 5, 'media': 60, 'baixa': 600}  # Espera máxima desejada na fila, em segundos
     
     # Configurações de validação
     MAX_RETRIES = 3
@@ -1,12 +1,31 @@
+import argparse
+import asyncio
+import contextvars
 import os
+import threading
+import time
+import uuid
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 from config import Config
 import logging
 from agentes.agente_pre import AgentePre
 from agentes.agente_analista import AgenteAnalista
 from agentes.agente_validador import AgenteValidador
 from agentes.agente_mapeamap import AgenteMapeaMap
-from agentes.agente_executor import AgenteExecutor
+from agentes.agente_executor import AgenteExecutor, MutationIncerta
 from agentes.agente_boss import AgenteBoss
+from agentes.agendamento import ClassificadorPrioridade
+from agentes.cache_analise import CacheAnalise
+from agentes.carregamento import AgentesSobDemanda
+from agentes.checkpoints import RegistroCheckpoints
+from agentes.monitoramento import (
+    Amostra, ExportadorJsonl, FamiliaMetrica, coletor_spans, iniciar_servidor_metricas,
+    latencias, medir, metricas, rastreador, rastrear, span_atual
+)
+from agentes.pipeline import Concluido, Etapa, PipelineEtapas
+from agentes.servico import ServicoTranscricoes
+from agentes.supervisor import SupervisorWorkers
 
 # Configurar logging
 logging.basicConfig(
@@ -20,76 +39,552 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+FILAS = metricas.medidor('fila_profundidade', 'Itens aguardando em filas internas', ('fila',))
+RETOMADAS = metricas.contador('transcricoes_retomadas', 'Transcrições retomadas de um checkpoint', ('etapa',))
+
+def _anotar(chave: str, valor):
+    """Anexa um atributo ao span ativo, se houver."""
+    span = span_atual()
+    if span is not None:
+        span.definir(chave, valor)
+
 class SistemaMultiagentes:
     def __init__(self):
-        """Inicializa o sistema multiagentes com todos os agentes"""
+        """
+        Inicializa o sistema multiagentes.
+        
+        Os agentes são construídos sob demanda; os que carregam modelos
+        (Config.AGENTES_SEGUNDO_PLANO) começam a carregar em paralelo, em
+        segundo plano, e os demais já podem ser usados. Use
+        obter_prontidao/aguardar_pronto para acompanhar o carregamento.
+        """
         logger.info("Inicializando Sistema Multiagentes...")
         
-        # Inicializar todos os agentes
-        self.agentes = {
-            'pre': AgentePre(),
-            'analista': AgenteAnalista(),
-            'validador': AgenteValidador(),
-            'mapeamap': AgenteMapeaMap(),
-            'executor': AgenteExecutor(),
-            'boss': AgenteBoss()
+        self.agentes = AgentesSobDemanda({
+            'pre': AgentePre,
+            'analista': AgenteAnalista,
+            'validador': AgenteValidador,
+            'mapeamap': AgenteMapeaMap,
+            'executor': AgenteExecutor,
+            'boss': AgenteBoss
+        })
+        self.agentes.carregar_em_segundo_plano(Config.AGENTES_SEGUNDO_PLANO)
+        
+        # Cache dos resultados de AgentePre + AgenteAnalista, criado junto com o AgenteAnalista
+        self._cache_analise = None
+        self._lock_cache = threading.Lock()
+        
+        # Spans também em arquivo, se configurado (o coletor em memória está sempre ativo).
+        # O exportador é único por arquivo no processo e fechado quando o último sistema que o usa termina
+        self._liberar_exportador_spans = None
+        if Config.RASTREAMENTO_ARQUIVO:
+            _adquirir_exportador_spans(Config.RASTREAMENTO_ARQUIVO)
+            self._liberar_exportador_spans = weakref.finalize(self, _liberar_exportador_spans, Config.RASTREAMENTO_ARQUIVO)
+        
+        # Threads de NLP do modo assíncrono (processar_transcricao_async) e lotes
+        # em andamento por event loop (o último fecha as sessões HTTP)
+        self.executor_nlp = None
+        self._lotes_async = weakref.WeakKeyDictionary()
+        
+        # Checkpoints por etapa para retomar transcrições interrompidas, se configurado
+        self.checkpoints = RegistroCheckpoints(Config.CHECKPOINT_ARQUIVO) if Config.CHECKPOINT_ARQUIVO else None
+        
+        # Métricas lidas na hora da raspagem e endpoint /metrics, se configurado.
+        # O coletor global só guarda uma referência fraca ao sistema e sai do
+        # registro em encerrar() ou quando o sistema é coletado
+        coletor = _coletor_fraco(self._coletar_metricas)
+        metricas.registrar_coletor(coletor)
+        self._remover_coletor = weakref.finalize(self, metricas.remover_coletor, coletor)
+        self.servidor_metricas = None
+        if Config.METRICAS_PORTA is not None:
+            self.servidor_metricas = iniciar_servidor_metricas(metricas, Config.METRICAS_PORTA, Config.METRICAS_ENDERECO)
+        
+        logger.info("Sistema Multiagentes inicializado; modelos carregando em segundo plano")
+
+    @property
+    def cache_analise(self) -> CacheAnalise:
+        """Cache de análise; a chave inclui as versões dos modelos e das entidades, então espera o AgenteAnalista"""
+        if self._cache_analise is None:
+            analista = self.agentes['analista']
+            with self._lock_cache:
+                if self._cache_analise is None:
+                    self._cache_analise = CacheAnalise(
+                        tamanho_maximo=Config.CACHE_ANALISE_TAMANHO,
+                        arquivo=Config.CACHE_ANALISE_ARQUIVO,
+                        versao_modelos=analista.versao_modelos,
+                        versao_dados=analista.versao_dados
+                    )
+        return self._cache_analise
+
+    def obter_prontidao(self) -> dict:
+        """
+        Informa quais agentes já foram carregados.
+        
+        Returns:
+            dict: 'pronto' (todos carregados) e, por agente, estado
+                (pendente/carregando/pronto/erro), duração e erro
+        """
+        agentes = self.agentes.obter_estado()
+        return {
+            'pronto': all(agente['estado'] == 'pronto' for agente in agentes.values()),
+            'agentes': agentes
         }
+
+    def aguardar_pronto(self, timeout: float = None) -> bool:
+        """
+        Carrega todos os agentes que faltam e aguarda.
         
-        logger.info("Todos os agentes inicializados com sucesso!")
+        Returns:
+            bool: True se todos os agentes foram carregados
+        """
+        pronto = self.agentes.aguardar(timeout=timeout)
+        if pronto:
+            # Cria o cache agora, fora do caminho da primeira transcrição
+            self.cache_analise
+        return pronto
 
-    def processar_transcricao(self, texto: str) -> dict:
-        """Processa uma transcrição de áudio ou texto e executa as ações necessárias no Monday.com."""
-        logger.info("Iniciando processamento de transcrição...")
+    def processar_transcricao(self, texto: str, trace_id: str = None, transcricao_id: str = None) -> dict:
+        """
+        Processa uma transcrição de áudio ou texto e executa as ações necessárias no Monday.com.
         
-        try:
-            # 1. Processar texto com AgentePre
-            logger.info("Processando texto com AgentePre...")
-            resultado_pre = self.agentes['pre'].processar_texto(texto)
-            
-            # 2. Analisar intenções com AgenteAnalista
-            logger.info("Analisando texto com AgenteAnalista...")
-            intencoes = self.agentes['analista'].analisar_intencoes(resultado_pre)
+        Cada transcrição gera um rastreamento com um span por etapa e por
+        chamada à API; o identificador volta em 'trace_id' (ver obter_rastreamento).
+        
+        Com Config.CHECKPOINT_ARQUIVO, o estado é gravado ao fim de cada
+        etapa sob `transcricao_id` (padrão: o trace_id), que volta no
+        resultado; se uma etapa falhar, retomar_transcricao continua da
+        última etapa concluída.
+        """
+        with rastrear('transcricao.total', trace_id, tamanho_texto=len(texto)) as raiz:
+            estado = self._novo_estado(texto, raiz.trace_id)
+            if self.checkpoints is not None:
+                estado['transcricao_id'] = transcricao_id or raiz.trace_id
+            logger.info(f"Iniciando processamento de transcrição (trace {raiz.trace_id})...")
+            return self._executar_etapas(estado, 0)
+
+    def retomar_transcricao(self, transcricao_id: str, trace_id: str = None,
+                            reenviar_mutation: bool = False, mutation_aplicada: bool = False) -> dict:
+        """
+        Retoma uma transcrição interrompida a partir da última etapa concluída.
+        
+        Se a interrupção ocorreu com a mutation já enviada e sem resposta
+        conclusiva (timeout, conexão perdida, erro 5xx ou queda do processo),
+        o Monday.com pode tê-la aplicado: reexecutá-la criaria um item
+        duplicado. Nesse caso a retomada não reenvia nada e devolve
+        'mutation_incerta'; depois de conferir o board, chame novamente com
+        `mutation_aplicada=True` (conclui sem reenviar) ou
+        `reenviar_mutation=True`.
+        
+        Args:
+            transcricao_id (str): Identificador devolvido pela execução que falhou
+            trace_id (str): Rastreamento da retomada (padrão: novo)
+            reenviar_mutation (bool): Reenvia uma mutation de desfecho incerto
+            mutation_aplicada (bool): Confirma que a mutation de desfecho incerto foi aplicada
             
-            # 3. Validar dados com AgenteValidador
-            logger.info("Validando dados com AgenteValidador...")
-            validacao = self.agentes['validador'].validar_intencoes(intencoes)
+        Returns:
+            dict: Mesmo formato de processar_transcricao; com 'mutation_incerta'
+                quando a retomada aguarda confirmação
             
-            # Se houver erros de validação, retornar mensagem
-            if not validacao['valido']:
+        Raises:
+            KeyError: Se não houver checkpoint para a transcrição
+        """
+        if self.checkpoints is None:
+            raise RuntimeError("Checkpoints desativados (Config.CHECKPOINT_ARQUIVO)")
+        checkpoint = self.checkpoints.obter(transcricao_id)
+        if checkpoint is None:
+            raise KeyError(transcricao_id)
+        
+        etapa, estado = checkpoint
+        if estado.pop('mutation_em_andamento', False):
+            if mutation_aplicada:
+                etapa = 'mutation'
+            elif not reenviar_mutation:
+                logger.warning(f"Transcrição {transcricao_id}: a mutation pode já ter sido aplicada; confirme antes de retomar")
                 return {
                     'sucesso': False,
-                    'mensagem': f"Erro de validação: {', '.join(validacao['conflitos'] + validacao['dados_faltando'] + validacao['ambiguidades'])}"
+                    'mensagem': "Mutation de desfecho incerto: confirme no Monday.com se o item foi criado",
+                    'mutation_incerta': True,
+                    'transcricao_id': transcricao_id
                 }
+        with rastrear('transcricao.total', trace_id, retomada_de=etapa) as raiz:
+            # O tempo de execução registrado passa a contar da retomada
+            estado.update(trace_id=raiz.trace_id, inicio=time.perf_counter())
+            logger.info(f"Retomando transcrição {transcricao_id} após a etapa {etapa} (trace {raiz.trace_id})...")
+            RETOMADAS.rotulos(etapa=etapa).inc()
+            return self._executar_etapas(estado, [nome for nome, _ in self._etapas()].index(etapa) + 1)
+
+    def retomar_pendentes(self) -> list:
+        """
+        Retoma, em ordem, todas as transcrições interrompidas (ex.: após uma indisponibilidade da API).
+        
+        As de mutation incerta não são reenviadas (ver retomar_transcricao).
+        
+        Returns:
+            list: Resultado de cada retomada, com 'transcricao_id'
+        """
+        if self.checkpoints is None:
+            return []
+        return [self.retomar_transcricao(pendente['transcricao_id']) for pendente in self.checkpoints.pendentes()]
+
+    def _etapas(self) -> list:
+        """Etapas do processamento síncrono, na ordem; cada uma recebe e devolve o estado."""
+        return [
+            ('analise', self._etapa_analise),
+            ('validacao', self._etapa_validacao),
+            ('mapeamento', self._etapa_mapeamento),
+            ('mutation', self._etapa_mutation),
+            ('registro', self._registrar_sucesso)
+        ]
+
+    def _executar_etapas(self, estado: dict, inicio: int) -> dict:
+        """
+        Executa as etapas a partir do índice `inicio`, gravando um checkpoint ao fim de cada uma.
+        
+        Antes da mutation o checkpoint é marcado com 'mutation_em_andamento';
+        a marca só é desfeita quando a falha garante que nada foi aplicado,
+        de modo que uma queda ou resposta perdida não leve a reenvio às cegas.
+        """
+        transcricao_id = estado.get('transcricao_id')
+        try:
+            for nome, etapa in self._etapas()[inicio:]:
+                if nome == 'mutation' and transcricao_id is not None:
+                    estado['mutation_em_andamento'] = True
+                    self.checkpoints.salvar(transcricao_id, 'mapeamento', estado)
+                estado = etapa(estado)
+                if isinstance(estado, Concluido) or nome == 'registro':
+                    break
+                if transcricao_id is not None:
+                    estado.pop('mutation_em_andamento', None)
+                    self.checkpoints.salvar(transcricao_id, nome, estado)
+        except Exception as e:
+            if transcricao_id is not None:
+                if not isinstance(e, MutationIncerta) and estado.pop('mutation_em_andamento', False):
+                    self.checkpoints.salvar(transcricao_id, 'mapeamento', estado)
+                self.checkpoints.registrar_erro(transcricao_id, str(e))
+            return self._registrar_falha(e, estado)
+        
+        resultado = estado.resultado if isinstance(estado, Concluido) else estado
+        if transcricao_id is not None:
+            self.checkpoints.remover(transcricao_id)
+            resultado['transcricao_id'] = transcricao_id
+        return resultado
+
+    def processar_transcricao_multipla(self, texto: str, trace_id: str = None) -> dict:
+        """
+        Processa uma transcrição que pode conter várias tarefas (ex.: ata de reunião).
+
+        O AgenteAnalista devolve uma intenção por tarefa e as etapas
+        seguintes tratam a lista em lote: pessoas e projetos repetidos são
+        validados uma única vez, cada quadro é resolvido uma vez e as
+        mutations seguem agrupadas em poucas requisições. Uma tarefa
+        inválida ou com falha não impede as demais.
+
+        Returns:
+            dict: 'sucesso' (todas as tarefas executadas), 'tarefas' com o
+                resultado de cada uma e 'trace_id'
+        """
+        with rastrear('transcricao.total', trace_id, tamanho_texto=len(texto)) as raiz:
+            estado = self._novo_estado(texto, raiz.trace_id)
+            logger.info(f"Iniciando processamento de transcrição com múltiplas tarefas (trace {raiz.trace_id})...")
+            try:
+                with medir('etapa.pre'):
+                    resultado_pre = self.agentes['pre'].processar_texto(texto)
+                with medir('etapa.analista'):
+                    lista_intencoes = self.agentes['analista'].analisar_intencoes_multiplas(resultado_pre)
+                _anotar('tarefas', len(lista_intencoes))
+
+                with medir('etapa.validador'):
+                    validacoes = self.agentes['validador'].validar_intencoes_lote(lista_intencoes)
+
+                tarefas = [self._resumo_tarefa(validacao) for validacao in validacoes]
+                validas = [indice for indice, validacao in enumerate(validacoes) if validacao['valido']]
+                with medir('etapa.mapeamap'):
+                    payloads = self.agentes['mapeamap'].criar_payloads_lote([validacoes[indice] for indice in validas])
+
+                enviar = [(indice, payload) for indice, payload in zip(validas, payloads) if payload is not None]
+                for indice, payload in zip(validas, payloads):
+                    if payload is None:
+                        tarefas[indice]['erro'] = "Quadro não encontrado"
+
+                with medir('etapa.executor'):
+                    execucoes = self.agentes['executor'].executar_mutations_lote([payload for _, payload in enviar])
+                for (indice, _), execucao in zip(enviar, execucoes):
+                    tarefas[indice]['sucesso'] = execucao['sucesso']
+                    if not execucao['sucesso']:
+                        tarefas[indice]['erro'] = execucao['erro']
+
+                tempo_execucao = time.perf_counter() - estado['inicio']
+                with medir('etapa.boss'):
+                    for tarefa in tarefas:
+                        self.agentes['boss'].registrar_operacao({
+                            'acao': tarefa['acao'],
+                            'sucesso': tarefa['sucesso'],
+                            'tempo_execucao': tempo_execucao / len(tarefas),
+                            **({'erro': tarefa['erro']} if 'erro' in tarefa else {})
+                        })
+
+                return {
+                    'sucesso': all(tarefa['sucesso'] for tarefa in tarefas),
+                    'tarefas': tarefas,
+                    'trace_id': estado['trace_id']
+                }
+            except Exception as e:
+                return self._registrar_falha(e, estado)
+
+    @staticmethod
+    def _resumo_tarefa(validacao: dict) -> dict:
+        tarefa = {
+            'objetivo': validacao['objetivo'],
+            'acao': validacao['acao'],
+            'prioridade': validacao['prioridade'],
+            'valido': validacao['valido'],
+            'sucesso': False
+        }
+        if not validacao['valido']:
+            tarefa['erro'] = f"Erro de validação: {', '.join(validacao['conflitos'] + validacao['dados_faltando'] + validacao['ambiguidades'])}"
+        return tarefa
+
+    async def processar_transcricao_async(self, texto: str, trace_id: str = None) -> dict:
+        """
+        Variante assíncrona de processar_transcricao.
+        
+        A análise (CPU) roda no executor de NLP, fora do event loop; a
+        validação, o mapeamento e a mutation usam as variantes assíncronas
+        dos agentes. Um único processo mantém assim centenas de transcrições
+        em voo durante as chamadas à API, sem uma thread por requisição.
+        """
+        with rastrear('transcricao.total', trace_id, tamanho_texto=len(texto)) as raiz:
+            estado = self._novo_estado(texto, raiz.trace_id)
+            logger.info(f"Iniciando processamento assíncrono de transcrição (trace {raiz.trace_id})...")
+            try:
+                # copy_context leva o span ativo para a thread de NLP
+                contexto = contextvars.copy_context()
+                loop = asyncio.get_running_loop()
+                estado = await loop.run_in_executor(self._executor_nlp(), contexto.run, self._etapa_analise, estado)
+                
+                estado = await self._etapa_validacao_async(estado)
+                if isinstance(estado, Concluido):
+                    return estado.resultado
+                return await self._etapa_execucao_async(estado)
+            except Exception as e:
+                return self._registrar_falha(e, estado)
+
+    async def processar_lote_async(self, textos: list) -> list:
+        """
+        Processa várias transcrições concorrentemente no event loop.
+        
+        Args:
+            textos (list): Transcrições a processar
             
-            # 4. Mapear dados para Monday.com
-            logger.info("Mapeando dados para Monday.com...")
-            payload = self.agentes['mapeamap'].criar_payload_mutation(validacao)
-            
-            # 5. Executar mutation
-            logger.info("Executando mutation no Monday.com...")
-            resultado = self.agentes['executor'].executar_mutation(payload)
+        Returns:
+            list: Resultado de cada transcrição, na mesma ordem de entrada
+        """
+        limite = asyncio.Semaphore(Config.ASYNC_MAX_EM_VOO)
+        
+        async def processar(texto: str) -> dict:
+            async with limite:
+                return await self.processar_transcricao_async(texto)
+        
+        loop = asyncio.get_running_loop()
+        self._lotes_async[loop] = self._lotes_async.get(loop, 0) + 1
+        try:
+            return await asyncio.gather(*(processar(texto) for texto in textos))
+        finally:
+            # O último lote do loop fecha as sessões HTTP, que não sobrevivem a ele
+            self._lotes_async[loop] -= 1
+            if not self._lotes_async[loop]:
+                del self._lotes_async[loop]
+                await self.fechar_clientes_async()
+
+    async def fechar_clientes_async(self):
+        """Fecha as sessões HTTP dos agentes no event loop atual (chamar antes de o loop terminar)"""
+        for nome in ('validador', 'mapeamap', 'executor'):
+            if not self.agentes.carregado(nome):
+                continue
+            cliente = getattr(self.agentes[nome], 'cliente_async', None)
+            if cliente is not None:
+                await cliente.fechar()
+
+    def processar_lote(self, textos: list) -> list:
+        """
+        Processa várias transcrições em pipeline (ver processar_fluxo).
+        
+        Args:
+            textos (list): Transcrições a processar
             
-            # 6. Registrar operação com AgenteBoss
-            logger.info("Registrando operação com AgenteBoss...")
-            self.agentes['boss'].registrar_operacao(resultado)
+        Returns:
+            list: Resultado de cada transcrição, na mesma ordem de entrada
+        """
+        return list(self.processar_fluxo(textos))
+
+    def processar_fluxo(self, textos):
+        """
+        Processa um fluxo de transcrições com as etapas sobrepostas.
+        
+        A análise (AgentePre + AgenteAnalista, CPU) e as etapas de E/S
+        (validação; mapeamento, mutation e registro) rodam em threads
+        próprias ligadas por filas limitadas: a análise da transcrição N+1
+        acontece enquanto a N aguarda a API do Monday.com, e uma etapa
+        lenta segura as anteriores em vez de acumular itens em memória.
+        
+        Args:
+            textos: Iterável de transcrições (consumido sob demanda)
             
-            return {
-                'sucesso': True,
-                'entidades_validas': validacao['entidades_validas'],
-                'acao': validacao['acao'],
-                'prioridade': validacao['prioridade'],
-                'metricas': {
-                    **validacao['metricas'],
-                    **self.agentes['boss'].obter_metricas_operacao()
-                }
-            }
+        Yields:
+            dict: Resultado de cada transcrição, na ordem de entrada
+        """
+        pipeline = PipelineEtapas(
+            [
+                Etapa('analise', self._rastrear_etapa('pipeline.analise', self._etapa_analise), Config.PIPELINE_TRABALHADORES_ANALISE),
+                Etapa('validacao', self._rastrear_etapa('pipeline.validacao', self._etapa_validacao), Config.PIPELINE_TRABALHADORES_IO),
+                Etapa('execucao', self._rastrear_etapa('pipeline.execucao', self._etapa_execucao), Config.PIPELINE_TRABALHADORES_IO)
+            ],
+            capacidade=Config.PIPELINE_CAPACIDADE_FILA,
+            tratar_erro=self._registrar_falha
+        )
+        estados = (self._novo_estado(texto, uuid.uuid4().hex) for texto in textos)
+        return pipeline.processar(estados)
+
+    def _novo_estado(self, texto: str, trace_id: str) -> dict:
+        return {'texto': texto, 'trace_id': trace_id, 'inicio': time.perf_counter()}
+
+    def _rastrear_etapa(self, nome: str, etapa):
+        """Executa a etapa dentro de um span com o trace_id da transcrição (as threads do pipeline não herdam o contexto)."""
+        def executar(estado: dict):
+            with rastrear(nome, estado['trace_id']):
+                return etapa(estado)
+        return executar
+
+    def _etapa_analise(self, estado: dict) -> dict:
+        """Etapas 1 e 2: limpeza, NER e classificação, com cache."""
+        texto = estado['texto']
+        
+        # Textos repetidos reutilizam a análise já feita
+        intencoes = self.cache_analise.obter(texto)
+        _anotar('cache_analise', intencoes is not None)
+        if intencoes is not None:
+            logger.info("Análise encontrada no cache, pulando AgentePre e AgenteAnalista...")
+        else:
+            # 1. Processar texto com AgentePre
+            logger.info("Processando texto com AgentePre...")
+            with medir('etapa.pre'):
+                resultado_pre = self.agentes['pre'].processar_texto(texto)
             
-        except Exception as e:
-            logger.error(f"Erro durante processamento: {str(e)}")
-            return {
+            # 2. Analisar intenções com AgenteAnalista
+            logger.info("Analisando texto com AgenteAnalista...")
+            with medir('etapa.analista'):
+                intencoes = self.agentes['analista'].analisar_intencoes(resultado_pre)
+            self.cache_analise.armazenar(texto, intencoes)
+        
+        estado['intencoes'] = intencoes
+        return estado
+
+    def _etapa_validacao(self, estado: dict):
+        """Etapa 3: validação das intenções contra o Monday.com."""
+        logger.info("Validando dados com AgenteValidador...")
+        with medir('etapa.validador'):
+            validacao = self.agentes['validador'].validar_intencoes(estado['intencoes'])
+        return self._resultado_validacao(estado, validacao)
+
+    def _resultado_validacao(self, estado: dict, validacao: dict):
+        # Se houver erros de validação, retornar mensagem
+        if not validacao['valido']:
+            return Concluido({
                 'sucesso': False,
-                'mensagem': f"Erro durante processamento: {str(e)}"
-            }
+                'mensagem': f"Erro de validação: {', '.join(validacao['conflitos'] + validacao['dados_faltando'] + validacao['ambiguidades'])}",
+                'trace_id': estado['trace_id']
+            })
+        
+        estado['validacao'] = validacao
+        return estado
+
+    def _etapa_execucao(self, estado: dict) -> dict:
+        """Etapas 4 a 6: mapeamento, mutation e registro da operação."""
+        return self._registrar_sucesso(self._etapa_mutation(self._etapa_mapeamento(estado)))
+
+    def _etapa_mapeamento(self, estado: dict) -> dict:
+        """Etapa 4: payload da mutation a partir da validação."""
+        logger.info("Mapeando dados para Monday.com...")
+        with medir('etapa.mapeamap'):
+            estado['payload'] = self.agentes['mapeamap'].criar_payload_mutation(estado['validacao'])
+        return estado
+
+    def _etapa_mutation(self, estado: dict) -> dict:
+        """Etapa 5: execução da mutation no Monday.com."""
+        logger.info("Executando mutation no Monday.com...")
+        with medir('etapa.executor'):
+            self.agentes['executor'].executar_mutation(estado['payload'])
+        return estado
+
+    def _registrar_sucesso(self, estado: dict) -> dict:
+        validacao = estado['validacao']
+        
+        # 6. Registrar operação com AgenteBoss
+        logger.info("Registrando operação com AgenteBoss...")
+        _anotar('acao', validacao['acao'])
+        with medir('etapa.boss'):
+            self.agentes['boss'].registrar_operacao({
+                'acao': validacao['acao'],
+                'sucesso': True,
+                'tempo_execucao': time.perf_counter() - estado['inicio']
+            })
+        
+        return {
+            'sucesso': True,
+            'entidades_validas': validacao['entidades_validas'],
+            'acao': validacao['acao'],
+            'prioridade': validacao['prioridade'],
+            'metricas': {
+                **validacao['metricas'],
+                **self.agentes['boss'].obter_metricas_operacao()
+            },
+            'trace_id': estado['trace_id']
+        }
+
+    async def _etapa_validacao_async(self, estado: dict):
+        """Variante assíncrona de _etapa_validacao."""
+        logger.info("Validando dados com AgenteValidador (async)...")
+        with medir('etapa.validador'):
+            validacao = await self.agentes['validador'].validar_intencoes_async(estado['intencoes'])
+        return self._resultado_validacao(estado, validacao)
+
+    async def _etapa_execucao_async(self, estado: dict) -> dict:
+        """Variante assíncrona de _etapa_execucao."""
+        validacao = estado['validacao']
+        
+        logger.info("Mapeando dados para Monday.com (async)...")
+        with medir('etapa.mapeamap'):
+            payload = await self.agentes['mapeamap'].criar_payload_mutation_async(validacao)
+        
+        logger.info("Executando mutation no Monday.com (async)...")
+        with medir('etapa.executor'):
+            await self.agentes['executor'].executar_mutation_async(payload)
+        
+        return self._registrar_sucesso(estado)
+
+    def _executor_nlp(self) -> ThreadPoolExecutor:
+        """Threads que executam a análise (CPU) para o modo assíncrono, criadas no primeiro uso."""
+        if self.executor_nlp is None:
+            self.executor_nlp = ThreadPoolExecutor(Config.ASYNC_TRABALHADORES_NLP, thread_name_prefix='nlp')
+        return self.executor_nlp
+
+    def _registrar_falha(self, erro: Exception, estado: dict) -> dict:
+        logger.error(f"Erro durante processamento: {str(erro)}")
+        _anotar('erro', str(erro))
+        self.agentes['boss'].registrar_operacao({
+            'acao': 'desconhecida',
+            'sucesso': False,
+            'tempo_execucao': time.perf_counter() - estado['inicio'],
+            'erro': str(erro)
+        })
+        resultado = {
+            'sucesso': False,
+            'mensagem': f"Erro durante processamento: {str(erro)}",
+            'trace_id': estado['trace_id']
+        }
+        if 'transcricao_id' in estado:
+            resultado['transcricao_id'] = estado['transcricao_id']
+        return resultado
 
     def analisar_desempenho(self) -> dict:
         """Analisa o desempenho geral do sistema"""
@@ -99,6 +594,183 @@ class SistemaMultiagentes:
         """Obtém sugestões de otimização"""
         return self.agentes['boss'].gerar_sugestoes_otimizacao()
 
+    def obter_latencias(self) -> dict:
+        """
+        Obtém os percentis de latência (segundos) de cada etapa e operação da API.
+        
+        Returns:
+            dict: p50/p90/p99/max por histograma ('etapa.*', 'monday.*', 'transcricao.total')
+        """
+        return latencias.resumo()
+
+    def obter_rastreamento(self, trace_id: str) -> list:
+        """
+        Obtém os spans recentes de uma transcrição.
+        
+        Args:
+            trace_id (str): Valor de 'trace_id' retornado por processar_transcricao
+            
+        Returns:
+            list: Spans (nome, pai_id, inicio, duracao, atributos, erro) em ordem de início
+        """
+        return coletor_spans.por_trace(trace_id)
+
+    def obter_metricas_cache(self) -> dict:
+        """Obtém as métricas de acerto do cache de análise"""
+        return self.cache_analise.obter_metricas()
+
+    def exportar_metricas(self) -> str:
+        """Retorna todas as métricas no formato texto do Prometheus (o mesmo de /metrics)"""
+        return metricas.exportar_texto()
+
+    def _coletar_metricas(self) -> list:
+        """Métricas de estado lidas no momento da raspagem."""
+        # Não dispara o carregamento dos modelos só para a raspagem
+        if not self.agentes.carregado('analista'):
+            return []
+        
+        cache = self.cache_analise.obter_metricas()
+        familias = [
+            FamiliaMetrica('cache_analise_entradas', 'gauge', 'Entradas no cache de análise', [Amostra('', {}, cache['tamanho'])]),
+            FamiliaMetrica('cache_analise_taxa_acerto', 'gauge', 'Taxa de acerto do cache de análise', [Amostra('', {}, cache['taxa_acerto'])])
+        ]
+        
+        micro_lotes = self.agentes['analista'].micro_lotes
+        if micro_lotes is not None:
+            FILAS.rotulos(fila='micro_lote_analista').definir(micro_lotes.fila.qsize())
+        return familias
+
+    def encerrar(self):
+        """Libera os recursos do sistema: coletor de métricas, exportador de spans, /metrics, threads de NLP e checkpoints"""
+        self._remover_coletor()
+        if self._liberar_exportador_spans is not None:
+            self._liberar_exportador_spans()
+        if self.servidor_metricas is not None:
+            self.servidor_metricas.shutdown()
+            self.servidor_metricas.server_close()
+            self.servidor_metricas = None
+        if self.executor_nlp is not None:
+            self.executor_nlp.shutdown(wait=False)
+            self.executor_nlp = None
+        if self.checkpoints is not None:
+            self.checkpoints.fechar()
+
+    def preparar_worker(self):
+        """Recria, em um worker criado por fork, o estado que não é herdado (threads, conexões)"""
+        self.agentes['analista'].apos_fork()
+        historico = self.agentes['boss'].historico_persistente
+        if historico is not None:
+            historico.apos_fork()
+        if self.checkpoints is not None:
+            self.checkpoints.apos_fork()
+        self.executor_nlp = None
+        self.servidor_metricas = None
+
+# Exportadores de spans em arquivo compartilhados pelos sistemas do processo: caminho -> [exportador, usos]
+_exportadores_spans = {}
+_lock_exportadores_spans = threading.Lock()
+
+def _adquirir_exportador_spans(caminho: str):
+    with _lock_exportadores_spans:
+        registro = _exportadores_spans.get(caminho)
+        if registro is None:
+            registro = _exportadores_spans[caminho] = [ExportadorJsonl(caminho), 0]
+            rastreador.adicionar_exportador(registro[0])
+        registro[1] += 1
+
+def _liberar_exportador_spans(caminho: str):
+    with _lock_exportadores_spans:
+        registro = _exportadores_spans[caminho]
+        registro[1] -= 1
+        if registro[1]:
+            return
+        del _exportadores_spans[caminho]
+    rastreador.remover_exportador(registro[0])
+    registro[0].fechar()
+
+def _coletor_fraco(metodo):
+    """Coletor que chama `metodo` sem manter vivo o objeto dono dele"""
+    referencia = weakref.WeakMethod(metodo)
+    
+    def coletar() -> list:
+        metodo = referencia()
+        return metodo() if metodo is not None else []
+    return coletar
+
+def criar_sistema_carregado() -> SistemaMultiagentes:
+    """
+    Cria o sistema e aguarda o carregamento de todos os agentes.
+    
+    Raises:
+        RuntimeError: Se algum agente não puder ser carregado
+    """
+    sistema = SistemaMultiagentes()
+    if not sistema.aguardar_pronto():
+        erros = {nome: agente['erro'] for nome, agente in sistema.obter_prontidao()['agentes'].items() if agente['erro']}
+        raise RuntimeError(f"Falha ao carregar agentes: {erros}")
+    return sistema
+
+def _processar_no_worker(sistema: SistemaMultiagentes, texto: str) -> dict:
+    return sistema.processar_transcricao(texto)
+
+def iniciar_workers(trabalhadores: int = None) -> SupervisorWorkers:
+    """
+    Carrega os modelos uma vez e cria workers que os compartilham.
+    
+    Os workers são processos criados por fork depois da inicialização do
+    SistemaMultiagentes: spaCy e BERT ocupam memória uma única vez, e cada
+    worker processa transcrições em paralelo sem disputar o GIL.
+    
+    Args:
+        trabalhadores (int): Número de workers (padrão: Config.SUPERVISOR_WORKERS)
+        
+    Returns:
+        SupervisorWorkers: Supervisor em execução; use submeter/mapear e encerrar
+    """
+    supervisor = SupervisorWorkers(
+        criar_sistema_carregado,
+        _processar_no_worker,
+        trabalhadores=trabalhadores or Config.SUPERVISOR_WORKERS,
+        ao_iniciar_worker=SistemaMultiagentes.preparar_worker,
+        intervalo_monitor=Config.SUPERVISOR_INTERVALO_MONITOR
+    )
+    supervisor.iniciar()
+    return supervisor
+
+def servir(porta: int = None, endereco: str = None):
+    """
+    Executa o sistema como serviço HTTP local até Ctrl+C.
+    
+    Os modelos são carregados uma única vez, em segundo plano, e ficam em
+    memória entre as transcrições; /ready indica quando o carregamento
+    terminou (ver ServicoTranscricoes para as rotas).
+    """
+    if not Config.MONDAY_API_TOKEN:
+        logger.error("Token do Monday.com não configurado!")
+        return
+    
+    servico = ServicoTranscricoes(
+        criar_sistema_carregado,
+        lambda sistema, texto, trace_id: sistema.processar_transcricao(texto, trace_id),
+        trabalhadores=Config.SERVICO_TRABALHADORES,
+        capacidade_fila=Config.SERVICO_CAPACIDADE_FILA,
+        max_jobs=Config.SERVICO_MAX_JOBS,
+        timeout=Config.SERVICO_TIMEOUT,
+        classificar=ClassificadorPrioridade(),
+        cotas=Config.AGENDADOR_COTAS,
+        envelhecimento=Config.AGENDADOR_ENVELHECIMENTO,
+        slo=Config.AGENDADOR_SLO
+    )
+    servico.iniciar(porta or Config.SERVICO_PORTA, endereco or Config.SERVICO_ENDERECO)
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        logger.info("Encerrando serviço...")
+    finally:
+        servico.encerrar()
+        if servico.objeto is not None:
+            servico.objeto.encerrar()
+
 def initialize_system():
     """Inicializa o sistema multiagentes"""
     logger.info("Iniciando sistema multiagentes...")
@@ -119,6 +791,15 @@ def initialize_system():
 
 def main():
     """Função principal do sistema"""
+    parser = argparse.ArgumentParser(description="Sistema multiagentes para Monday.com")
+    parser.add_argument('--servico', action='store_true', help="Manter os modelos carregados e atender transcrições via HTTP")
+    parser.add_argument('--porta', type=int, default=None, help="Porta do serviço (padrão: Config.SERVICO_PORTA)")
+    args = parser.parse_args()
+    
+    if args.servico:
+        servir(args.porta)
+        return
+    
     sistema = initialize_system()
     if not sistema:
         return